@@ -0,0 +1,223 @@
+"""
+DatabaseManager 성능 벤치마크 스크립트
+deskpro_ui.DatabaseManager의 DB 접근 경로별 소요 시간을 비교합니다.
+
+저장 벤치마크(stmt_cache, bulk)는 스크립트가 만든 임시 SQLite DB에서만 실행하며,
+끝나면 시작 전 상태로 되돌립니다. --db를 지정하면 읽기 벤치마크만 실행합니다.
+
+사용 예:
+    python benchmark_db.py                      # 임시 SQLite DB로 전체 벤치마크
+    python benchmark_db.py --db MTSDB.FDB --only pool --iterations 5000
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+from deskpro_ui import DatabaseManager, chosung_projection
+
+SURNAMES = ['김', '이', '박', '최', '정', '강', '조', '윤', '장', '임']
+GIVEN_SYLLABLES = ['민', '서', '도', '지', '하', '주', '수', '예', '시', '은', '현', '준',
+                   '연', '윤', '우', '원', '호', '아', '영', '진', '성', '재', '희', '경']
+GIVEN_NAMES = [a + b for a in GIVEN_SYLLABLES for b in GIVEN_SYLLABLES]
+
+
+def make_patient(i):
+    """벤치마크용 가짜 환자 레코드"""
+    name = SURNAMES[i % len(SURNAMES)] + GIVEN_NAMES[(i * 7919) % len(GIVEN_NAMES)]
+    year = 1950 + i % 60
+    return {
+        'PNAME': name,
+        'PBIRTH': f"{year}-01-01",
+        'PIDNUM': f"{year % 100:02d}0101-{1000000 + i:07d}",
+        'SEX': 'M' if i % 2 == 0 else 'F',
+        'RELATION': '본인',
+        'AGREE': i % 2,
+    }
+
+
+def prepare_sqlite_db(path, patients):
+    """임시 SQLite DB 생성 후 환자 데이터 채우기"""
+    db = DatabaseManager(path, name_index_path=path + '.name_index.json')
+    with db.pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.executemany(
+            "INSERT INTO PERSON (PNAME, PBIRTH, PIDNUM, SEX, RELATION, AGREE) VALUES (?, ?, ?, ?, ?, ?)",
+            [(p['PNAME'], p['PBIRTH'], p['PIDNUM'], p['SEX'], p['RELATION'], p['AGREE'])
+             for p in map(make_patient, range(patients))]
+        )
+        conn.commit()
+    return db
+
+
+@contextmanager
+def rolled_back(db):
+    """블록 안에서 저장(커밋)한 내용을 끝난 뒤 되돌림
+
+    save_patient 등은 내부에서 커밋하므로, 시작 전 DB를 메모리로 백업했다가 블록이 끝나면 복원하고
+    저장 중 갱신된 환자 캐시와 이름 색인도 다시 만듭니다. (임시 SQLite DB 전용)
+    """
+    snapshot = sqlite3.connect(':memory:')
+    with db.pool.connection() as conn:
+        conn.backup(snapshot)
+    try:
+        yield
+    finally:
+        with db.pool.connection() as conn:
+            snapshot.backup(conn)
+        snapshot.close()
+        db.patient_cache.clear()
+        if db.use_name_index:
+            db.load_name_index()
+
+
+def timed(label, iterations, func):
+    start = time.perf_counter()
+    for i in range(iterations):
+        func(i)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed:8.3f}s  ({elapsed / iterations * 1000:.3f} ms/회)")
+    return elapsed
+
+
+def like_search(db, conn, keyword):
+    """색인 도입 전 search_patients의 LIKE 전체 스캔"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM PERSON WHERE PNAME LIKE ?", (f"%{keyword}%",))
+    return db._fetch_dicts(cursor)
+
+
+def bench_pool(db, iterations):
+    """호출마다 connect 하는 방식과 풀 재사용 방식 비교"""
+    print(f"\n[커넥션 풀] 검색 {iterations}회")
+
+    def per_call_connect(i):
+        conn = db.get_connection()
+        like_search(db, conn, SURNAMES[i % len(SURNAMES)])
+        conn.close()
+
+    def pooled(i):
+        with db.pool.connection() as conn:
+            like_search(db, conn, SURNAMES[i % len(SURNAMES)])
+
+    baseline = timed("호출마다 connect", iterations, per_call_connect)
+    pooled_time = timed("커넥션 풀", iterations, pooled)
+    print(f"  속도 향상: {baseline / pooled_time:.2f}배  (풀 상태: {db.pool.stats()})")
+
+
+def bench_name_index(db, iterations):
+    """LIKE 전체 스캔과 이름 색인(초성 포함) 검색 비교"""
+    keywords = [make_patient(i)['PNAME'] for i in range(0, 1000, 7)]
+    print(f"\n[이름 색인] 검색 {iterations}회")
+
+    def like_scan(i):
+        with db.pool.connection() as conn:
+            like_search(db, conn, keywords[i % len(keywords)])
+
+    def indexed(i):
+        db.search_patients(keywords[i % len(keywords)])
+
+    def chosung(i):
+        db.search_patients(chosung_projection(keywords[i % len(keywords)]))
+
+    baseline = timed("LIKE 전체 스캔", iterations, like_scan)
+    indexed_time = timed("이름 색인", iterations, indexed)
+    timed("이름 색인 (초성 검색)", iterations, chosung)
+    print(f"  속도 향상: {baseline / indexed_time:.2f}배")
+
+
+def bench_statement_cache(db, iterations):
+    """준비된 문장 캐시 사용/미사용 시 반복 저장/검색 비교"""
+    print(f"\n[문장 캐시] 저장 {iterations}회 + 검색 {iterations}회")
+    with db.pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT PCODE FROM PERSON ORDER BY PCODE")
+        pcodes = [row[0] for row in cursor.fetchmany(100)]
+    keywords = [make_patient(i)['PNAME'] for i in range(0, 1000, 7)]
+
+    def save(i):
+        patient = make_patient(i)
+        patient['PCODE'] = pcodes[i % len(pcodes)]
+        db.save_patient(patient)
+
+    def search(i):
+        db.search_patients_page(keywords[i % len(keywords)])
+
+    results = {}
+    for enabled in (False, True):
+        db.use_statement_cache = enabled
+        label = "캐시 사용" if enabled else "캐시 미사용"
+        results[enabled] = (timed(f"저장 ({label})", iterations, save)
+                            + timed(f"검색 ({label})", iterations, search))
+    print(f"  속도 향상: {results[False] / results[True]:.2f}배  (캐시 통계: {db.statement_cache_stats()})")
+
+
+def bench_bulk_save(db, iterations):
+    """save_patient 반복 호출과 save_patients_many 일괄 저장 처리량 비교"""
+    print(f"\n[일괄 저장] 신규 환자 {iterations}명")
+    records = [make_patient(i) for i in range(iterations)]
+
+    start = time.perf_counter()
+    for record in records:
+        db.save_patient(record)
+    baseline = time.perf_counter() - start
+    print(f"  {'save_patient 반복':<28} {baseline:8.3f}s  ({iterations / baseline:,.0f}건/초)")
+
+    for interval in (100, 1000, 10000):
+        start = time.perf_counter()
+        result = db.save_patients_many(records, commit_interval=interval)
+        elapsed = time.perf_counter() - start
+        label = f"save_patients_many ({interval})"
+        print(f"  {label:<28} {elapsed:8.3f}s  ({iterations / elapsed:,.0f}건/초, "
+              f"오류 {len(result['errors'])}건, {baseline / elapsed:.1f}배)")
+
+
+BENCHMARKS = {
+    'pool': bench_pool,
+    'name_index': bench_name_index,
+    'stmt_cache': bench_statement_cache,
+    'bulk': bench_bulk_save,
+}
+
+# 환자 데이터를 저장하는 벤치마크 (임시 DB에서만 실행하고 끝나면 되돌림)
+WRITE_BENCHMARKS = {'stmt_cache', 'bulk'}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DatabaseManager 벤치마크")
+    parser.add_argument('--db', help="사용할 DB 경로 (.FDB 또는 SQLite). 생략 시 임시 SQLite DB 생성")
+    parser.add_argument('--patients', type=int, default=2000, help="임시 DB에 채울 환자 수")
+    parser.add_argument('--iterations', type=int, default=3000, help="벤치마크 반복 횟수")
+    parser.add_argument('--only', choices=sorted(BENCHMARKS), action='append', help="특정 벤치마크만 실행")
+    args = parser.parse_args()
+
+    tmp_dir = None
+    if args.db:
+        db = DatabaseManager(args.db)
+    else:
+        tmp_dir = tempfile.TemporaryDirectory()
+        db = prepare_sqlite_db(os.path.join(tmp_dir.name, 'bench.db'), args.patients)
+        print(f"임시 SQLite DB 생성: 환자 {args.patients}명")
+
+    try:
+        for name in args.only or BENCHMARKS:
+            if name in WRITE_BENCHMARKS:
+                if args.db:
+                    print(f"\n[{name}] 저장 벤치마크는 실제 DB를 변경하므로 --db 지정 시 건너뜁니다.")
+                    continue
+                with rolled_back(db):
+                    BENCHMARKS[name](db, args.iterations)
+            else:
+                BENCHMARKS[name](db, args.iterations)
+    finally:
+        db.close()
+        if tmp_dir:
+            tmp_dir.cleanup()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
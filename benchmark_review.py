@@ -0,0 +1,200 @@
+"""
+SQL 쿼리 검토기 성능 벤치마크 스크립트
+review_sql_queries.SQLQueryReviewer의 분석 경로별 소요 시간을 비교합니다.
+
+사용 예:
+    python benchmark_review.py                        # 50MB 합성 추출 파일로 전체 벤치마크
+    python benchmark_review.py --size-mb 200 --jobs 1 --jobs 4 --jobs 8
+    python benchmark_review.py --input map-analysis/extracted_sql_queries.txt --only lexer
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import sql_lexer
+from review_sql_queries import FragmentClusterer, SQLQueryReviewer
+
+SAMPLE_FILE = Path(__file__).parent / 'map-analysis' / 'extracted_sql_queries.txt'
+
+
+def make_extraction_file(path, size_mb, sample=SAMPLE_FILE):
+    """샘플 추출 결과의 쿼리 블록을 번호만 바꿔 반복 기록한 대용량 추출 파일 생성"""
+    blocks = list(SQLQueryReviewer(sample).iter_queries())
+    target = size_mb * 1024 * 1024
+    count = 0
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("=" * 80 + "\n")
+        f.write("추출된 SQL 쿼리 목록\n")
+        f.write("=" * 80 + "\n\n")
+        while f.tell() < target:
+            query = blocks[count % len(blocks)]
+            count += 1
+            f.write(f"\n[쿼리 #{count}] (인코딩: {query['encoding']})\n")
+            f.write("-" * 80 + "\n")
+            f.write(query['text'] + "\n")
+            f.write("-" * 80 + "\n")
+    return count
+
+
+def bench_parallel(path, job_counts):
+    """프로세스 수별 스트리밍 파싱 + 분류 시간 비교 (중복 제거 없이 전체 분류)"""
+    print(f"\n[병렬 분류] 프로세스 수: {', '.join(map(str, job_counts))}")
+    baseline = None
+
+    for jobs in job_counts:
+        reviewer = SQLQueryReviewer(path)
+        start = time.perf_counter()
+        reviewer.analyze_queries(reviewer.iter_queries(), jobs=jobs, dedupe=False)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+
+        total = reviewer.statistics['total']
+        print(f"  jobs={jobs:<3} {elapsed:8.3f}s  ({total / elapsed:,.0f}건/초, {baseline / elapsed:.2f}배, "
+              f"유효 {reviewer.statistics['valid']} / 깨짐 {reviewer.statistics['broken']} / "
+              f"무효 {reviewer.statistics['invalid']})")
+
+
+def bench_lexer(path, job_counts):
+    """정규식 검사 경로와 sql_lexer 한 번 훑기 분류 비교 (단일 프로세스)"""
+    texts = [query['text'] for query in SQLQueryReviewer(path).iter_queries()]
+    print(f"\n[분류 엔진] 쿼리 {len(texts)}개")
+
+    start = time.perf_counter()
+    regex_labels = [SQLQueryReviewer.classify_regex(text) for text in texts]
+    baseline = time.perf_counter() - start
+    print(f"  {'정규식 검사':<16} {baseline:8.3f}s  ({len(texts) / baseline:,.0f}건/초)")
+
+    start = time.perf_counter()
+    lexer_labels = [SQLQueryReviewer.classify(text)[0] for text in texts]
+    elapsed = time.perf_counter() - start
+    print(f"  {'sql_lexer':<16} {elapsed:8.3f}s  ({len(texts) / elapsed:,.0f}건/초, {baseline / elapsed:.2f}배)")
+
+    mismatches = sum(a != b for a, b in zip(regex_labels, lexer_labels))
+    print(f"  판정 불일치: {mismatches}건")
+
+
+def bench_dedupe(path, job_counts):
+    """지문 중복 제거 사용/미사용 시 분석 시간과 보고서 크기 비교"""
+    print("\n[중복 제거]")
+    results = {}
+
+    for dedupe in (False, True):
+        reviewer = SQLQueryReviewer(path)
+        start = time.perf_counter()
+        reviewer.analyze_queries(reviewer.iter_queries(), dedupe=dedupe)
+        elapsed = time.perf_counter() - start
+
+        report = os.path.join(tempfile.gettempdir(), f'review_report_{os.getpid()}.txt')
+        reviewer.generate_report(report)
+        size = os.path.getsize(report)
+        os.remove(report)
+
+        results[dedupe] = elapsed
+        label = "중복 제거" if dedupe else "전체 분류"
+        print(f"  {label:<16} {elapsed:8.3f}s  (분류 {reviewer.statistics['total']}건, "
+              f"중복 {reviewer.statistics['duplicates']}건, 보고서 {size / 1024:,.0f}KB)")
+
+    print(f"  속도 향상: {results[False] / results[True]:.2f}배")
+
+
+def pairwise_clusters(clusterer, fragments):
+    """비교 기준: 모든 조각 쌍의 shingle 포함도를 직접 비교 (O(n²))"""
+    shingles = [(key, clusterer.shingles(clusterer.tokens(text))) for key, text in fragments]
+    pairs = 0
+    for i, (_, a) in enumerate(shingles):
+        for _, b in shingles[i + 1:]:
+            if a and b and len(a & b) >= clusterer.MIN_CONTAINMENT * min(len(a), len(b)):
+                pairs += 1
+    return pairs
+
+
+def bench_cluster(path, job_counts):
+    """조각 수를 늘려가며 MinHash/LSH 클러스터링과 전체 쌍 비교 시간 비교"""
+    reviewer = SQLQueryReviewer(path)
+    reviewer.analyze_queries(reviewer.iter_queries(), dedupe=False)
+    fragments = [(i, query['text']) for i, query in enumerate(reviewer.valid_queries + reviewer.broken_queries)
+                 if len(query['text']) <= sql_lexer.MAX_LENGTH]
+    print(f"\n[조각 클러스터링] 조각 최대 {len(fragments)}개")
+
+    size = 250
+    while True:
+        subset = fragments[:size]
+        start = time.perf_counter()
+        clusters = FragmentClusterer().cluster(subset)
+        lsh = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pairwise_clusters(FragmentClusterer(), subset)
+        pairwise = time.perf_counter() - start
+
+        print(f"  조각 {len(subset):>6}개  LSH {lsh:7.3f}s (클러스터 {len(clusters)}개)  "
+              f"전체 쌍 비교 {pairwise:7.3f}s  ({pairwise / lsh:.1f}배)")
+        if size >= len(fragments):
+            break
+        size = min(size * 2, len(fragments))
+
+
+def bench_cache(path, job_counts):
+    """검토 캐시 없음 / 첫 실행 / 재실행 시간 비교 (입력 사본 옆에 캐시 생성)"""
+    print("\n[검토 캐시] 중복 제거 없이 전체 분류")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        copy = os.path.join(tmp, os.path.basename(path))
+        shutil.copyfile(path, copy)
+
+        results = {}
+        for label, use_cache in (("캐시 없음", False), ("첫 실행", True), ("재실행", True)):
+            reviewer = SQLQueryReviewer(copy, use_cache=use_cache)
+            start = time.perf_counter()
+            reviewer.analyze_queries(reviewer.iter_queries(), dedupe=False)
+            results[label] = time.perf_counter() - start
+            print(f"  {label:<16} {results[label]:8.3f}s  (적중 {reviewer.statistics['cache_hits']} / "
+                  f"새로 분석 {reviewer.statistics['cache_misses']})")
+
+    print(f"  재실행 속도 향상: {results['캐시 없음'] / results['재실행']:.2f}배")
+
+
+BENCHMARKS = {
+    'parallel': bench_parallel,
+    'lexer': bench_lexer,
+    'dedupe': bench_dedupe,
+    'cluster': bench_cluster,
+    'cache': bench_cache,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLQueryReviewer 벤치마크")
+    parser.add_argument('--input', help="사용할 추출 결과 파일. 생략 시 합성 파일 생성")
+    parser.add_argument('--size-mb', type=int, default=50, help="합성 추출 파일 크기 (MB)")
+    parser.add_argument('--jobs', type=int, action='append', help="비교할 프로세스 수 (여러 번 지정 가능)")
+    parser.add_argument('--only', choices=sorted(BENCHMARKS), action='append', help="특정 벤치마크만 실행")
+    args = parser.parse_args()
+
+    job_counts = args.jobs or sorted({1, 2, 4, os.cpu_count() or 1})
+
+    tmp_dir = None
+    if args.input:
+        path = args.input
+    else:
+        tmp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(tmp_dir.name, 'extracted_sql_queries.txt')
+        count = make_extraction_file(path, args.size_mb)
+        print(f"합성 추출 파일 생성: {args.size_mb}MB, 쿼리 {count}개")
+
+    try:
+        for name in args.only or BENCHMARKS:
+            BENCHMARKS[name](path, job_counts)
+    finally:
+        if tmp_dir:
+            tmp_dir.cleanup()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
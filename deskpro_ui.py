@@ -1,50 +1,697 @@
+import time
+
+# 시작 시간 측정 기준 (무거운 import 이전)
+_PROCESS_START = time.perf_counter()
+
 import sys
 import sqlite3
 import os
+import importlib.util
+import json
+import hashlib
+import random
+import datetime
+import threading
+import zlib
+from itertools import islice
+from array import array
+from bisect import bisect_right
+from collections import deque, defaultdict, Counter, OrderedDict
+from contextlib import contextmanager
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
     QPushButton, QLabel, QLineEdit, QTabWidget, QTableWidget, 
     QTableWidgetItem, QGroupBox, QGridLayout, QRadioButton, 
-    QCheckBox, QComboBox, QDateEdit, QFrame, QHeaderView, QMessageBox
+    QCheckBox, QComboBox, QDateEdit, QFrame, QHeaderView, QMessageBox,
+    QTableView, QAbstractItemView
 )
-from PyQt6.QtCore import Qt, QDate
+from PyQt6.QtCore import (
+    Qt, QDate, QAbstractTableModel, QModelIndex, QObject, QRunnable,
+    QThreadPool, QTimer, pyqtSignal
+)
+
+# fdb는 Firebird 연결 시점에 import (SQLite 사용 시 및 시작 시간 단축)
+HAS_FDB = importlib.util.find_spec("fdb") is not None
+
+_IMPORTS_DONE = time.perf_counter()
+
+class ConnectionPool:
+    """스레드 안전 DB 커넥션 풀
+
+    반납된 커넥션을 재사용하여 매 호출마다 connect 비용을 지불하지 않도록 합니다.
+    - min_size: 항상 유지할 최소 커넥션 수
+    - max_size: 동시에 열 수 있는 최대 커넥션 수 (초과 시 checkout 대기)
+    - idle_timeout: 이 시간(초) 이상 사용되지 않은 유휴 커넥션은 정리 (min_size 까지)
+    - ping_interval: 이 시간(초) 이상 유휴였던 커넥션은 재사용 전 생존 확인
+    """
+
+    def __init__(self, factory, min_size=1, max_size=5, idle_timeout=300.0,
+                 ping_query="SELECT 1", ping_interval=5.0, checkout_timeout=10.0):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"잘못된 풀 크기: min={min_size}, max={max_size}")
+        self.factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.ping_query = ping_query
+        self.ping_interval = ping_interval
+        self.checkout_timeout = checkout_timeout
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (conn, 반납 시각) - 오른쪽이 가장 최근
+        self._size = 0        # 풀이 소유한 전체 커넥션 수 (유휴 + 사용 중)
+        self._closed = False
+
+    def warm(self):
+        """최소 커넥션 미리 열기 (실패 시 첫 checkout에서 오류가 드러나도록 중단)"""
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                conn = self.factory()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                return
+            self.release(conn)
+
+    def acquire(self):
+        """커넥션 checkout (유휴 커넥션 우선, 없으면 새로 생성, 한도 초과 시 대기)"""
+        deadline = time.monotonic() + self.checkout_timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("커넥션 풀이 이미 닫혔습니다.")
+                self._evict_idle_locked()
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    # 슬롯만 먼저 확보하고 실제 connect는 락 밖에서 수행
+                    self._size += 1
+                    conn, last_used = None, None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"커넥션 풀 대기 시간 초과 (max_size={self.max_size})")
+                self._cond.wait(remaining)
+
+        if conn is not None:
+            if time.monotonic() - last_used < self.ping_interval or self._is_alive(conn):
+                return conn
+            # 끊어진 커넥션은 버리고 같은 슬롯에 새 커넥션 생성
+            self._close_quietly(conn)
+
+        try:
+            return self.factory()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, conn, discard=False):
+        """커넥션 checkin (열린 트랜잭션은 롤백하여 다음 사용자에게 깨끗한 상태로 전달)"""
+        if not discard:
+            try:
+                conn.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            if discard or self._closed:
+                self._size -= 1
+                self._close_quietly(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+                self._evict_idle_locked()
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """with 구문용 checkout/checkin"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """유휴 커넥션을 모두 닫고 이후 checkout 거부 (사용 중인 커넥션은 반납 시 닫힘)"""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.popleft()
+                self._size -= 1
+                self._close_quietly(conn)
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {'size': self._size, 'idle': len(self._idle), 'in_use': self._size - len(self._idle)}
+
+    def _evict_idle_locked(self):
+        """idle_timeout을 넘긴 유휴 커넥션 정리 (가장 오래된 것부터, min_size 유지)"""
+        now = time.monotonic()
+        while self._idle and self._size > self.min_size and now - self._idle[0][1] > self.idle_timeout:
+            conn, _ = self._idle.popleft()
+            self._size -= 1
+            self._close_quietly(conn)
+
+    def _is_alive(self, conn):
+        try:
+            cursor = conn.cursor()
+            cursor.execute(self.ping_query)
+            cursor.fetchall()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+# 한글 초성 (호환용 자모, 유니코드 음절 순서)
+CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+HANGUL_BASE = 0xAC00
+HANGUL_COUNT = 11172
+JONGSUNG_COUNT = 28
+JUNGSUNG_BLOCK = 21 * JONGSUNG_COUNT  # 초성 하나당 음절 수 (588)
+
+# SQLite LIKE처럼 ASCII 영문자만 대소문자를 구분하지 않도록 소문자로 바꾸는 표
+ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def ascii_fold(text):
+    """ASCII 영문자만 소문자로 변환 (한글 등 다른 문자는 그대로)"""
+    return text.translate(ASCII_LOWER)
+
+
+def hangul_chosung(ch):
+    """음절의 초성 반환 (한글 음절이 아니면 그대로)"""
+    code = ord(ch) - HANGUL_BASE
+    if 0 <= code < HANGUL_COUNT:
+        return CHOSUNG[code // JUNGSUNG_BLOCK]
+    return ch
+
+
+def chosung_projection(text):
+    """문자열 전체를 초성으로 투영 (예: '홍길동' -> 'ㅎㄱㄷ')"""
+    return "".join(hangul_chosung(ch) for ch in text)
+
+
+def _char_matches(q, c, is_last):
+    """검색어 글자 q가 이름 글자 c와 일치하는지 확인
+
+    - 초성 자모(ㅎ)는 해당 초성의 모든 음절과 일치
+    - 마지막 글자가 받침 없는 음절(기)이면 입력 중인 음절로 보고 받침 있는 음절(길)과도 일치
+    """
+    if q == c:
+        return True
+    if q in CHOSUNG:
+        return hangul_chosung(c) == q
+    if is_last:
+        qc = ord(q) - HANGUL_BASE
+        cc = ord(c) - HANGUL_BASE
+        if 0 <= qc < HANGUL_COUNT and 0 <= cc < HANGUL_COUNT and qc % JONGSUNG_COUNT == 0:
+            return qc // JONGSUNG_COUNT == cc // JONGSUNG_COUNT
+    return False
+
+
+def name_matches(name, keyword):
+    """이름에 검색어가 접두/중간/초성 형태로 포함되는지 확인 (ASCII 대소문자 무시)"""
+    if not keyword:
+        return True
+    name, keyword = ascii_fold(name), ascii_fold(keyword)
+    n, k = len(name), len(keyword)
+    for start in range(n - k + 1):
+        if all(_char_matches(keyword[i], name[start + i], i == k - 1) for i in range(k)):
+            return True
+    return False
+
+
+class PatientNameIndex:
+    """환자 이름 메모리 색인 (음절 n-gram + 초성 투영)
+
+    PERSON 전체를 LIKE '%...%'로 스캔하지 않고 후보 PCODE를 바로 찾습니다.
+    - 음절 1-gram: 검색어의 완성 음절 (마지막 글자 제외 - 입력 중일 수 있음)
+    - 초성 1/2-gram: 검색어를 초성으로 투영한 문자열 ('ㅇㅈㅎ', '홍ㄱ', '홍기' 모두 처리)
+    후보는 name_matches()로 최종 확인합니다.
+    다른 워크스테이션의 이름 변경/삭제는 reconcile()로 PERSON 전체 (PCODE, PNAME)과 맞춰 반영합니다.
+    ASCII 영문자는 소문자로 바꿔 색인/검색하므로 이전 LIKE 검색처럼 대소문자를 구분하지 않습니다.
+    """
+
+    SNAPSHOT_VERSION = 1
+
+    def __init__(self):
+        self.names = {}                  # PCODE -> PNAME
+        self.postings = defaultdict(set)  # gram -> {PCODE}
+        self.watermark = 0               # 색인에 반영된 최대 PCODE
+        self.built_at = None             # 빈 색인에서 전체를 읽어 만든 시각 (스냅샷 재저장 시 유지)
+        self.synced_at = 0.0             # 마지막 전체 맞춤(reconcile) 시각
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _grams(name):
+        name = ascii_fold(name)
+        grams = set(name)
+        cho = chosung_projection(name)
+        grams.update(cho)
+        grams.update(cho[i:i + 2] for i in range(len(cho) - 1))
+        return grams
+
+    @staticmethod
+    def _query_grams(keyword):
+        keyword = ascii_fold(keyword)
+        grams = set(keyword[:-1])
+        cho = chosung_projection(keyword)
+        if len(cho) == 1:
+            grams.add(cho)
+        grams.update(cho[i:i + 2] for i in range(len(cho) - 1))
+        return grams
+
+    def add(self, pcode, name):
+        """색인 추가/갱신 (이름이 바뀐 경우 이전 n-gram 제거)"""
+        if name is None:
+            return
+        with self._lock:
+            old = self.names.get(pcode)
+            if old == name:
+                return
+            if old is not None:
+                self._unlink(pcode, old)
+            self.names[pcode] = name
+            for gram in self._grams(name):
+                self.postings[gram].add(pcode)
+            if isinstance(pcode, int) and pcode > self.watermark:
+                self.watermark = pcode
+
+    def remove(self, pcode):
+        with self._lock:
+            old = self.names.pop(pcode, None)
+            if old is not None:
+                self._unlink(pcode, old)
+
+    def _unlink(self, pcode, name):
+        for gram in self._grams(name):
+            bucket = self.postings.get(gram)
+            if bucket is not None:
+                bucket.discard(pcode)
+                if not bucket:
+                    del self.postings[gram]
+
+    def reconcile(self, rows, watermark):
+        """PERSON 전체 (PCODE, PNAME) 목록과 맞춤 - 바뀐 이름은 갱신하고 없어진 PCODE는 제거
+
+        조회 이후 다른 스레드에서 추가된 환자를 지우지 않도록 조회 직전 워터마크 이하만 제거합니다.
+        """
+        seen = set()
+        with self._lock:
+            for pcode, name in rows:
+                seen.add(pcode)
+                if name is None:
+                    self.remove(pcode)
+                else:
+                    self.add(pcode, name)
+            for pcode in [p for p in self.names if p not in seen and p <= watermark]:
+                self.remove(pcode)
+            self.synced_at = time.time()
+
+    def search(self, keyword):
+        """검색어와 일치하는 PCODE 목록 (오름차순)"""
+        keyword = keyword.strip()
+        with self._lock:
+            if not keyword:
+                return sorted(self.names)
+            buckets = []
+            for gram in self._query_grams(keyword):
+                bucket = self.postings.get(gram)
+                if not bucket:
+                    return []
+                buckets.append(bucket)
+            buckets.sort(key=len)
+            candidates = set(buckets[0])
+            for bucket in buckets[1:]:
+                candidates &= bucket
+                if not candidates:
+                    return []
+            return sorted(p for p in candidates if name_matches(self.names[p], keyword))
+
+    def search_keys(self, keyword):
+        """검색 결과를 (PNAME, PCODE) 순으로 정렬한 키 목록 (keyset 페이지 나누기용)"""
+        pcodes = self.search(keyword)
+        with self._lock:
+            return sorted((self.names[p], p) for p in pcodes if p in self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def load_snapshot(self, path, max_age=None):
+        """디스크 스냅샷 로드 (없거나 오래되었거나 형식이 다르면 False)"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if snapshot.get('version') != self.SNAPSHOT_VERSION:
+            return False
+        # 이전 형식에는 built_at이 없으므로 saved_at으로 대신함
+        built_at = snapshot.get('built_at', snapshot.get('saved_at', 0))
+        if max_age is not None and time.time() - built_at > max_age:
+            return False
+        with self._lock:
+            self.built_at = built_at
+            for pcode, name in snapshot['names']:
+                self.add(pcode, name)
+            self.watermark = max(self.watermark, snapshot.get('watermark', 0))
+        return True
+
+    def save_snapshot(self, path):
+        """원자적 스냅샷 저장 (임시 파일 기록 후 교체)
+
+        built_at은 전체 빌드 시각을 그대로 기록하므로, 매일 재시작하며 다시 저장해도
+        스냅샷의 나이(max_age 기준)는 늘어납니다.
+        """
+        with self._lock:
+            snapshot = {
+                'version': self.SNAPSHOT_VERSION,
+                'built_at': self.built_at if self.built_at is not None else time.time(),
+                'saved_at': time.time(),
+                'watermark': self.watermark,
+                'names': list(self.names.items()),
+            }
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+class StatementCache:
+    """커넥션별 준비된 문장(prepared statement) 캐시
+
+    SQL 문자열을 키로 LRU 방식으로 보관하며 capacity를 넘으면 가장 오래 쓰지 않은 문장을 해제합니다.
+    - Firebird: cursor.prep()으로 준비한 PreparedStatement를 전용 커서와 함께 보관
+      (fdb의 PreparedStatement는 준비한 커서에서만 실행 가능)
+    - SQLite: 문장별 전용 커서를 보관하고 sqlite3 내부 문장 캐시가 재컴파일을 막음
+    hits/misses/evictions는 DatabaseManager 전체 합계(stats)에 기록됩니다.
+    """
+
+    def __init__(self, conn, use_prep, capacity, stats, stats_lock):
+        self.conn = conn
+        self.use_prep = use_prep
+        self.capacity = capacity
+        self._entries = OrderedDict()  # sql -> (cursor, prepared)
+        self._stats = stats
+        self._stats_lock = stats_lock
+
+    def _count(self, key):
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def _lookup(self, sql):
+        """SQL에 해당하는 (커서, 준비된 문장) 반환 (없으면 준비 후 등록)"""
+        entry = self._entries.get(sql)
+        if entry is not None:
+            self._entries.move_to_end(sql)
+            self._count('hits')
+            return entry
+
+        self._count('misses')
+        cursor = self.conn.cursor()
+        entry = (cursor, cursor.prep(sql) if self.use_prep else sql)
+        self._entries[sql] = entry
+        while len(self._entries) > self.capacity:
+            _, (old_cursor, _) = self._entries.popitem(last=False)
+            self._count('evictions')
+            try:
+                old_cursor.close()
+            except Exception:
+                pass
+        return entry
+
+    def execute(self, sql, params=()):
+        """캐시된 문장으로 실행하고 결과를 읽을 커서 반환"""
+        cursor, prepared = self._lookup(sql)
+        cursor.execute(prepared, params)
+        return cursor
+
+    def executemany(self, sql, seq_of_params):
+        cursor, prepared = self._lookup(sql)
+        cursor.executemany(prepared, seq_of_params)
+        return cursor
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class TTLCache:
+    """크기 제한(LRU)과 유효 시간(TTL)이 있는 스레드 안전 캐시
+
+    조회 전에 generation()을 받아 put()에 넘기면, 조회 중 invalidate()/clear()된 키는 저장하지 않으므로
+    저장 직전에 읽은 이전 값이 무효화 뒤에 캐시되어 TTL 동안 남는 일이 없습니다.
+    """
+
+    def __init__(self, max_size=256, ttl=60.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (만료 시각, 값)
+        self._generations = {}         # key -> invalidate 횟수 (clear 때 비움)
+        self._epoch = 0                # clear 횟수
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def generation(self, key):
+        """키의 현재 세대 (조회 시작 전에 받아 put()에 넘김)"""
+        with self._lock:
+            return self._epoch, self._generations.get(key, 0)
+
+    def put(self, key, value, generation=None):
+        """값 저장. generation이 현재 세대와 다르면 (조회 중 무효화됨) 저장하지 않고 False 반환"""
+        with self._lock:
+            if generation is not None and generation != (self._epoch, self._generations.get(key, 0)):
+                return False
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            return True
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self._epoch += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class _SqliteConnection(sqlite3.Connection):
+    """문장 캐시를 속성으로 붙일 수 있는 sqlite3 커넥션"""
+    statement_cache = None
+
+
+def _sqlite_hash(value):
+    """Firebird 내장 HASH()에 해당하는 SQLite 함수 (대기 목록 요약 체크섬용, 32비트)"""
+    return None if value is None else zlib.crc32(str(value).encode('utf-8'))
 
-try:
-    import fdb
-    HAS_FDB = True
-except ImportError:
-    HAS_FDB = False
 
 class DatabaseManager:
-    def __init__(self, db_path="/mnt/c/Users/DELL/Documents/db/MTSDB.FDB"):
+    # SQLite 스키마 버전 (테이블 정의를 바꾸면 올려서 init_db가 다시 실행되도록 함)
+    SCHEMA_VERSION = 1
+    # 전체 빌드한 지 이보다 오래된 스냅샷은 버리고 다시 빌드
+    NAME_INDEX_MAX_AGE = 24 * 3600
+    # 다른 워크스테이션의 이름 변경/삭제를 반영하기 위해 이 간격마다 PCODE/PNAME 전체를 다시 맞춤
+    NAME_INDEX_RESYNC_SECONDS = 300
+    # Firebird IN (...) 목록 길이 제한(1500) 이하로 나누어 조회
+    FETCH_CHUNK_SIZE = 500
+    # 검색 결과 테이블에 표시되는 컬럼 (페이지 조회는 이 컬럼만 SELECT)
+    SEARCH_COLUMNS = ('PCODE', 'PNAME', 'PBIRTH', 'PIDNUM')
+    SEARCH_PAGE_SIZE = 200
+    # 저장 시 갱신하는 PERSON 컬럼 (SQL 문자열을 고정해 문장 캐시가 재사용되도록 함)
+    SAVE_FIELDS = ('PNAME', 'PBIRTH', 'PIDNUM', 'SEX', 'RELATION', 'AGREE')
+    UPDATE_PATIENT_SQL = f"UPDATE PERSON SET {', '.join(f'{f} = ?' for f in SAVE_FIELDS)} WHERE PCODE = ?"
+    INSERT_PATIENT_SQL = f"INSERT INTO PERSON ({', '.join(SAVE_FIELDS)}) VALUES ({', '.join('?' for _ in SAVE_FIELDS)})"
+    # 대기 목록 요약 체크섬에 넣는 WAIT 컬럼 (건수가 같은 상태/진료실 변경도 감지)
+    WAIT_CHECKSUM_COLUMNS = ('PCODE', 'ROOMCODE', 'ROOMNM')
+
+    def __init__(self, db_path="/mnt/c/Users/DELL/Documents/db/MTSDB.FDB",
+                 pool_min_size=1, pool_max_size=5, pool_idle_timeout=300.0,
+                 use_name_index=True, name_index_path=None,
+                 use_statement_cache=True, statement_cache_size=64,
+                 patient_cache_size=256, patient_cache_ttl=60.0,
+                 wait_watermark_column=None, auto_open=True):
         self.db_path = db_path
         self.is_firebird = db_path.upper().endswith(".FDB")
         if not HAS_FDB and self.is_firebird:
             print("Warning: fdb library not found. Please install with 'pip install fdb'")
+        self.use_statement_cache = use_statement_cache
+        self.statement_cache_size = statement_cache_size
+        self.statement_stats = Counter()
+        # 최근 조회한 환자 상세 (다른 워크스테이션의 수정은 TTL 이후 반영)
+        self.patient_cache = TTLCache(patient_cache_size, patient_cache_ttl)
+        # 대기 목록 증분 조회 기준 컬럼 (SQLite는 rowid, Firebird는 단조 증가 컬럼이 있으면 지정)
+        self.wait_watermark = wait_watermark_column or (None if self.is_firebird else "rowid")
+        self._statement_stats_lock = threading.Lock()
+        self.pool = ConnectionPool(
+            self.get_connection,
+            min_size=pool_min_size,
+            max_size=pool_max_size,
+            idle_timeout=pool_idle_timeout,
+            ping_query="SELECT 1 FROM RDB$DATABASE" if self.is_firebird else "SELECT 1",
+        )
+        self.use_name_index = use_name_index
+        self.name_index = None
+        self.name_index_path = name_index_path or self._default_name_index_path()
+        self.open_seconds = None
+        if auto_open:
+            self.open()
+
+    def open(self):
+        """연결 준비, 스키마 확인, 이름 색인 로드 (UI에서는 첫 화면 표시 후 작업 스레드에서 호출)"""
+        start = time.perf_counter()
+        self.pool.warm()
         self.init_db()
+        if self.use_name_index:
+            self.load_name_index()
+        self.open_seconds = time.perf_counter() - start
+        return self
+
+    def _default_name_index_path(self):
+        digest = hashlib.sha1(os.path.abspath(self.db_path).encode('utf-8')).hexdigest()[:12]
+        return os.path.join(os.path.expanduser("~"), ".deskpro", f"name_index_{digest}.json")
+
+    def close(self):
+        if self.name_index is not None:
+            try:
+                self.name_index.save_snapshot(self.name_index_path)
+            except OSError as e:
+                print(f"Warning: 이름 색인 스냅샷 저장 실패: {e}")
+        self.pool.close()
+
+    def load_name_index(self):
+        """이름 색인 준비 (스냅샷이 있으면 불러온 뒤 PERSON 전체와 맞춰 바뀐 이름만 다시 색인)"""
+        index = PatientNameIndex()
+        warm = index.load_snapshot(self.name_index_path, max_age=self.NAME_INDEX_MAX_AGE)
+        if not warm:
+            index.built_at = time.time()
+        with self.pool.connection() as conn:
+            self._sync_name_index(conn, index, full=True)
+        self.name_index = index
+        if not warm:
+            try:
+                index.save_snapshot(self.name_index_path)
+            except OSError as e:
+                print(f"Warning: 이름 색인 스냅샷 저장 실패: {e}")
+        return warm
+
+    def _sync_name_index(self, conn, index=None, full=False):
+        """워터마크 이후 추가된 환자를 색인에 반영 (PK 범위 조회라 비용이 작음)
+
+        full이거나 마지막 전체 맞춤 후 NAME_INDEX_RESYNC_SECONDS가 지났으면
+        PCODE/PNAME 두 컬럼 전체를 읽어 이름 변경과 삭제까지 반영합니다.
+        """
+        if index is None:
+            index = self.name_index
+        if full or time.time() - index.synced_at > self.NAME_INDEX_RESYNC_SECONDS:
+            watermark = index.watermark
+            cursor = self._execute(conn, "SELECT PCODE, PNAME FROM PERSON")
+            index.reconcile(cursor.fetchall(), watermark)
+            return
+        cursor = self._execute(conn, "SELECT PCODE, PNAME FROM PERSON WHERE PCODE > ?", (index.watermark,))
+        for pcode, name in cursor.fetchall():
+            index.add(pcode, name)
 
     def get_connection(self):
         if self.is_firebird:
             if not HAS_FDB:
                 raise ImportError("fdb library is required for .FDB files. Run 'pip install fdb --break-system-packages'")
+            import fdb
             # Firebird 연결 (기본 계정: SYSDBA / masterkey)
-            return fdb.connect(
+            conn = fdb.connect(
                 database=self.db_path,
                 user='SYSDBA',
                 password='masterkey',
                 charset='UTF8'
             )
         else:
-            conn = sqlite3.connect(self.db_path)
+            # 풀에서 여러 스레드가 번갈아 사용하므로 스레드 검사 해제
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, factory=_SqliteConnection,
+                                   cached_statements=max(self.statement_cache_size, 128))
             conn.row_factory = sqlite3.Row
-            return conn
+            conn.create_function("HASH", 1, _sqlite_hash, deterministic=True)
+        conn.statement_cache = StatementCache(
+            conn, self.is_firebird, self.statement_cache_size,
+            self.statement_stats, self._statement_stats_lock,
+        )
+        return conn
+
+    def _execute(self, conn, sql, params=()):
+        """SQL 실행 (문장 캐시 사용 시 준비된 문장 재사용) 후 커서 반환"""
+        if self.use_statement_cache:
+            return conn.statement_cache.execute(sql, params)
+        cursor = conn.cursor()
+        cursor.execute(sql, params)
+        return cursor
+
+    def _executemany(self, conn, sql, seq_of_params):
+        if self.use_statement_cache:
+            return conn.statement_cache.executemany(sql, seq_of_params)
+        cursor = conn.cursor()
+        cursor.executemany(sql, seq_of_params)
+        return cursor
+
+    def statement_cache_stats(self):
+        with self._statement_stats_lock:
+            stats = dict(self.statement_stats)
+        lookups = stats.get('hits', 0) + stats.get('misses', 0)
+        stats['hit_rate'] = stats.get('hits', 0) / lookups if lookups else 0.0
+        return stats
+
+    @staticmethod
+    def _padded_in_params(values, size):
+        """IN 목록을 고정 길이로 채워 SQL 문자열이 매번 같도록 함 (중복 값은 결과에 영향 없음)"""
+        values = list(values)
+        return values + [values[-1]] * (size - len(values))
 
     def init_db(self):
         # Firebird의 경우 이미 존재하는 DB를 사용하므로 초기화 생략 가능
         if self.is_firebird:
             return
             
-        conn = self.get_connection()
+        with self.pool.connection() as conn:
+            # 스키마 버전 도장(PRAGMA user_version)이 최신이면 CREATE/COUNT 생략
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= self.SCHEMA_VERSION:
+                return
+            self._create_schema(conn)
+            conn.execute(f"PRAGMA user_version = {int(self.SCHEMA_VERSION)}")
+            conn.commit()
+
+    def _create_schema(self, conn):
         cursor = conn.cursor()
         
         # PERSON 테이블 생성
@@ -88,6 +735,24 @@ class DatabaseManager:
             )
         ''')
         
+        # WAIT 테이블 생성 (대기 목록)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS WAIT (
+                PCODE INTEGER,
+                VISIDATE TEXT,
+                RESID1 TEXT,
+                RESID2 TEXT,
+                GOODOC TEXT,
+                ROOMCODE TEXT,
+                ROOMNM TEXT,
+                DEPTCODE TEXT,
+                DEPTNM TEXT,
+                DOCTRCODE TEXT,
+                DOCTRNM TEXT,
+                FOREIGN KEY (PCODE) REFERENCES PERSON(PCODE)
+            )
+        ''')
+        
         # 샘플 데이터 추가 (데이터가 없을 경우)
         cursor.execute("SELECT COUNT(*) FROM PERSON")
         if cursor.fetchone()[0] == 0:
@@ -97,56 +762,560 @@ class DatabaseManager:
                            ("김철수", "1985-05-20", "850520-1234567", "M"))
         
         conn.commit()
-        conn.close()
 
-    def search_patients(self, keyword):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        query = "SELECT * FROM PERSON WHERE PNAME LIKE ?"
-        cursor.execute(query, (f"%{keyword}%",))
-        
+    def _fetch_dicts(self, cursor):
         # 필드명을 항상 대문자로 변환하여 일관성 유지
         if self.is_firebird:
             columns = [desc[0].upper() for desc in cursor.description]
-            results = [dict(zip(columns, row)) for row in cursor.fetchall()]
-        else:
-            results = [{k.upper(): v for k, v in dict(row).items()} for row in cursor.fetchall()]
-            
-        conn.close()
-        return results
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        return [{k.upper(): v for k, v in dict(row).items()} for row in cursor.fetchall()]
 
-    def save_patient(self, data):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        # Firebird와 SQLite 호환성을 위해 파라미터 스타일 조정
+    def search_patients(self, keyword):
+        with self.pool.connection() as conn:
+            if self.name_index is None:
+                query = "SELECT * FROM PERSON WHERE PNAME LIKE ?"
+                cursor = self._execute(conn, query, (f"%{keyword}%",))
+                return self._fetch_dicts(cursor)
+
+            self._sync_name_index(conn)
+            pcodes = self.name_index.search(keyword)
+            results = []
+            placeholders = ", ".join("?" for _ in range(self.FETCH_CHUNK_SIZE))
+            query = f"SELECT * FROM PERSON WHERE PCODE IN ({placeholders}) ORDER BY PCODE"
+            for i in range(0, len(pcodes), self.FETCH_CHUNK_SIZE):
+                chunk = self._padded_in_params(pcodes[i:i + self.FETCH_CHUNK_SIZE], self.FETCH_CHUNK_SIZE)
+                cursor = self._execute(conn, query, chunk)
+                results.extend(self._fetch_dicts(cursor))
+
+        # 다른 워크스테이션에서 이름이 바뀐 경우 색인과 실제 값이 다를 수 있으므로 재확인
+        keyword = keyword.strip()
+        return [row for row in results if row['PNAME'] is not None and name_matches(row['PNAME'], keyword)]
+
+    def search_patients_page(self, keyword, after=None, page_size=None):
+        """검색 결과 한 페이지 조회 (keyset 페이지 나누기)
+
+        표시 컬럼(SEARCH_COLUMNS)만 튜플로 반환하며 (PNAME, PCODE) 순으로 정렬됩니다.
+        after: 직전 페이지의 next_after 값 (첫 페이지는 None)
+        반환: (rows, next_after) - 마지막 페이지면 next_after는 None
+        """
+        page_size = page_size or self.SEARCH_PAGE_SIZE
+        columns = ", ".join(self.SEARCH_COLUMNS)
+        with self.pool.connection() as conn:
+            if self.name_index is None:
+                return self._like_search_page(conn, columns, keyword, after, page_size)
+
+            self._sync_name_index(conn)
+            keys = self.name_index.search_keys(keyword)
+            start = bisect_right(keys, tuple(after)) if after else 0
+            page_keys = keys[start:start + page_size]
+            next_after = page_keys[-1] if start + page_size < len(keys) else None
+            if not page_keys:
+                return [], None
+
+            pcodes = [pcode for _, pcode in page_keys]
+            placeholders = ", ".join("?" for _ in range(page_size))
+            cursor = self._execute(conn, f"SELECT {columns} FROM PERSON WHERE PCODE IN ({placeholders})",
+                                   self._padded_in_params(pcodes, page_size))
+            by_pcode = {}
+            while True:
+                batch = cursor.fetchmany(page_size)
+                if not batch:
+                    break
+                for row in batch:
+                    by_pcode[row[0]] = tuple(row)
+
+        # 색인 순서대로 정렬하고, 다른 곳에서 이름이 바뀐 행은 제외
+        keyword = keyword.strip()
+        rows = [by_pcode[p] for p in pcodes
+                if p in by_pcode and by_pcode[p][1] is not None and name_matches(by_pcode[p][1], keyword)]
+        return rows, next_after
+
+    def _like_search_page(self, conn, columns, keyword, after, page_size):
+        where = "PNAME LIKE ?"
+        params = [f"%{keyword}%"]
+        if after:
+            where += " AND (PNAME > ? OR (PNAME = ? AND PCODE > ?))"
+            params += [after[0], after[0], after[1]]
         if self.is_firebird:
-            param_char = "?"
+            query = f"SELECT FIRST {int(page_size)} {columns} FROM PERSON WHERE {where} ORDER BY PNAME, PCODE"
         else:
-            param_char = "?" # SQLite도 ? 지원
+            query = f"SELECT {columns} FROM PERSON WHERE {where} ORDER BY PNAME, PCODE LIMIT {int(page_size)}"
+        cursor = self._execute(conn, query, params)
+        rows = [tuple(row) for row in cursor.fetchmany(page_size)]
+        next_after = (rows[-1][1], rows[-1][0]) if len(rows) == page_size else None
+        return rows, next_after
+
+    def iter_patient_pages(self, keyword, page_size=None):
+        """검색 결과를 페이지 단위로 내보내는 제너레이터 (페이지마다 커넥션을 잠깐만 점유)"""
+        after = None
+        while True:
+            rows, after = self.search_patients_page(keyword, after, page_size)
+            if rows:
+                yield rows
+            if after is None:
+                return
+
+    def get_patient(self, pcode, use_cache=True):
+        """환자 상세 조회 (PERSON 전체 컬럼, 없으면 None)
+
+        최근 조회한 환자는 캐시에서 바로 반환하고, 저장 시 해당 항목은 무효화됩니다.
+        조회 중 다른 스레드에서 저장(무효화)된 경우 읽은 값은 캐시하지 않습니다.
+        """
+        if use_cache:
+            cached = self.patient_cache.get(pcode)
+            if cached is not None:
+                return dict(cached)
+
+        generation = self.patient_cache.generation(pcode)
+        with self.pool.connection() as conn:
+            cursor = self._execute(conn, "SELECT * FROM PERSON WHERE PCODE = ?", (pcode,))
+            rows = self._fetch_dicts(cursor)
+        if not rows:
+            return None
+        self.patient_cache.put(pcode, rows[0], generation)
+        return dict(rows[0])
+
+    def get_cached_patient(self, pcode):
+        """캐시에 있는 경우에만 환자 상세 반환 (DB 조회 없음)"""
+        cached = self.patient_cache.get(pcode)
+        return dict(cached) if cached is not None else None
+
+    def _today_visidate(self):
+        today = datetime.date.today()
+        return today if self.is_firebird else today.isoformat()
+
+    def poll_waiting_list(self, signature=None, watermark=None, visidate=None, force_full=False):
+        """오늘 대기 목록 변경분 조회
+
+        먼저 (건수, 최대 워터마크, 상태 컬럼 체크섬) 요약만 읽어 이전 signature와 같으면 행을 전송하지 않습니다.
+        체크섬은 WAIT_CHECKSUM_COLUMNS의 행별 HASH() 합이라 건수가 같은 상태/진료실 변경도 드러나므로,
+        워터마크 컬럼이 없는 Firebird에서도 다음 폴링에 반영됩니다.
+        새 행만 추가되고 기존 행의 체크섬이 그대로면 워터마크 이후 행만 읽고(delta),
+        삭제/수정이 섞인 경우 전체를 읽습니다(full).
+        요약에 드러나지 않는 수정(환자 이름 등)은 force_full로 주기적으로 전체를 읽어 반영합니다.
+        반환: {'mode': 'unchanged' | 'delta' | 'full', 'rows': [(키, PCODE, PNAME, ROOMNM, VISIDATE)],
+               'signature': ..., 'watermark': ...}
+        """
+        visidate = visidate or self._today_visidate()
+        wm = f"W.{self.wait_watermark}" if self.wait_watermark else None
+        key_expr = wm or "W.PCODE"
+        select = (f"SELECT {key_expr}, W.PCODE, P.PNAME, W.ROOMNM, W.VISIDATE "
+                  "FROM WAIT W LEFT JOIN PERSON P ON P.PCODE = W.PCODE WHERE W.VISIDATE = ?")
+        order = f" ORDER BY {key_expr}"
+        row_hash = "HASH(" + " || '|' || ".join(f"COALESCE(CAST(W.{c} AS VARCHAR(64)), '')" for c in self.WAIT_CHECKSUM_COLUMNS) + ")"
+        if self.is_firebird:
+            # Firebird HASH()는 BIGINT이므로 합이 넘치지 않게 줄임 (SQLite 쪽은 32비트 CRC)
+            row_hash = f"MOD({row_hash}, 4294967291)"
+        checksum = f"SUM({row_hash})"
 
+        with self.pool.connection() as conn:
+            summary = f"SELECT COUNT(*), MAX({wm}), {checksum} FROM WAIT W WHERE W.VISIDATE = ?" if wm else \
+                f"SELECT COUNT(*), {checksum} FROM WAIT W WHERE W.VISIDATE = ?"
+            row = self._execute(conn, summary, (visidate,)).fetchone()
+            new_signature = (visidate, row[0], row[1] if wm else None, row[-1])
+            new_watermark = new_signature[2]
+            if new_signature == signature and not force_full:
+                return {'mode': 'unchanged', 'rows': [], 'signature': signature, 'watermark': watermark}
+
+            # 워터마크 이전 행의 체크섬이 그대로일 때만 새 행을 덧붙이는 것으로 충분함
+            if (wm and signature and signature[0] == visidate and watermark is not None
+                    and self._execute(conn, f"SELECT {checksum} FROM WAIT W WHERE W.VISIDATE = ? AND {wm} <= ?",
+                                      (visidate, watermark)).fetchone()[0] == signature[3]):
+                rows = [tuple(r) for r in self._execute(conn, select + f" AND {wm} > ?" + order,
+                                                        (visidate, watermark)).fetchall()]
+                if signature[1] + len(rows) == new_signature[1]:
+                    return {'mode': 'delta', 'rows': rows, 'signature': new_signature, 'watermark': new_watermark}
+
+            rows = [tuple(r) for r in self._execute(conn, select + order, (visidate,)).fetchall()]
+        return {'mode': 'full', 'rows': rows, 'signature': new_signature, 'watermark': new_watermark}
+
+    def save_patient(self, data):
+        with self.pool.connection() as conn:
+            self._save_patient(conn, data)
+            if data.get('PCODE'):
+                # 저장되지 않은 컬럼(CRIPPLED, BOHUN 등)도 있으므로 갱신 대신 무효화
+                self.patient_cache.invalidate(data['PCODE'])
+            if self.name_index is not None:
+                if data.get('PCODE'):
+                    self.name_index.add(data['PCODE'], data['PNAME'])
+                else:
+                    # 신규 PCODE는 DB가 부여하므로 워터마크 이후 행을 다시 읽어 반영
+                    self._sync_name_index(conn)
+
+    def save_patients_many(self, records, commit_interval=500):
+        """환자 레코드 일괄 저장 (이관/일괄 가져오기용)
+
+        commit_interval 건마다 executemany로 실행하고 커밋합니다.
+        배치 실행 중 오류가 나면 해당 배치만 한 건씩 다시 실행하여
+        실패한 행만 기록하고 나머지는 저장합니다 (전체 작업은 중단되지 않음).
+        반환: {'saved': 저장 건수, 'errors': [(입력 순번, 레코드, 오류 메시지), ...]}
+        """
+        if commit_interval < 1:
+            raise ValueError(f"잘못된 커밋 간격: {commit_interval}")
+
+        result = {'saved': 0, 'errors': []}
+        records = iter(records)
+        position = 0
+        with self.pool.connection() as conn:
+            while True:
+                batch = list(islice(records, commit_interval))
+                if not batch:
+                    break
+                self._save_patient_batch(conn, batch, position, result)
+                position += len(batch)
+            if self.name_index is not None:
+                self._sync_name_index(conn)
+        result['errors'].sort(key=lambda error: error[0])
+        return result
+
+    def _save_patient_batch(self, conn, batch, position, result):
+        inserts, updates = [], []
+        for offset, data in enumerate(batch):
+            try:
+                params = [data[f] for f in self.SAVE_FIELDS]
+            except (KeyError, TypeError) as e:
+                result['errors'].append((position + offset, data, f"필드 누락: {e}"))
+                continue
+            if data.get('PCODE'):
+                updates.append((position + offset, data, params + [data['PCODE']]))
+            else:
+                inserts.append((position + offset, data, params))
+
+        try:
+            if inserts:
+                self._executemany(conn, self.INSERT_PATIENT_SQL, [params for _, _, params in inserts])
+            if updates:
+                self._executemany(conn, self.UPDATE_PATIENT_SQL, [params for _, _, params in updates])
+            conn.commit()
+            saved = inserts + updates
+        except Exception:
+            # 배치 전체를 되돌리고 한 건씩 실행하여 문제 행만 골라냄
+            conn.rollback()
+            saved = []
+            for sql, rows in ((self.INSERT_PATIENT_SQL, inserts), (self.UPDATE_PATIENT_SQL, updates)):
+                for index, data, params in rows:
+                    try:
+                        self._execute(conn, sql, params)
+                    except Exception as e:
+                        result['errors'].append((index, data, str(e)))
+                    else:
+                        saved.append((index, data, params))
+            conn.commit()
+
+        result['saved'] += len(saved)
+        for _, data, _ in saved:
+            if data.get('PCODE'):
+                self.patient_cache.invalidate(data['PCODE'])
+                if self.name_index is not None:
+                    self.name_index.add(data['PCODE'], data['PNAME'])
+
+    def _save_patient(self, conn, data):
+        # Firebird와 SQLite 모두 ? 파라미터 사용
         if 'PCODE' in data and data['PCODE']:
             # 수정 (UPDATE)
-            fields = ['PNAME', 'PBIRTH', 'PIDNUM', 'SEX', 'RELATION', 'AGREE']
-            set_clause = ", ".join([f"{f} = ?" for f in fields])
-            query = f"UPDATE PERSON SET {set_clause} WHERE PCODE = ?"
-            params = [data[f] for f in fields] + [data['PCODE']]
-            cursor.execute(query, params)
+            params = [data[f] for f in self.SAVE_FIELDS] + [data['PCODE']]
+            self._execute(conn, self.UPDATE_PATIENT_SQL, params)
         else:
             # 신규 (INSERT)
-            fields = ['PNAME', 'PBIRTH', 'PIDNUM', 'SEX', 'RELATION', 'AGREE']
-            placeholders = ", ".join(["?" for _ in fields])
-            query = f"INSERT INTO PERSON ({', '.join(fields)}) VALUES ({placeholders})"
-            params = [data[f] for f in fields]
-            cursor.execute(query, params)
+            params = [data[f] for f in self.SAVE_FIELDS]
+            self._execute(conn, self.INSERT_PATIENT_SQL, params)
             
         conn.commit()
-        conn.close()
+
+class _DbRunnable(QRunnable):
+    """작업 스레드에서 DB 함수를 실행하고 결과를 DbExecutor 시그널로 전달"""
+
+    def __init__(self, executor, ticket, func, args, kwargs):
+        super().__init__()
+        self.setAutoDelete(False)  # 파이썬 쪽에서 참조를 관리 (DbExecutor._runnables)
+        self.executor = executor
+        self.ticket = ticket
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        try:
+            result = self.func(*self.args, **self.kwargs)
+        except Exception as e:
+            self.executor._finished.emit(self.ticket, False, e)
+        else:
+            self.executor._finished.emit(self.ticket, True, result)
+
+
+class DbExecutor(QObject):
+    """GUI 스레드 밖에서 DB 작업을 실행하는 실행기
+
+    결과는 시그널(큐 연결)을 통해 GUI 스레드에서 콜백으로 전달됩니다.
+    같은 channel로 새 작업을 제출하면 이전 작업은 취소되며,
+    아직 시작 전이면 큐에서 제거하고 실행 중이면 결과를 버립니다.
+    """
+
+    _finished = pyqtSignal(int, bool, object)
+
+    def __init__(self, max_threads=4, parent=None):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        self._next_ticket = 0
+        self._runnables = {}  # ticket -> _DbRunnable
+        self._callbacks = {}  # ticket -> (on_result, on_error, channel)
+        self._latest = {}     # channel -> 가장 최근 ticket
+        self._finished.connect(self._dispatch)
+
+    def submit(self, func, *args, on_result=None, on_error=None, channel=None, **kwargs):
+        self._next_ticket += 1
+        ticket = self._next_ticket
+        if channel is not None:
+            previous = self._latest.get(channel)
+            if previous is not None:
+                self.cancel(previous)
+            self._latest[channel] = ticket
+
+        runnable = _DbRunnable(self, ticket, func, args, kwargs)
+        self._runnables[ticket] = runnable
+        self._callbacks[ticket] = (on_result, on_error, channel)
+        self._pool.start(runnable)
+        return ticket
+
+    def cancel(self, ticket):
+        """작업 취소 (시작 전이면 큐에서 제거, 실행 중이면 완료 후 결과 폐기)"""
+        self._callbacks.pop(ticket, None)
+        runnable = self._runnables.get(ticket)
+        if runnable is not None and self._pool.tryTake(runnable):
+            del self._runnables[ticket]
+
+    def shutdown(self, timeout_ms=5000):
+        self._callbacks.clear()
+        self._pool.clear()
+        self._pool.waitForDone(timeout_ms)
+
+    def _dispatch(self, ticket, ok, payload):
+        self._runnables.pop(ticket, None)
+        callback = self._callbacks.pop(ticket, None)
+        if callback is None:
+            return
+        on_result, on_error, channel = callback
+        if channel is not None and self._latest.get(channel) == ticket:
+            del self._latest[channel]
+        if ok:
+            if on_result:
+                on_result(payload)
+        elif on_error:
+            on_error(payload)
+        else:
+            print(f"DB 작업 오류: {payload}")
+
+
+class PatientResultModel(QAbstractTableModel):
+    """환자 검색 결과 모델
+
+    결과를 컬럼별 배열로 보관하고, 뷰가 스크롤하여 행이 더 필요할 때만
+    (canFetchMore/fetchMore) DatabaseManager에서 다음 페이지를 가져옵니다.
+    첫 화면 표시 비용은 전체 결과 크기와 무관하게 한 페이지 분량입니다.
+    페이지 조회는 DbExecutor에서 실행되어 GUI 스레드를 막지 않습니다.
+    """
+
+    HEADERS = ["개인번호", "성명", "생년월일", "주민번호"]
+
+    load_failed = pyqtSignal(str)
+
+    def __init__(self, db, executor, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.executor = executor
+        self._keyword = None
+        self._after = None
+        self._has_more = False
+        self._loading = False
+        self._clear_columns()
+
+    def _clear_columns(self):
+        self._pcodes = array('q')
+        self._names = []
+        self._births = []
+        self._idnums = []
+
+    def set_keyword(self, keyword):
+        """새 검색 시작 (기존 결과를 버리고 첫 페이지부터 다시 가져옴)"""
+        self.beginResetModel()
+        self._clear_columns()
+        self._keyword = keyword
+        self._after = None
+        self._has_more = True
+        self._loading = False
+        self.endResetModel()
+        # 이전 검색어의 페이지 요청은 같은 channel의 새 요청으로 대체되어 결과가 폐기됨
+        self.fetchMore()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._pcodes)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        value = self.row_values(index.row())[index.column()]
+        return "" if value is None else str(value)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._has_more and not self._loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self._has_more or self._loading:
+            return
+        self._loading = True
+        self.executor.submit(
+            self.db.search_patients_page, self._keyword, self._after,
+            on_result=self._on_page_loaded, on_error=self._on_page_failed, channel=self,
+        )
+
+    def _on_page_loaded(self, result):
+        rows, self._after = result
+        self._has_more = self._after is not None
+        self._loading = False
+        self.append_rows(rows)
+
+    def _on_page_failed(self, error):
+        self._has_more = False
+        self._loading = False
+        self.load_failed.emit(str(error))
+
+    def append_rows(self, rows):
+        if not rows:
+            return
+        first = len(self._pcodes)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        for pcode, pname, pbirth, pidnum in rows:
+            self._pcodes.append(pcode)
+            self._names.append(pname)
+            self._births.append(pbirth)
+            self._idnums.append(pidnum)
+        self.endInsertRows()
+
+    def row_values(self, row):
+        return (self._pcodes[row], self._names[row], self._births[row], self._idnums[row])
+
+
+class WaitingListModel(QAbstractTableModel):
+    """대기 목록 모델
+
+    poll_waiting_list() 결과를 반영할 때 추가/삭제/변경된 행만 알려
+    뷰가 바뀐 행만 다시 그리도록 합니다.
+    """
+
+    HEADERS = ["순번", "성명", "상태", "시간"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._keys = []
+        self._rows = []
+        self.signature = None
+        self.watermark = None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        pcode, pname, roomnm, visidate = self._rows[index.row()]
+        value = (index.row() + 1, pname, roomnm, visidate)[index.column()]
+        return "" if value is None else str(value)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def apply_poll(self, result):
+        """폴링 결과 반영 (변경이 있었으면 True)"""
+        self.signature = result['signature']
+        self.watermark = result['watermark']
+        if result['mode'] == 'unchanged':
+            return False
+        rows = [(r[0], tuple(r[1:])) for r in result['rows']]
+        if result['mode'] == 'delta':
+            self._append(rows)
+            return bool(rows)
+        return self._merge(rows)
+
+    def _append(self, rows):
+        if not rows:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        for key, row in rows:
+            self._keys.append(key)
+            self._rows.append(row)
+        self.endInsertRows()
+
+    def _merge(self, rows):
+        """전체 결과와 비교하여 삭제/삽입/변경된 행만 반영"""
+        changed = False
+        new_keys = {key for key, _ in rows}
+        for i in reversed(range(len(self._keys))):
+            if self._keys[i] not in new_keys:
+                self.beginRemoveRows(QModelIndex(), i, i)
+                del self._keys[i]
+                del self._rows[i]
+                self.endRemoveRows()
+                changed = True
+
+        for i, (key, row) in enumerate(rows):
+            if i < len(self._keys) and self._keys[i] == key:
+                if self._rows[i] != row:
+                    self._rows[i] = row
+                    self.dataChanged.emit(self.index(i, 0), self.index(i, len(self.HEADERS) - 1))
+                    changed = True
+            else:
+                self.beginInsertRows(QModelIndex(), i, i)
+                self._keys.insert(i, key)
+                self._rows.insert(i, row)
+                self.endInsertRows()
+                changed = True
+
+        if len(self._keys) != len(rows):
+            # 정렬 순서가 바뀐 경우 등 - 전체 다시 그리기
+            self.beginResetModel()
+            self._keys = [key for key, _ in rows]
+            self._rows = [row for _, row in rows]
+            self.endResetModel()
+            changed = True
+        if changed and rows:
+            # 삭제/삽입으로 순번이 바뀐 행 갱신
+            self.dataChanged.emit(self.index(0, 0), self.index(len(rows) - 1, 0))
+        return changed
+
 
 class DeskProUI(QMainWindow):
+    SEARCH_DEBOUNCE_MS = 250
+    # 대기 목록 폴링 간격: 변경이 있으면 최소값으로 당기고, 없으면 최대값까지 점차 늘림
+    WAIT_POLL_MIN_MS = 1000
+    WAIT_POLL_MAX_MS = 30000
+    WAIT_POLL_BACKOFF = 1.5
+    # 요약(건수/워터마크/상태 체크섬)에 드러나지 않는 수정(환자 이름 등)을 반영하기 위해 N번에 한 번은 전체 비교
+    WAIT_FULL_REFRESH_POLLS = 10
+
     def __init__(self):
         super().__init__()
-        self.db = DatabaseManager()
+        # 시작 단계별 소요 시간 (프로세스 시작 기준, 초)
+        self.startup_times = {'import': _IMPORTS_DONE - _PROCESS_START}
+        self._first_paint_done = False
+        # DB 연결/스키마 확인/색인 로드는 첫 화면 표시 후 작업 스레드에서 수행
+        self.db = DatabaseManager(auto_open=False)
+        self.db_ready = False
+        self.db_executor = DbExecutor(parent=self)
         self.current_patient_pcode = None
         
         self.setWindowTitle("DeskPro - 접수 및 진료 관리 시스템 (SQL 연동)")
@@ -164,25 +1333,100 @@ class DeskProUI(QMainWindow):
         main_layout.addLayout(header_layout)
 
         content_layout = QHBoxLayout()
+        # 탭 내용은 처음 표시될 때 생성
+        self._lazy_tabs = {}
         
         # 왼쪽 패널
         left_panel = QVBoxLayout()
         self.left_tabs = QTabWidget()
-        self.reception_tab = QWidget()
-        self.setup_reception_tab(self.reception_tab)
-        self.left_tabs.addTab(self.reception_tab, "접수업무")
+        self.add_lazy_tab(self.left_tabs, "접수업무", self.create_reception_tab)
         left_panel.addWidget(self.left_tabs)
         content_layout.addLayout(left_panel, 2)
         
         # 오른쪽 패널
         right_panel = QVBoxLayout()
         self.right_tabs = QTabWidget()
-        self.right_tabs.addTab(self.create_waiting_list(), "대기")
+        self.add_lazy_tab(self.right_tabs, "대기", self.create_waiting_list)
         right_panel.addWidget(self.right_tabs)
         content_layout.addLayout(right_panel, 3)
         
         main_layout.addLayout(content_layout)
 
+    def add_lazy_tab(self, tabs, title, builder):
+        """빈 자리표시 위젯으로 탭을 추가하고 처음 선택될 때 builder()로 내용 생성"""
+        placeholder = QWidget()
+        layout = QVBoxLayout(placeholder)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self._lazy_tabs[placeholder] = builder
+        first = tabs.count() == 0
+        tabs.addTab(placeholder, title)
+        if first:
+            # 첫 탭 추가 시 currentChanged(0)이 발생하므로 추가한 뒤 연결 (현재 탭은 _finish_startup에서 생성)
+            tabs.currentChanged.connect(lambda i, t=tabs: self.ensure_tab_built(t.widget(i)))
+        return placeholder
+
+    def ensure_tab_built(self, placeholder):
+        builder = self._lazy_tabs.pop(placeholder, None)
+        if builder is not None:
+            placeholder.layout().addWidget(builder())
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._first_paint_done:
+            self._first_paint_done = True
+            self.startup_times['first_paint'] = time.perf_counter() - _PROCESS_START
+            # 첫 화면이 그려진 다음 이벤트 루프에서 나머지 초기화
+            QTimer.singleShot(0, self._finish_startup)
+
+    def _finish_startup(self):
+        for tabs in (self.left_tabs, self.right_tabs):
+            self.ensure_tab_built(tabs.currentWidget())
+        self.startup_times['tabs_built'] = time.perf_counter() - _PROCESS_START
+        self.db_executor.submit(self.db.open, on_result=self._on_db_ready, on_error=self._on_db_failed)
+
+    def _on_db_ready(self, _):
+        self.db_ready = True
+        self.startup_times['db_init'] = self.db.open_seconds
+        self.startup_times['interactive'] = time.perf_counter() - _PROCESS_START
+        self.set_db_controls_enabled(True)
+        if hasattr(self, 'wait_timer'):
+            self.schedule_wait_poll(0)
+        self.report_startup()
+
+    def _on_db_failed(self, error):
+        QMessageBox.critical(self, "오류", f"DB 연결 실패: {error}")
+
+    def set_db_controls_enabled(self, enabled):
+        if hasattr(self, 'search_input'):
+            self.search_input.setEnabled(enabled)
+            self.search_input.setPlaceholderText("" if enabled else "DB 연결 중...")
+            self.btn_save.setEnabled(enabled)
+
+    def report_startup(self):
+        """시작 시간 보고 (DESKPRO_STARTUP_LOG 환경 변수가 있으면 JSON 한 줄씩 추가 기록)"""
+        t = self.startup_times
+        print(f"[시작 시간] import {t['import']:.3f}s, 첫 화면 {t['first_paint']:.3f}s, "
+              f"DB 초기화 {t['db_init']:.3f}s, 사용 가능 {t['interactive']:.3f}s")
+        log_path = os.environ.get("DESKPRO_STARTUP_LOG")
+        if log_path:
+            try:
+                with open(log_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(dict(t, timestamp=time.time(), db_path=self.db.db_path)) + "\n")
+            except OSError as e:
+                print(f"Warning: 시작 시간 기록 실패: {e}")
+
+    def closeEvent(self, event):
+        if hasattr(self, 'wait_timer'):
+            self.wait_timer.stop()
+        self.db_executor.shutdown()
+        self.db.close()
+        super().closeEvent(event)
+
+    def create_reception_tab(self):
+        tab = QWidget()
+        self.setup_reception_tab(tab)
+        return tab
+
     def setup_reception_tab(self, tab):
         layout = QVBoxLayout(tab)
         
@@ -191,6 +1435,12 @@ class DeskProUI(QMainWindow):
         search_layout.addWidget(QLabel("수진자 검색:"))
         self.search_input = QLineEdit()
         self.search_input.returnPressed.connect(self.on_search)
+        # 입력 중 검색: 마지막 키 입력 후 잠시 기다렸다가 한 번만 조회
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.on_search)
+        self.search_input.textChanged.connect(lambda _: self.search_timer.start())
         search_layout.addWidget(self.search_input)
         
         search_btn = QPushButton("조회")
@@ -239,49 +1489,113 @@ class DeskProUI(QMainWindow):
         act_layout.addWidget(self.btn_save)
         act_layout.addWidget(self.btn_new)
         layout.addLayout(act_layout)
+        self.set_db_controls_enabled(self.db_ready)
 
         # 검색 결과 테이블
-        self.result_table = QTableWidget(0, 4)
-        self.result_table.setHorizontalHeaderLabels(["개인번호", "성명", "생년월일", "주민번호"])
-        self.result_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.result_table.itemDoubleClicked.connect(self.load_patient_details)
+        self.result_model = PatientResultModel(self.db, self.db_executor, self)
+        self.result_model.load_failed.connect(
+            lambda msg: QMessageBox.critical(self, "오류", f"조회 실패: {msg}"))
+        self.result_table = QTableView()
+        self.result_table.setModel(self.result_model)
+        self.result_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.result_table.doubleClicked.connect(self.load_patient_details)
         layout.addWidget(self.result_table)
 
     def create_waiting_list(self):
         widget = QWidget()
         layout = QVBoxLayout(widget)
-        self.wait_table = QTableWidget(5, 4)
-        self.wait_table.setHorizontalHeaderLabels(["순번", "성명", "상태", "시간"])
+        self.wait_model = WaitingListModel(self)
+        self.wait_table = QTableView()
+        self.wait_table.setModel(self.wait_model)
+        self.wait_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         layout.addWidget(self.wait_table)
+
+        self.wait_poll_ms = self.WAIT_POLL_MIN_MS
+        self.wait_poll_count = 0
+        self.wait_timer = QTimer(self)
+        self.wait_timer.setSingleShot(True)
+        self.wait_timer.timeout.connect(self.poll_waiting_list)
+        if self.db_ready:
+            self.schedule_wait_poll(0)
         return widget
 
+    def schedule_wait_poll(self, delay_ms=None):
+        if delay_ms is None:
+            # 여러 워크스테이션의 폴링 시점이 겹치지 않도록 ±10% 흔들기
+            delay_ms = int(self.wait_poll_ms * random.uniform(0.9, 1.1))
+        self.wait_timer.start(delay_ms)
+
+    def poll_waiting_list(self):
+        # 다음 폴링은 결과를 받은 뒤 예약하므로 요청이 겹치지 않음
+        self.wait_poll_count += 1
+        self.db_executor.submit(
+            self.db.poll_waiting_list, self.wait_model.signature, self.wait_model.watermark,
+            force_full=self.wait_poll_count % self.WAIT_FULL_REFRESH_POLLS == 0,
+            on_result=self._on_wait_polled, on_error=self._on_wait_poll_failed, channel='wait_poll',
+        )
+
+    def _on_wait_polled(self, result):
+        if self.wait_model.apply_poll(result):
+            self.wait_poll_ms = self.WAIT_POLL_MIN_MS
+        else:
+            self.wait_poll_ms = min(int(self.wait_poll_ms * self.WAIT_POLL_BACKOFF), self.WAIT_POLL_MAX_MS)
+        self.schedule_wait_poll()
+
+    def _on_wait_poll_failed(self, error):
+        print(f"대기 목록 조회 오류: {error}")
+        self.wait_poll_ms = self.WAIT_POLL_MAX_MS
+        self.schedule_wait_poll()
+
     def on_search(self):
+        self.search_timer.stop()
         keyword = self.search_input.text()
-        results = self.db.search_patients(keyword)
-        
-        self.result_table.setRowCount(0)
-        for row_data in results:
-            row = self.result_table.rowCount()
-            self.result_table.insertRow(row)
-            self.result_table.setItem(row, 0, QTableWidgetItem(str(row_data['PCODE'])))
-            self.result_table.setItem(row, 1, QTableWidgetItem(row_data['PNAME']))
-            self.result_table.setItem(row, 2, QTableWidgetItem(row_data['PBIRTH']))
-            self.result_table.setItem(row, 3, QTableWidgetItem(row_data['PIDNUM']))
-
-    def load_patient_details(self, item):
-        row = item.row()
-        pcode = self.result_table.item(row, 0).text()
-        
-        # 테이블에서 직접 로드 (실제로는 DB 재조회 권장)
+        # 뷰가 필요한 만큼만 fetchMore로 페이지를 가져감
+        self.result_model.set_keyword(keyword)
+
+    def load_patient_details(self, index):
+        pcode, pname, pbirth, pidnum = self.result_model.row_values(index.row())
         self.current_patient_pcode = int(pcode)
-        self.form_fields['PNAME'].setText(self.result_table.item(row, 1).text())
-        self.form_fields['PIDNUM'].setText(self.result_table.item(row, 3).text())
-        
-        birth_str = self.result_table.item(row, 2).text()
+
+        # 최근 조회한 환자는 캐시에서 바로, 아니면 DB에서 전체 컬럼을 다시 읽어 채움
+        patient = self.db.get_cached_patient(self.current_patient_pcode)
+        if patient is not None:
+            self.fill_form(patient)
+            return
+
+        # 조회 결과를 기다리는 동안 검색 결과 값으로 먼저 표시
+        self.fill_form({'PCODE': pcode, 'PNAME': pname, 'PBIRTH': pbirth, 'PIDNUM': pidnum})
+        self.db_executor.submit(
+            self.db.get_patient, self.current_patient_pcode,
+            on_result=self._on_patient_loaded, channel='patient_detail',
+        )
+
+    def _on_patient_loaded(self, patient):
+        # 조회 중에 다른 환자를 선택했거나 폼을 비운 경우 무시
+        if patient is not None and patient['PCODE'] == self.current_patient_pcode:
+            self.fill_form(patient)
+
+    def fill_form(self, patient):
+        self.form_fields['PNAME'].setText(patient.get('PNAME') or "")
+        self.form_fields['PIDNUM'].setText(patient.get('PIDNUM') or "")
+
+        birth_str = "" if patient.get('PBIRTH') is None else str(patient['PBIRTH'])
         if birth_str:
             self.form_fields['PBIRTH'].setDate(QDate.fromString(birth_str, "yyyy-MM-dd"))
-            
-        # 성별/동의 등은 검색결과에 없으므로 여기선 생략 또는 DB 재조회 로직 추가
+
+        # 값이 없는 행에서도 이전 환자의 성별/동의 표시가 남지 않도록 먼저 해제
+        self.clear_gender()
+        if patient.get('SEX') == 'M':
+            self.gender_m.setChecked(True)
+        elif patient.get('SEX') == 'F':
+            self.gender_f.setChecked(True)
+        self.form_fields['AGREE'].setChecked(bool(patient.get('AGREE')))
+
+    def clear_gender(self):
+        """성별 라디오 버튼 모두 해제 (자동 배타 상태에서는 setChecked(False)로 해제되지 않음)"""
+        for button in (self.gender_m, self.gender_f):
+            button.setAutoExclusive(False)
+            button.setChecked(False)
+            button.setAutoExclusive(True)
 
     def on_save(self):
         data = {
@@ -296,18 +1610,27 @@ class DeskProUI(QMainWindow):
         if self.current_patient_pcode:
             data['PCODE'] = self.current_patient_pcode
             
-        try:
-            self.db.save_patient(data)
-            QMessageBox.information(self, "성공", "환자 정보가 저장되었습니다.")
-            self.on_search()
-        except Exception as e:
-            QMessageBox.critical(self, "오류", f"저장 실패: {str(e)}")
+        self.btn_save.setEnabled(False)
+        self.db_executor.submit(
+            self.db.save_patient, data,
+            on_result=self._on_save_done, on_error=self._on_save_failed,
+        )
+
+    def _on_save_done(self, _):
+        self.btn_save.setEnabled(True)
+        QMessageBox.information(self, "성공", "환자 정보가 저장되었습니다.")
+        self.on_search()
+
+    def _on_save_failed(self, e):
+        self.btn_save.setEnabled(True)
+        QMessageBox.critical(self, "오류", f"저장 실패: {str(e)}")
 
     def clear_form(self):
         self.current_patient_pcode = None
         self.form_fields['PNAME'].clear()
         self.form_fields['PIDNUM'].clear()
         self.form_fields['PBIRTH'].setDate(QDate.currentDate())
+        self.clear_gender()
         self.form_fields['AGREE'].setChecked(False)
 
 if __name__ == "__main__":
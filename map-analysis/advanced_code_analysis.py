@@ -9,13 +9,24 @@ import sys
 from pathlib import Path
 from collections import defaultdict
 
+from analyze_pe_structure import PEAnalyzer
+from binary_scan import KeywordScanner, MappedFile, merge_windows, printable_runs
+
 def analyze_pe_file(file_path):
     """PE 파일 고급 분석"""
     print(f"파일 분석 중: {file_path}")
     
-    with open(file_path, 'rb') as f:
-        data = f.read()
+    # 섹션 색인 (PE 헤더를 읽을 수 없으면 None: 파일 오프셋을 그대로 주소로 봄)
+    analyzer = PEAnalyzer(file_path)
+    section_index = analyzer.section_index if analyzer.analyze() else None
+    analyzer.close()
     
+    # 파일 전체를 읽지 않고 mmap 위에서 바로 검색 (결과에는 복사된 문자열만 남음)
+    with MappedFile(file_path) as buffer:
+        return analyze_buffer(buffer.data, section_index)
+
+def analyze_buffer(data, section_index=None):
+    """바이트 버퍼 (bytes 또는 mmap) 분석 (section_index는 PEAnalyzer.section_index)"""
     results = {
         'sql_queries': [],
         'api_calls': [],
@@ -30,58 +41,65 @@ def analyze_pe_file(file_path):
     results['api_calls'] = extract_api_calls(data)
     
     # 3. 함수 호출 패턴
-    results['function_patterns'] = extract_function_patterns(data)
+    results['function_patterns'] = extract_function_patterns(data, section_index)
     
     # 4. 데이터 구조 패턴
     results['data_structures'] = extract_data_structures(data)
     
     return results
 
+# SQLite 함수 호출 패턴과 주변 분석 구간 (함수명 앞 200바이트 ~ 뒤 1000바이트)
+SQLITE_CALLS = KeywordScanner([
+    b'sqlite3_prepare',
+    b'sqlite3_exec',
+    b'sqlite3_step',
+    b'sqlite3_bind',
+])
+CONTEXT_BEFORE = 200
+CONTEXT_AFTER = 1000
+
+# 호출 주변의 SQL 쿼리 패턴
+CONTEXT_SQL_PATTERNS = [re.compile(pattern, re.IGNORECASE | re.DOTALL) for pattern in (
+    rb'SELECT\s+.*?FROM',
+    rb'INSERT\s+INTO\s+.*?VALUES',
+    rb'UPDATE\s+.*?SET',
+    rb'DELETE\s+FROM\s+.*?WHERE',
+)]
+
 def extract_sql_queries_advanced(data):
     """고급 SQL 쿼리 추출"""
     queries = []
+    size = len(data)
     
-    # SQLite 함수 호출 패턴
-    sqlite_functions = [
-        b'sqlite3_prepare',
-        b'sqlite3_exec',
-        b'sqlite3_step',
-        b'sqlite3_bind',
-    ]
+    # 함수별로 모은 뒤 함수 순서대로 이어 붙임 (함수마다 따로 검색하던 때와 같은 순서)
+    found = {func: [] for func in SQLITE_CALLS.keywords}
     
-    for func in sqlite_functions:
-        idx = 0
-        while True:
-            idx = data.find(func, idx)
-            if idx == -1:
-                break
-            
+    # 겹치는 호출 주변 구간은 합쳐서, 같은 일치 구간은 한 번만 디코딩
+    for region_start, region_end, hits in merge_windows(SQLITE_CALLS.scan(data), CONTEXT_BEFORE, CONTEXT_AFTER, size):
+        decoded = {}
+        
+        for idx, func in hits:
             # 함수 호출 주변 분석
             # 일반적으로 함수 호출 후 문자열 인자가 올 수 있음
-            context_start = max(0, idx - 200)
-            context_end = min(len(data), idx + 1000)
-            context = data[context_start:context_end]
-            
-            # SQL 쿼리 패턴 찾기
-            sql_patterns = [
-                rb'SELECT\s+.*?FROM',
-                rb'INSERT\s+INTO\s+.*?VALUES',
-                rb'UPDATE\s+.*?SET',
-                rb'DELETE\s+FROM\s+.*?WHERE',
-            ]
+            context_start = max(0, idx - CONTEXT_BEFORE)
+            context_end = min(size, idx + CONTEXT_AFTER)
             
-            for pattern in sql_patterns:
-                matches = re.finditer(pattern, context, re.IGNORECASE | re.DOTALL)
-                for match in matches:
-                    query = match.group(0).decode('utf-8', errors='ignore').strip()
+            # SQL 쿼리 패턴 찾기 (구간을 복사하지 않고 버퍼 위에서 검색)
+            for pattern in CONTEXT_SQL_PATTERNS:
+                for match in pattern.finditer(data, context_start, context_end):
+                    span = match.span()
+                    if span not in decoded:
+                        decoded[span] = match.group(0).decode('utf-8', errors='ignore').strip()
+                    query = decoded[span]
                     if len(query) > 10:
-                        queries.append({
+                        found[func].append({
                             'query': query,
                             'function': func.decode('utf-8', errors='ignore'),
                             'offset': hex(idx),
                         })
-            
-            idx += 1
+    
+    for func_queries in found.values():
+        queries.extend(func_queries)
     
     # 문자열 섹션에서 직접 검색
     queries.extend(extract_sql_from_strings(data))
@@ -92,81 +110,77 @@ def extract_sql_from_strings(data):
     """문자열에서 SQL 추출 (개선된 버전)"""
     queries = []
     
-    # 연속된 인쇄 가능한 문자 찾기 (문자열 후보)
-    current_string = b''
-    string_start = 0
-    
-    for i in range(len(data)):
-        byte = data[i]
+    # 연속된 인쇄 가능한 문자 찾기 (문자열 후보, 최소 20바이트)
+    for string_start, current_string in printable_runs(data, 20):
+        # SQL 패턴 확인
+        text = current_string.decode('utf-8', errors='ignore')
         
-        if 32 <= byte < 127:  # 인쇄 가능한 ASCII
-            if not current_string:
-                string_start = i
-            current_string += bytes([byte])
-        else:
-            if len(current_string) >= 20:  # 최소 길이
-                # SQL 패턴 확인
-                text = current_string.decode('utf-8', errors='ignore')
-                
-                sql_keywords = ['SELECT', 'INSERT', 'UPDATE', 'DELETE', 'CREATE', 'ALTER', 'DROP']
-                if any(keyword in text.upper() for keyword in sql_keywords):
-                    # SQL 문장 추출
-                    match = re.search(
-                        r'(?i)(SELECT|INSERT|UPDATE|DELETE|CREATE|ALTER|DROP).*?(?:;|$)',
-                        text,
-                        re.DOTALL
-                    )
-                    if match:
-                        query = match.group(0).strip()
-                        if len(query) > 15:
-                            queries.append({
-                                'query': query,
-                                'function': 'STRING_SECTION',
-                                'offset': hex(string_start),
-                            })
-            
-            current_string = b''
+        sql_keywords = ['SELECT', 'INSERT', 'UPDATE', 'DELETE', 'CREATE', 'ALTER', 'DROP']
+        if any(keyword in text.upper() for keyword in sql_keywords):
+            # SQL 문장 추출
+            match = re.search(
+                r'(?i)(SELECT|INSERT|UPDATE|DELETE|CREATE|ALTER|DROP).*?(?:;|$)',
+                text,
+                re.DOTALL
+            )
+            if match:
+                query = match.group(0).strip()
+                if len(query) > 15:
+                    queries.append({
+                        'query': query,
+                        'function': 'STRING_SECTION',
+                        'offset': hex(string_start),
+                    })
     
     return queries
 
+# 일반적인 Windows API 패턴
+API_PATTERNS = [
+    (b'CreateFile', 'FILE_OPERATION'),
+    (b'ReadFile', 'FILE_OPERATION'),
+    (b'WriteFile', 'FILE_OPERATION'),
+    (b'RegOpenKey', 'REGISTRY'),
+    (b'RegQueryValue', 'REGISTRY'),
+    (b'InternetOpen', 'NETWORK'),
+    (b'HttpSendRequest', 'NETWORK'),
+    (b'LoadLibrary', 'DLL_LOAD'),
+    (b'GetProcAddress', 'DLL_LOAD'),
+]
+API_SCANNER = KeywordScanner([pattern for pattern, _ in API_PATTERNS])
+MAX_API_HITS = 100
+
 def extract_api_calls(data):
     """Windows API 호출 추출"""
     api_calls = []
     
-    # 일반적인 Windows API 패턴
-    api_patterns = [
-        (b'CreateFile', 'FILE_OPERATION'),
-        (b'ReadFile', 'FILE_OPERATION'),
-        (b'WriteFile', 'FILE_OPERATION'),
-        (b'RegOpenKey', 'REGISTRY'),
-        (b'RegQueryValue', 'REGISTRY'),
-        (b'InternetOpen', 'NETWORK'),
-        (b'HttpSendRequest', 'NETWORK'),
-        (b'LoadLibrary', 'DLL_LOAD'),
-        (b'GetProcAddress', 'DLL_LOAD'),
-    ]
-    
-    for pattern, category in api_patterns:
-        idx = 0
-        count = 0
-        while idx < len(data) and count < 100:  # 최대 100개
-            idx = data.find(pattern, idx)
-            if idx == -1:
+    # API별 최대 100개까지 한 번에 훑어 모음
+    offsets = {pattern: [] for pattern, _ in API_PATTERNS}
+    remaining = len(offsets)
+    for idx, pattern in API_SCANNER.scan(data):
+        found = offsets[pattern]
+        if len(found) >= MAX_API_HITS:
+            continue
+        found.append(idx)
+        if len(found) == MAX_API_HITS:
+            remaining -= 1
+            if not remaining:
                 break
-            
+    
+    for pattern, category in API_PATTERNS:
+        for idx in offsets[pattern]:
             api_calls.append({
                 'api': pattern.decode('utf-8', errors='ignore'),
                 'category': category,
                 'offset': hex(idx),
             })
-            
-            idx += 1
-            count += 1
     
     return api_calls
 
-def extract_function_patterns(data):
-    """함수 호출 패턴 추출"""
+def extract_function_patterns(data, section_index=None):
+    """함수 호출 패턴 추출
+    
+    section_index가 있으면 호출 위치를 RVA로 바꿔 대상 주소를 계산한 뒤 파일 오프셋으로 되돌립니다.
+    """
     patterns = []
     
     # x86 호출 패턴 (E8 = CALL rel32)
@@ -182,9 +196,13 @@ def extract_function_patterns(data):
         # 상대 주소 읽기
         try:
             rel_addr = struct.unpack('<i', data[idx+1:idx+5])[0]
-            target_addr = idx + 5 + rel_addr
+            if section_index:
+                call_rva = section_index.offset_to_rva(idx)
+                target_addr = section_index.rva_to_offset(call_rva + 5 + rel_addr) if call_rva is not None else None
+            else:
+                target_addr = idx + 5 + rel_addr
             
-            if 0 <= target_addr < len(data):
+            if target_addr is not None and 0 <= target_addr < len(data):
                 # 대상 주소 주변에서 함수명 시도
                 context = data[max(0, target_addr-50):min(len(data), target_addr+50)]
                 # 인쇄 가능한 문자열 찾기
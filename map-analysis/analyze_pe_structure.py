@@ -3,16 +3,102 @@ DeskPro.exe PE 파일 구조 분석 스크립트
 실행 파일의 구조를 분석하여 함수, 임포트, 리소스 등을 추출합니다.
 """
 
+import re
 import struct
 import sys
+from bisect import bisect_right
 from pathlib import Path
 from collections import defaultdict
 
+from binary_scan import KeywordScanner, MappedFile, printable_runs
+
+SQLITE_KEYWORDS = KeywordScanner([
+    b'sqlite3_',
+    b'SQLITE_',
+    b'sqlite_',
+])
+
+# 키워드 위치부터 이어지는 인쇄 가능한 ASCII (널/제어 문자에서 끝남)
+FUNCTION_NAME_RE = re.compile(rb'[\x20-\x7e]+')
+
+def scan_sqlite_functions(data):
+    """버퍼에서 SQLite 접두사로 시작하는 이름을 (오프셋, 이름) 순서로 찾기 (중복 포함)"""
+    for idx, keyword in SQLITE_KEYWORDS.scan(data):
+        # 함수명 추출 (키워드부터 공백/널까지, 최대 100바이트)
+        match = FUNCTION_NAME_RE.match(data, idx, idx + 100)
+        func_name = match.group() if match else b''
+        
+        if len(func_name) > len(keyword):
+            yield idx, func_name.decode('utf-8', errors='ignore')
+
+# 옵셔널 헤더 Magic 값
+PE32_MAGIC = 0x10b
+PE32_PLUS_MAGIC = 0x20b
+
+# 데이터 디렉터리 번호
+IMPORT_DIRECTORY = 1
+IAT_DIRECTORY = 12
+
+# 임포트 디스크립터 크기와, 손상된 파일에서 끝없이 읽지 않도록 둔 상한
+IMPORT_DESCRIPTOR_SIZE = 20
+MAX_IMPORT_DESCRIPTORS = 4096
+MAX_THUNKS = 65536
+
+class SectionIndex:
+    """섹션 표 색인: RVA ↔ 파일 오프셋 변환
+    
+    섹션을 가상 주소 순서와 원시 데이터 오프셋 순서로 각각 정렬해 두고 bisect로 찾으므로
+    주소 하나를 변환할 때 섹션 표를 처음부터 훑지 않습니다.
+    헤더 영역(SizeOfHeaders 미만)은 RVA와 파일 오프셋이 같습니다.
+    """
+    
+    def __init__(self, sections, size_of_headers=0):
+        self.size_of_headers = size_of_headers
+        self.by_rva = sorted(sections, key=lambda section: section['VirtualAddress'])
+        self.by_offset = sorted((section for section in sections if section['SizeOfRawData']),
+                                key=lambda section: section['PointerToRawData'])
+        self._rvas = [section['VirtualAddress'] for section in self.by_rva]
+        self._offsets = [section['PointerToRawData'] for section in self.by_offset]
+    
+    def section_at_rva(self, rva):
+        """RVA가 속한 섹션 (없으면 None)"""
+        i = bisect_right(self._rvas, rva) - 1
+        if i < 0:
+            return None
+        section = self.by_rva[i]
+        extent = section['VirtualSize'] or section['SizeOfRawData']
+        return section if rva - section['VirtualAddress'] < extent else None
+    
+    def section_at_offset(self, offset):
+        """파일 오프셋이 속한 섹션 (없으면 None)"""
+        i = bisect_right(self._offsets, offset) - 1
+        if i < 0:
+            return None
+        section = self.by_offset[i]
+        return section if offset - section['PointerToRawData'] < section['SizeOfRawData'] else None
+    
+    def rva_to_offset(self, rva):
+        """RVA를 파일 오프셋으로 변환 (파일에 내용이 없는 주소면 None)"""
+        section = self.section_at_rva(rva)
+        if section is None:
+            return rva if 0 <= rva < self.size_of_headers else None
+        delta = rva - section['VirtualAddress']
+        # 원시 데이터보다 뒤쪽 (0으로 채워지는 .bss 등)은 파일에 없음
+        return section['PointerToRawData'] + delta if delta < section['SizeOfRawData'] else None
+    
+    def offset_to_rva(self, offset):
+        """파일 오프셋을 RVA로 변환 (어느 섹션에도 매핑되지 않는 위치면 None)"""
+        section = self.section_at_offset(offset)
+        if section is None:
+            return offset if 0 <= offset < self.size_of_headers else None
+        return section['VirtualAddress'] + offset - section['PointerToRawData']
+
 class PEAnalyzer:
     """PE 파일 분석기"""
     
     def __init__(self, file_path):
         self.file_path = Path(file_path)
+        self.buffer = None
         self.data = None
         self.dos_header = None
         self.pe_header_offset = None
@@ -20,20 +106,28 @@ class PEAnalyzer:
         self.coff_header = None
         self.optional_header = None
         self.sections = []
+        self.section_index = None
         self.imports = []
         self.exports = []
         self.strings = []
         
     def read_file(self):
-        """파일 읽기"""
+        """파일을 읽기 전용 mmap으로 열기 (전체를 메모리로 복사하지 않음, close()로 해제)"""
         try:
-            with open(self.file_path, 'rb') as f:
-                self.data = f.read()
+            self.buffer = MappedFile(self.file_path)
+            self.data = self.buffer.data
             return True
         except Exception as e:
             print(f"파일 읽기 오류: {e}")
             return False
     
+    def close(self):
+        """파일 매핑 해제"""
+        if self.buffer:
+            self.buffer.close()
+            self.buffer = None
+            self.data = None
+    
     def parse_dos_header(self):
         """DOS 헤더 파싱"""
         if len(self.data) < 64:
@@ -74,6 +168,47 @@ class PEAnalyzer:
         
         return True
     
+    def parse_optional_header(self):
+        """옵셔널 헤더에서 이미지 기준 주소, 헤더 크기, 데이터 디렉터리 (RVA, 크기) 파싱"""
+        if not self.coff_header or not self.coff_header['SizeOfOptionalHeader']:
+            return False
+        
+        offset = self.pe_header_offset + 24
+        end = offset + self.coff_header['SizeOfOptionalHeader']
+        if len(self.data) < end or end - offset < 2:
+            return False
+        
+        magic = struct.unpack('<H', self.data[offset:offset+2])[0]
+        if magic == PE32_MAGIC:
+            image_base_format, image_base_offset, directories_offset = '<I', 28, 96
+        elif magic == PE32_PLUS_MAGIC:
+            image_base_format, image_base_offset, directories_offset = '<Q', 24, 112
+        else:
+            print(f"알 수 없는 옵셔널 헤더 형식: 0x{magic:X}")
+            return False
+        
+        if end - offset < directories_offset:
+            return False
+        
+        count = struct.unpack('<I', self.data[offset+directories_offset-4:offset+directories_offset])[0]
+        count = min(count, (end - offset - directories_offset) // 8)
+        directories = []
+        for i in range(count):
+            entry = offset + directories_offset + i * 8
+            directories.append(struct.unpack('<II', self.data[entry:entry+8]))
+        
+        self.optional_header = {
+            'Magic': magic,
+            'ImageBase': struct.unpack(image_base_format,
+                                       self.data[offset+image_base_offset:offset+image_base_offset+struct.calcsize(image_base_format)])[0],
+            'SizeOfImage': struct.unpack('<I', self.data[offset+56:offset+60])[0],
+            'SizeOfHeaders': struct.unpack('<I', self.data[offset+60:offset+64])[0],
+            'NumberOfRvaAndSizes': count,
+            'DataDirectories': directories,
+        }
+        
+        return True
+    
     def parse_sections(self):
         """섹션 헤더 파싱"""
         if not self.coff_header:
@@ -99,6 +234,9 @@ class PEAnalyzer:
             }
             self.sections.append(section)
         
+        size_of_headers = self.optional_header['SizeOfHeaders'] if self.optional_header else 0
+        self.section_index = SectionIndex(self.sections, size_of_headers)
+        
         return True
     
     def extract_strings_from_section(self, section_name='.rdata'):
@@ -110,86 +248,95 @@ class PEAnalyzer:
                 start = section['PointerToRawData']
                 end = min(start + section['SizeOfRawData'], len(self.data))
                 
-                current_string = b''
-                for i in range(start, end):
-                    byte = self.data[i]
-                    if 32 <= byte < 127:  # 인쇄 가능한 ASCII
-                        current_string += bytes([byte])
-                    else:
-                        if len(current_string) >= 4:  # 최소 4바이트 이상
-                            try:
-                                strings.append(current_string.decode('utf-8', errors='ignore'))
-                            except:
-                                pass
-                        current_string = b''
+                # 인쇄 가능한 ASCII 4바이트 이상
+                for offset, run in printable_runs(self.data, 4, start, end):
+                    strings.append(run.decode('utf-8', errors='ignore'))
         
         return strings
     
     def find_sqlite_functions(self):
-        """SQLite 관련 함수 찾기"""
-        sqlite_functions = []
-        sqlite_keywords = [
-            b'sqlite3_',
-            b'SQLITE_',
-            b'sqlite_',
-        ]
-        
-        for keyword in sqlite_keywords:
-            idx = 0
-            while True:
-                idx = self.data.find(keyword, idx)
-                if idx == -1:
-                    break
-                
-                # 함수명 추출 (키워드부터 공백/널까지)
-                start = idx
-                end = start + 100
-                snippet = self.data[start:end]
-                
-                # 인쇄 가능한 문자만 추출
-                func_name = b''
-                for b in snippet:
-                    if 32 <= b < 127 or b == 0:
-                        if b == 0:
-                            break
-                        func_name += bytes([b])
-                    else:
-                        break
-                
-                if len(func_name) > len(keyword):
-                    sqlite_functions.append(func_name.decode('utf-8', errors='ignore'))
-                
-                idx += 1
-        
-        return list(set(sqlite_functions))
+        """SQLite 관련 함수 찾기 (접두사 키워드를 한 번에 훑기)"""
+        return list({name for _, name in scan_sqlite_functions(self.data)})
     
-    def find_dll_imports(self):
-        """임포트된 DLL 및 함수 찾기"""
-        imports = defaultdict(list)
+    def read_c_string(self, offset, limit=512):
+        """파일 오프셋의 널 종료 ASCII 문자열 (최대 limit바이트)"""
+        end = self.data.find(b'\x00', offset, offset + limit)
+        if end == -1:
+            end = min(len(self.data), offset + limit)
+        return self.data[offset:end].decode('ascii', errors='replace')
+    
+    def parse_imports(self):
+        """임포트 디렉터리의 디스크립터와 썽크 표를 따라가 DLL별 임포트 함수 목록 파싱
         
-        # .idata 섹션 찾기
-        idata_section = None
-        for section in self.sections:
-            if '.idata' in section['Name'].lower() or '.rdata' in section['Name'].lower():
-                idata_section = section
-                break
+        함수마다 이름(서수 임포트는 None), 서수, 힌트, IAT 슬롯의 RVA와 가상 주소를 기록합니다.
+        이름/서수는 원본 썽크 표(OriginalFirstThunk)에서, 없으면 IAT(FirstThunk)에서 읽습니다.
+        IAT 데이터 디렉터리가 있으면 슬롯이 그 범위 안에 있는지 확인하고,
+        범위 밖(손상되었거나 잘못 읽은 디스크립터)이면 IAT 주소를 None으로 둡니다.
+        """
+        self.imports = []
+        if not self.optional_header or not self.section_index:
+            return self.imports
         
-        if not idata_section:
-            return imports
+        directories = self.optional_header['DataDirectories']
+        if len(directories) <= IMPORT_DIRECTORY or not directories[IMPORT_DIRECTORY][0]:
+            return self.imports
         
-        # 간단한 DLL 이름 검색
-        dll_names = [b'sqlite3.dll', b'kernel32.dll', b'user32.dll', b'msvcrt.dll']
+        pe32_plus = self.optional_header['Magic'] == PE32_PLUS_MAGIC
+        thunk_size = 8 if pe32_plus else 4
+        thunk_format = '<Q' if pe32_plus else '<I'
+        ordinal_flag = 1 << (thunk_size * 8 - 1)
+        image_base = self.optional_header['ImageBase']
+        iat_start, iat_size = directories[IAT_DIRECTORY] if len(directories) > IAT_DIRECTORY else (0, 0)
         
-        for dll_name in dll_names:
-            idx = 0
-            while True:
-                idx = self.data.find(dll_name, idx)
-                if idx == -1:
+        descriptor = self.section_index.rva_to_offset(directories[IMPORT_DIRECTORY][0])
+        for _ in range(MAX_IMPORT_DESCRIPTORS):
+            if descriptor is None or len(self.data) < descriptor + IMPORT_DESCRIPTOR_SIZE:
+                break
+            original_first_thunk, _, _, name_rva, first_thunk = struct.unpack(
+                '<5I', self.data[descriptor:descriptor+IMPORT_DESCRIPTOR_SIZE])
+            # 모든 필드가 0인 디스크립터가 목록의 끝
+            if not (original_first_thunk or name_rva or first_thunk):
+                break
+            descriptor += IMPORT_DESCRIPTOR_SIZE
+            
+            name_offset = self.section_index.rva_to_offset(name_rva)
+            dll = self.read_c_string(name_offset) if name_offset is not None else f"(이름 없음 0x{name_rva:X})"
+            functions = []
+            
+            thunk = self.section_index.rva_to_offset(original_first_thunk or first_thunk)
+            for i in range(MAX_THUNKS):
+                if thunk is None or len(self.data) < thunk + thunk_size:
+                    break
+                value = struct.unpack(thunk_format, self.data[thunk:thunk+thunk_size])[0]
+                if not value:
                     break
+                thunk += thunk_size
                 
-                # DLL 이름 주변에서 함수명 찾기 시도
-                imports[dll_name.decode('utf-8', errors='ignore')].append(f"참조 위치: 0x{idx:X}")
-                idx += 1
+                iat_rva = first_thunk + i * thunk_size
+                if iat_size and not iat_start <= iat_rva <= iat_start + iat_size - thunk_size:
+                    iat_rva = None
+                function = {'name': None, 'ordinal': None, 'hint': None, 'iat_rva': iat_rva,
+                            'iat_address': image_base + iat_rva if iat_rva is not None else None}
+                if value & ordinal_flag:
+                    function['ordinal'] = value & 0xFFFF
+                else:
+                    # IMAGE_IMPORT_BY_NAME: 힌트(2바이트) + 널 종료 이름
+                    hint_offset = self.section_index.rva_to_offset(value & 0x7FFFFFFF)
+                    if hint_offset is not None and len(self.data) >= hint_offset + 2:
+                        function['hint'] = struct.unpack('<H', self.data[hint_offset:hint_offset+2])[0]
+                        function['name'] = self.read_c_string(hint_offset + 2)
+                functions.append(function)
+            
+            self.imports.append({'dll': dll, 'functions': functions})
+        
+        return self.imports
+    
+    def find_dll_imports(self):
+        """임포트된 DLL 및 함수 찾기 (임포트 디렉터리 파싱 결과를 DLL 이름별로 모음)"""
+        imports = defaultdict(list)
+        
+        for entry in self.parse_imports():
+            imports[entry['dll']].extend(entry['functions'])
         
         return imports
     
@@ -204,6 +351,9 @@ class PEAnalyzer:
         if not self.parse_pe_header():
             return False
         
+        # 옵셔널 헤더가 없거나 손상돼도 섹션 분석은 계속 (임포트 파싱만 생략)
+        self.parse_optional_header()
+        
         if not self.parse_sections():
             return False
         
@@ -249,10 +399,15 @@ class PEAnalyzer:
             # DLL 임포트
             f.write("## 임포트된 DLL\n")
             imports = self.find_dll_imports()
-            for dll, refs in imports.items():
-                f.write(f"\n{dll}:\n")
-                for ref in refs[:10]:  # 처음 10개만
-                    f.write(f"  {ref}\n")
+            if not imports:
+                f.write("  임포트 디렉터리를 찾을 수 없습니다.\n")
+            for dll, functions in imports.items():
+                f.write(f"\n{dll}: 함수 {len(functions)}개\n")
+                for function in functions:
+                    name = function['name'] if function['name'] is not None else f"#{function['ordinal']}"
+                    hint = f" (힌트 {function['hint']})" if function['hint'] is not None else ""
+                    iat = f"0x{function['iat_address']:08X}" if function['iat_address'] is not None else "(IAT 범위 밖)"
+                    f.write(f"  {name}{hint}  IAT {iat}\n")
             f.write("\n")
             
             # .rdata 섹션에서 문자열 추출
@@ -280,4 +435,5 @@ if __name__ == '__main__':
         analyzer.generate_report()
     else:
         print("분석 실패!")
+    analyzer.close()
 
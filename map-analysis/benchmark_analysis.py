@@ -0,0 +1,344 @@
+"""
+분석 스크립트 성능 벤치마크
+generate_synthetic_pe.py로 만든 크기별 합성 PE 파일에 대해
+PEAnalyzer, extract_sql_strings, advanced_code_analysis, SQLQueryReviewer, UISQLMapper의
+소요 시간과 최대 메모리를 측정하고 결과를 JSON 파일로 기록합니다.
+
+각 측정은 새 프로세스에서 실행하므로 최대 메모리(peak RSS)가 서로 섞이지 않습니다.
+검토/매핑 단계는 같은 크기의 추출 단계가 작업 폴더에 남긴 findings.db를 입력으로 씁니다.
+sharded_* 벤치마크는 parallel_scan의 섹션 단위 병렬 스캔을 --jobs 값마다 실행해
+프로세스 수에 따른 속도 향상과 작업 프로세스 최대 메모리를 함께 기록합니다.
+
+사용 예:
+    python benchmark_analysis.py                              # 1/10/100MB 전체 벤치마크
+    python benchmark_analysis.py --sizes 1 --sizes 500 --only extract --only review
+    python benchmark_analysis.py --tracemalloc --output results.json
+    python benchmark_analysis.py --sizes 100 --only strings --only strings_bytewise
+    python benchmark_analysis.py --sizes 100 --only sharded_sql --jobs 1 --jobs 2 --jobs 4
+"""
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generate_synthetic_pe import MB, generate_pe
+
+DEFAULT_SIZES = [1, 10, 100]
+DEFAULT_TIMEOUT = 1800
+
+
+def bench_pe_structure(exe_path, work_dir):
+    """PEAnalyzer 헤더/섹션 분석 + 보고서 생성 (SQLite 함수, DLL, .rdata 문자열)"""
+    from analyze_pe_structure import PEAnalyzer
+
+    analyzer = PEAnalyzer(exe_path)
+    if not analyzer.analyze():
+        raise RuntimeError("PE 분석 실패")
+    analyzer.generate_report(work_dir / 'pe_analysis_report.txt')
+    analyzer.close()
+    return len(analyzer.sections)
+
+
+def bench_extract(exe_path, work_dir):
+    """extract_sql_strings 추출 + 결과 저장소 기록 (검토/매핑 단계의 입력 생성)"""
+    from extract_sql_strings import extract_sql_strings, save_results
+
+    queries = extract_sql_strings(exe_path)
+    save_results(queries, exe_path, work_dir / 'extracted_sql_queries.txt', work_dir / 'findings.db')
+    return len(queries)
+
+
+def bench_advanced(exe_path, work_dir):
+    """advanced_code_analysis 전체 분석 + 보고서 생성"""
+    from advanced_code_analysis import analyze_pe_file, generate_advanced_report
+
+    results = analyze_pe_file(exe_path)
+    generate_advanced_report(results, work_dir / 'advanced_analysis_report.txt')
+    return len(results['sql_queries'])
+
+
+def bench_review(exe_path, work_dir):
+    """SQLQueryReviewer 분류 + 조각 재조립 + 보고서 (review_sql_queries.py 실행과 같은 순서)"""
+    from findings_store import FindingsStore
+    from review_sql_queries import SQLQueryReviewer
+
+    with FindingsStore(work_dir / 'findings.db') as store:
+        reviewer = SQLQueryReviewer(work_dir / 'extracted_sql_queries.txt')
+        reviewer.analyze_queries(store.iter_queries())
+        store.save_reviews(reviewer.valid_queries + reviewer.broken_queries + reviewer.invalid_queries)
+        store.mark_duplicates(reviewer.duplicates)
+    reviewer.cluster_fragments()
+    reviewer.generate_report(work_dir / 'sql_query_review_report.txt')
+    reviewer.export_valid_queries(work_dir / 'valid_sql_queries.txt')
+    return reviewer.statistics['total']
+
+
+def bench_mapping(exe_path, work_dir):
+    """UISQLMapper 매핑 + 보고서 (검토 결과가 기록된 저장소 사용)"""
+    from ui_sql_mapping import UISQLMapper
+
+    mapper = UISQLMapper()
+    mapper.load_ui_structure()
+    if not mapper.load_sql_queries_from_store(work_dir / 'findings.db'):
+        raise RuntimeError("저장소에 유효 쿼리가 없습니다")
+    mapper.map_ui_to_sql()
+    mapper.generate_mapping_report(work_dir / 'ui_sql_mapping_report.md')
+    mapper.generate_detailed_mapping(work_dir / 'ui_sql_detailed_mapping.txt')
+    return len(mapper.mappings)
+
+
+def bench_sharded_sql(exe_path, work_dir, jobs):
+    """parallel_scan 섹션 단위 병렬 extract_sql_strings 검색"""
+    from parallel_scan import scan_file
+
+    return len(scan_file(exe_path, 'sql', jobs))
+
+
+def bench_sharded_advanced_sql(exe_path, work_dir, jobs):
+    """parallel_scan 섹션 단위 병렬 advanced_code_analysis SQL 검색"""
+    from parallel_scan import scan_file
+
+    return len(scan_file(exe_path, 'advanced_sql', jobs))
+
+
+def bench_sharded_sqlite_functions(exe_path, work_dir, jobs):
+    """parallel_scan 섹션 단위 병렬 SQLite 함수명 검색"""
+    from parallel_scan import scan_file
+
+    return len(scan_file(exe_path, 'sqlite_functions', jobs))
+
+
+def bench_strings(exe_path, work_dir):
+    """파일 전체 인쇄 가능 문자열 추출 (binary_scan.printable_runs, 4바이트 이상)"""
+    from binary_scan import MappedFile, printable_runs
+
+    with MappedFile(exe_path) as buffer:
+        return sum(1 for _ in printable_runs(buffer.data, 4))
+
+
+def bench_strings_bytewise(exe_path, work_dir):
+    """비교 기준: 바이트마다 Python 루프로 문자열을 이어 붙이던 이전 방식"""
+    from binary_scan import MappedFile
+
+    count = 0
+    with MappedFile(exe_path) as buffer:
+        data = buffer.data
+        current_string = b''
+        for i in range(len(data)):
+            byte = data[i]
+            if 32 <= byte < 127:
+                current_string += bytes([byte])
+            else:
+                if len(current_string) >= 4:
+                    count += 1
+                current_string = b''
+    return count
+
+
+BENCHMARKS = {
+    'pe_structure': bench_pe_structure,
+    'extract': bench_extract,
+    'advanced': bench_advanced,
+    'review': bench_review,
+    'mapping': bench_mapping,
+    'sharded_sql': bench_sharded_sql,
+    'sharded_advanced_sql': bench_sharded_advanced_sql,
+    'sharded_sqlite_functions': bench_sharded_sqlite_functions,
+    'strings': bench_strings,
+    'strings_bytewise': bench_strings_bytewise,
+}
+
+# 느린 비교 기준은 --only로 지정했을 때만 실행
+BASELINES = {'strings_bytewise'}
+
+# --jobs 값마다 실행하는 병렬 벤치마크
+PARALLEL = {'sharded_sql', 'sharded_advanced_sql', 'sharded_sqlite_functions'}
+
+# 앞 단계 결과를 입력으로 쓰는 벤치마크
+DEPENDS_ON = {
+    'review': 'extract',
+    'mapping': 'review',
+}
+
+
+def peak_rss_mb(children=False):
+    """현재 프로세스 (children이면 종료된 자식 프로세스 중 최대)의 최대 RSS (MB). 측정할 수 없으면 None"""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+        # Linux는 KB, macOS는 바이트 단위
+        return peak / MB if sys.platform == 'darwin' else peak / 1024
+    if children:
+        return None
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / MB
+    except (ImportError, AttributeError):
+        return None
+
+
+def _measure(conn, name, exe_path, work_dir, trace_memory, jobs):
+    """자식 프로세스에서 벤치마크 하나를 실행하고 측정값을 파이프로 보냄"""
+    result = {'baseline_rss_mb': peak_rss_mb()}
+    args = (Path(exe_path), Path(work_dir)) + ((jobs,) if name in PARALLEL else ())
+    try:
+        with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+            if trace_memory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            items = BENCHMARKS[name](*args)
+            result['seconds'] = time.perf_counter() - start
+            if trace_memory:
+                result['python_peak_mb'] = tracemalloc.get_traced_memory()[1] / MB
+                tracemalloc.stop()
+        result.update(status='ok', items=items, peak_rss_mb=peak_rss_mb())
+        if name in PARALLEL and jobs > 1:
+            result['worker_peak_rss_mb'] = peak_rss_mb(children=True)
+    except Exception as e:
+        result.update(status='error', error=f"{type(e).__name__}: {e}")
+    conn.send(result)
+    conn.close()
+
+
+def run_isolated(name, exe_path, work_dir, timeout, trace_memory, jobs=1):
+    """새 프로세스에서 측정. 제한 시간을 넘기면 프로세스를 종료하고 'timeout' 상태 반환"""
+    context = multiprocessing.get_context('spawn')
+    parent_conn, child_conn = context.Pipe(duplex=False)
+    process = context.Process(target=_measure,
+                              args=(child_conn, name, str(exe_path), str(work_dir), trace_memory, jobs))
+    start = time.perf_counter()
+    process.start()
+    child_conn.close()
+
+    try:
+        if parent_conn.poll(timeout):
+            result = parent_conn.recv()
+        else:
+            result = {'status': 'timeout', 'seconds': time.perf_counter() - start}
+    except EOFError:
+        result = {'status': 'error', 'error': f"프로세스 비정상 종료 (코드 {process.exitcode})"}
+    finally:
+        if process.is_alive():
+            process.terminate()
+        process.join()
+        parent_conn.close()
+    return result
+
+
+def write_results(output_file, results):
+    payload = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'results': results,
+    }
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+
+
+def format_result(result):
+    if result['status'] != 'ok':
+        return f"{result['status']}  {result.get('error', '')}"
+    line = f"{result['seconds']:9.2f}s  peak RSS {result['peak_rss_mb'] or 0:8.1f}MB"
+    if result.get('worker_peak_rss_mb') is not None:
+        line += f"  작업 프로세스 {result['worker_peak_rss_mb']:8.1f}MB"
+    if result.get('python_peak_mb') is not None:
+        line += f"  Python 힙 {result['python_peak_mb']:8.1f}MB"
+    if result.get('speedup') is not None:
+        line += f"  {result['speedup']:.2f}배"
+    return line + f"  (결과 {result['items']:,}건)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="분석 스크립트 벤치마크 (합성 PE 파일)")
+    parser.add_argument('--sizes', type=int, action='append', help="합성 파일 크기 MB (여러 번 지정 가능, 1~500)")
+    parser.add_argument('--only', choices=list(BENCHMARKS), action='append', help="특정 벤치마크만 실행")
+    parser.add_argument('--corpus-dir', help="합성 파일을 만들고 재사용할 폴더. 생략 시 임시 폴더")
+    parser.add_argument('--seed', type=int, default=1, help="합성 파일 난수 시드")
+    parser.add_argument('--jobs', type=int, action='append',
+                        help="sharded_* 벤치마크의 프로세스 수 (여러 번 지정 가능, 0: CPU 수)")
+    parser.add_argument('--timeout', type=int, default=DEFAULT_TIMEOUT, help="측정 하나의 제한 시간 (초)")
+    parser.add_argument('--tracemalloc', action='store_true',
+                        help="tracemalloc으로 Python 힙 최대치도 기록 (소요 시간이 늘어남)")
+    parser.add_argument('--output', default='benchmark_analysis_results.json', help="결과 JSON 파일")
+    args = parser.parse_args()
+
+    sizes = args.sizes or DEFAULT_SIZES
+    job_counts = sorted({jobs or os.cpu_count() or 1 for jobs in args.jobs}) if args.jobs else \
+        sorted({1, 2, 4, os.cpu_count() or 1})
+    names = [name for name in BENCHMARKS if name in args.only] if args.only else \
+        [name for name in BENCHMARKS if name not in BASELINES]
+
+    tmp_dir = None
+    if args.corpus_dir:
+        corpus_dir = Path(args.corpus_dir)
+        corpus_dir.mkdir(parents=True, exist_ok=True)
+    else:
+        tmp_dir = tempfile.TemporaryDirectory()
+        corpus_dir = Path(tmp_dir.name)
+
+    results = []
+    try:
+        for size_mb in sizes:
+            exe_path = corpus_dir / f'synthetic_{size_mb}mb_seed{args.seed}.exe'
+            if exe_path.exists() and exe_path.stat().st_size == size_mb * MB:
+                print(f"\n[{size_mb}MB] 기존 합성 파일 사용: {exe_path}")
+            else:
+                start = time.perf_counter()
+                summary = generate_pe(exe_path, size_mb, args.seed)
+                print(f"\n[{size_mb}MB] 합성 파일 생성 {time.perf_counter() - start:.1f}s "
+                      f"(SQL 상수 {summary['utf16_sql'] + summary['cp949_sql'] + summary['ascii_sql']:,}개, "
+                      f"E8 호출 {summary['calls']:,}개)")
+
+            work_dir = corpus_dir / f'work_{size_mb}mb'
+            work_dir.mkdir(exist_ok=True)
+            status = {}
+
+            for name in names:
+                dependency = DEPENDS_ON.get(name)
+                # 병렬 벤치마크는 프로세스 수마다, 나머지는 한 번 실행하고 가장 적은 프로세스 수 기준 속도 향상 계산
+                baseline = None
+                for jobs in (job_counts if name in PARALLEL else [None]):
+                    if dependency and status.get(dependency, 'ok' if (work_dir / 'findings.db').exists() else None) != 'ok':
+                        result = {'status': 'skipped', 'error': f"{dependency} 단계 결과 없음"}
+                    else:
+                        result = run_isolated(name, exe_path, work_dir, args.timeout, args.tracemalloc, jobs or 1)
+                    status[name] = result['status']
+
+                    result = {'size_mb': size_mb, 'file_bytes': exe_path.stat().st_size, 'benchmark': name, **result}
+                    label = name
+                    if jobs is not None:
+                        result['jobs'] = jobs
+                        label = f"{name} x{jobs}"
+                        if result['status'] == 'ok':
+                            baseline = baseline or result['seconds']
+                            result['speedup'] = baseline / result['seconds']
+                    results.append(result)
+                    print(f"  {label:<28} {format_result(result)}")
+                    # 큰 파일은 오래 걸리므로 측정마다 결과 파일 갱신
+                    write_results(args.output, results)
+    finally:
+        if tmp_dir:
+            tmp_dir.cleanup()
+
+    print(f"\n결과가 {args.output}에 저장되었습니다.")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""
+바이너리 분석 스크립트 공용 스캔 도구
+실행 파일/메모리 덤프를 통째로 읽어 복사하지 않고 읽기 전용 mmap으로 열어,
+바이트 정규식은 매핑 위에서 바로 돌리고 짧은 후보 구간만 memoryview로 잘라 디코딩합니다.
+여러 키워드 위치 찾기(KeywordScanner), 주변 구간 병합(merge_windows),
+인쇄 가능한 ASCII 문자열 추출(printable_runs), UTF-16LE 와이드 문자열 추출(wide_runs),
+CP949 문자열 추출(cp949_runs)도 제공합니다.
+"""
+
+import heapq
+import mmap
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+
+# UTF-16LE 코드 단위 분류 테이블 (하위 바이트 / 상위 바이트의 비트 플래그, 둘의 AND가 0이 아니면 유효)
+#   1: ASCII 인쇄 가능 문자와 탭/줄바꿈 (상위 바이트 0x00)
+#   2: 한글 호환 자모 U+3131~U+318E (상위 바이트 0x31)
+#   4: 한글 음절 영역 U+AC00~U+D7FF (하위 바이트 무관)
+_WIDE_LOW = bytes((1 if 0x20 <= b < 0x7f or b in (9, 10, 13) else 0) | (2 if 0x31 <= b <= 0x8e else 0) | 4
+                  for b in range(256))
+_WIDE_HIGH = bytes((1 if b == 0x00 else 0) | (2 if b == 0x31 else 0) | (4 if 0xac <= b <= 0xd7 else 0)
+                   for b in range(256))
+
+# 와이드 문자열 검사 청크 크기 (바이트, 짝수)
+WIDE_CHUNK = 4 * 1024 * 1024
+
+# CP949 바이트 분류 테이블
+#   a: ASCII 인쇄 가능 문자와 탭/줄바꿈 (1바이트 문자)
+#   h: 0xA1~0xFE (KS X 1001 완성형 2바이트 문자의 선행/후행 바이트)
+#   x: 그 밖의 바이트 (문자열에 올 수 없음)
+_CP949_CLASS = bytes(ord('a') if 0x20 <= b < 0x7f or b in (9, 10, 13) else ord('h') if 0xa1 <= b <= 0xfe else ord('x')
+                     for b in range(256))
+
+# CP949 문자열 검사 청크 크기 (바이트)
+CP949_CHUNK = 4 * 1024 * 1024
+
+
+class MappedFile:
+    """읽기 전용 mmap 파일 버퍼
+
+    data는 bytes처럼 len/인덱싱/슬라이싱/find/정규식 검색을 지원하는 mmap 객체이고
+    (빈 파일은 mmap을 만들 수 없어 b''), view는 복사 없이 구간을 자르는 memoryview입니다.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        try:
+            if os.fstat(self._file.fileno()).st_size:
+                self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self.data = b''
+        except Exception:
+            self._file.close()
+            raise
+        self.view = memoryview(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def span(self, start, end):
+        """[start, end) 구간 memoryview (파일 범위로 잘림, 복사 없음)"""
+        return self.view[max(0, start):min(len(self.data), end)]
+
+    def decode(self, start, end, encoding='utf-8'):
+        """구간만 디코딩 (잘못된 바이트는 무시)"""
+        return str(self.span(start, end), encoding, 'ignore')
+
+    def close(self):
+        if self.view is None:
+            return
+        self.view.release()
+        self.view = None
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class KeywordScanner:
+    """여러 바이트 키워드의 위치를 오프셋 순서의 히트 흐름 하나로 찾는 스캐너
+
+    키워드마다 C 수준 find()로 버퍼를 훑는 지연 생성기를 만들고 heapq.merge로 합칩니다.
+    Python 코드는 바이트가 아니라 히트 수만큼만 돌고, 겹치는 일치(한 키워드가 다른 키워드의
+    접두사인 경우 포함)도 키워드마다 find()를 반복한 결과와 똑같이 보고합니다.
+    (대안(|)으로 묶은 바이트 정규식 한 번 훑기는 바이트마다 후보 문자를 검사해
+    키워드 수십 개 이하에서는 find() 여러 번보다 느림)
+    """
+
+    def __init__(self, keywords):
+        self.keywords = list(dict.fromkeys(keywords))
+
+    def scan(self, data, start=0, end=None):
+        """[start, end) 구간의 (오프셋, 키워드) 히트를 오프셋 순서로 반환 (같은 오프셋은 키워드 순서)"""
+        end = len(data) if end is None else end
+        streams = [self._find_all(data, index, keyword, start, end)
+                   for index, keyword in enumerate(self.keywords)]
+        for offset, _, keyword in heapq.merge(*streams):
+            yield offset, keyword
+
+    @staticmethod
+    def _find_all(data, index, keyword, start, end):
+        find = data.find
+        idx = find(keyword, start, end)
+        while idx != -1:
+            yield idx, index, keyword
+            idx = find(keyword, idx + 1, end)
+
+
+def merge_windows(hits, before, after, size):
+    """히트마다 [오프셋 - before, 오프셋 + after) 구간을 만들고 겹치거나 맞닿은 구간을 합침
+
+    hits는 오프셋 순서여야 하며 (시작, 끝, 구간에 속한 히트 목록) 목록을 반환합니다.
+    합친 구간을 한 번만 잘라 디코딩하면 같은 바이트를 히트마다 반복 변환하지 않습니다.
+    """
+    regions = []
+
+    for offset, keyword in hits:
+        start = max(0, offset - before)
+        end = min(size, offset + after)
+        if regions and start <= regions[-1][1]:
+            region = regions[-1]
+            region[1] = max(region[1], end)
+            region[2].append((offset, keyword))
+        else:
+            regions.append([start, end, [(offset, keyword)]])
+
+    return [tuple(region) for region in regions]
+
+
+@lru_cache(maxsize=None)
+def _printable_pattern(min_length):
+    return re.compile(rb'[\x20-\x7e]{%d,}' % min_length)
+
+
+def printable_runs(data, min_length=4, start=0, end=None):
+    """[start, end) 구간에서 인쇄 가능한 ASCII(0x20~0x7E)가 min_length 이상 이어진 구간을
+    (오프셋, bytes) 순서로 반환
+
+    컴파일된 바이트 정규식 하나의 finditer로 찾으므로 바이트마다 Python 코드가 돌지 않습니다.
+    구간 끝에서 끊긴 문자열도 포함합니다.
+    """
+    end = len(data) if end is None else end
+    for match in _printable_pattern(min_length).finditer(data, start, end):
+        yield match.start(), match.group()
+
+
+@lru_cache(maxsize=None)
+def _unit_run_pattern(min_length):
+    return re.compile(rb'[^\x00]{%d,}' % min_length)
+
+
+def wide_runs(data, min_length=4, start=0, end=None, parities=(0, 1)):
+    """[start, end) 구간에서 유효한 UTF-16LE 문자(ASCII 인쇄 가능 문자, 한글 음절, 한글 호환 자모)가
+    min_length개 이상 이어진 구간을 (바이트 오프셋, 문자열)로 오프셋 순서대로 반환
+
+    짝수/홀수 바이트 정렬을 각각 검사하므로 BOM이나 앞쪽 바이트 수와 관계없이 찾습니다.
+    파일 전체를 디코딩하지 않고 청크마다 하위/상위 바이트를 나눠 bytes.translate로 분류한 뒤,
+    코드 단위별 유효 여부를 한 바이트로 모은 마스크에서 연속 구간을 찾고 그 구간만 디코딩합니다.
+    """
+    end = len(data) if end is None else end
+    streams = [_wide_runs_aligned(data, min_length, start + (parity - start) % 2, end) for parity in parities]
+    return heapq.merge(*streams)
+
+
+def _wide_runs_aligned(data, min_length, pos, end):
+    """pos부터 2바이트 단위로 정렬된 와이드 문자열 구간"""
+    pattern = _unit_run_pattern(min_length)
+
+    while end - pos >= 2:
+        chunk_end = min(end, pos + WIDE_CHUNK)
+        chunk_end -= (chunk_end - pos) % 2
+        chunk = bytes(data[pos:chunk_end])
+        units = len(chunk) // 2
+
+        # 하위 바이트 플래그 AND 상위 바이트 플래그 (바이트끼리만 겹치므로 정수 AND 한 번으로 계산)
+        flags = (int.from_bytes(chunk[0::2].translate(_WIDE_LOW), 'little')
+                 & int.from_bytes(chunk[1::2].translate(_WIDE_HIGH), 'little'))
+        mask = flags.to_bytes(units, 'little')
+
+        # 청크 끝에 걸친 유효 문자들은 다음 청크에서 그 시작부터 다시 검사
+        limit = units
+        if chunk_end < end:
+            tail_start = mask.rfind(b'\x00') + 1
+            if tail_start > 0:
+                limit = tail_start
+
+        for match in pattern.finditer(mask, 0, limit):
+            yield pos + 2 * match.start(), chunk[2 * match.start():2 * match.end()].decode('utf-16-le')
+        pos += 2 * limit
+
+
+def merge_spans(spans):
+    """(시작, 끝) 구간들을 정렬해 겹치거나 맞닿은 것끼리 합친 목록을 반환"""
+    merged = []
+
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+
+    return [tuple(span) for span in merged]
+
+
+@lru_cache(maxsize=None)
+def _cp949_run_pattern(min_length):
+    return re.compile(rb'(?:a|hh){%d,}' % min_length)
+
+
+def cp949_runs(data, min_length=4, start=0, end=None):
+    """[start, end) 구간에서 유효한 CP949 문자(ASCII 인쇄 가능 문자, 완성형 2바이트 문자)가
+    min_length개 이상 이어진 구간을 (바이트 오프셋, 문자열) 순서로 반환
+
+    구간 전체를 cp949로 디코딩하지 않고 bytes.translate로 바이트를 분류한 뒤,
+    1바이트 문자 또는 선행/후행 바이트 쌍 단위로 이어진 구간을 정규식으로 찾아 그 구간만 디코딩합니다.
+    2바이트 문자의 짝은 구간 시작부터 앞에서부터 맞추므로 디코더와 같은 경계로 나뉩니다.
+    후행 바이트가 ASCII 영문자인 확장 완성형(UHC) 문자는 ASCII와 구별할 수 없어 인식하지 않습니다.
+    """
+    end = len(data) if end is None else end
+    pattern = _cp949_run_pattern(min_length)
+    pos = start
+
+    while pos < end:
+        chunk_end = min(end, pos + CP949_CHUNK)
+        chunk = bytes(data[pos:chunk_end])
+        classes = chunk.translate(_CP949_CLASS)
+
+        # 청크 끝에 걸친 문자열은 다음 청크에서 그 앞의 분류 불가 바이트 다음부터 다시 검사
+        limit = len(chunk)
+        if chunk_end < end:
+            tail_start = classes.rfind(b'x') + 1
+            if tail_start > 0:
+                limit = tail_start
+
+        for match in pattern.finditer(classes, 0, limit):
+            yield pos + match.start(), decode_cp949(chunk[match.start():match.end()])
+        pos += limit
+
+
+def decode_cp949(raw):
+    """cp949_runs 구간 디코딩. KS X 1001에 없는 바이트 쌍은 짝을 유지한 채 U+FFFD 한 글자로 바꿈"""
+    parts = []
+    pos = 0
+
+    while True:
+        try:
+            parts.append(raw[pos:].decode('cp949'))
+            return ''.join(parts)
+        except UnicodeDecodeError as e:
+            parts.append(raw[pos:pos + e.start].decode('cp949'))
+            parts.append('\ufffd')
+            pos += e.start + 2
+
+
+def cp949_length(text):
+    """decode_cp949로 디코딩한 문자열의 원래 바이트 수 (ASCII 1바이트, 그 밖의 문자 2바이트)"""
+    return 2 * len(text) - len(text.encode('ascii', 'ignore'))
@@ -9,6 +9,8 @@ import ctypes
 from ctypes import wintypes
 import psutil
 
+from binary_scan import cp949_runs, merge_spans, wide_runs
+
 # Windows API 상수
 PROCESS_QUERY_INFORMATION = 0x0400
 PROCESS_VM_READ = 0x0010
@@ -16,6 +18,21 @@ MEM_COMMIT = 0x1000
 PAGE_READONLY = 0x02
 PAGE_READWRITE = 0x04
 
+# SQL 패턴 (ASCII 호환 인코딩은 바이트 패턴, UTF-16/CP949 문자열은 디코딩한 문자열 패턴으로 검색)
+SQL_PATTERNS = [
+    r'(?i)SELECT\s+.*?(?:FROM|WHERE|ORDER|GROUP|LIMIT|UNION|;)',
+    r'(?i)INSERT\s+INTO\s+.*?(?:VALUES|SELECT|;)',
+    r'(?i)UPDATE\s+.*?SET\s+.*?(?:WHERE|;)',
+    r'(?i)DELETE\s+FROM\s+.*?(?:WHERE|;)',
+    r'(?i)CREATE\s+TABLE\s+.*?;',
+    r'(?i)ALTER\s+TABLE\s+.*?;',
+]
+BYTE_PATTERNS = [re.compile(p.encode('ascii'), re.DOTALL) for p in SQL_PATTERNS]
+TEXT_PATTERNS = [re.compile(p, re.DOTALL) for p in SQL_PATTERNS]
+
+# UTF-16 / CP949 문자열 최소 길이 (문자)
+MIN_RUN_LENGTH = 4
+
 class MEMORY_BASIC_INFORMATION(ctypes.Structure):
     _fields_ = [
         ("BaseAddress", ctypes.c_void_p),
@@ -93,34 +110,39 @@ def read_process_memory(pid):
     return sql_queries
 
 def find_sql_in_memory(data):
-    """메모리 데이터에서 SQL 쿼리를 찾습니다."""
+    """메모리 데이터에서 SQL 쿼리를 찾습니다.
+    
+    영역 전체를 인코딩마다 디코딩하지 않고, UTF-8/Latin-1은 바이트 패턴으로 찾은 구간만,
+    UTF-16은 와이드 문자열 구간만, CP949는 그 구간 안의 한글이 섞인 CP949 문자열만 디코딩합니다.
+    """
     queries = []
+    seen = set()
     
-    # 여러 인코딩으로 시도
-    encodings = ['utf-8', 'utf-16', 'cp949', 'latin-1']
+    def add(query):
+        if len(query) > 10 and query not in seen:
+            seen.add(query)
+            queries.append(query)
     
-    for encoding in encodings:
-        try:
-            text = data.decode(encoding, errors='ignore')
-            
-            # SQL 패턴
-            patterns = [
-                r'(?i)SELECT\s+.*?(?:FROM|WHERE|ORDER|GROUP|LIMIT|UNION|;)',
-                r'(?i)INSERT\s+INTO\s+.*?(?:VALUES|SELECT|;)',
-                r'(?i)UPDATE\s+.*?SET\s+.*?(?:WHERE|;)',
-                r'(?i)DELETE\s+FROM\s+.*?(?:WHERE|;)',
-                r'(?i)CREATE\s+TABLE\s+.*?;',
-                r'(?i)ALTER\s+TABLE\s+.*?;',
-            ]
-            
-            for pattern in patterns:
-                matches = re.finditer(pattern, text, re.DOTALL)
-                for match in matches:
-                    query = match.group(0).strip()
-                    if len(query) > 10 and query not in queries:
-                        queries.append(query)
-        except:
-            continue
+    spans = [match.span() for pattern in BYTE_PATTERNS for match in pattern.finditer(data)]
+    
+    for start, end in spans:
+        add(data[start:end].decode('utf-8', errors='ignore').strip())
+    
+    for _, run in wide_runs(data, MIN_RUN_LENGTH):
+        for pattern in TEXT_PATTERNS:
+            for match in pattern.finditer(run):
+                add(match.group(0).strip())
+    
+    for span_start, span_end in merge_spans(spans):
+        for _, run in cp949_runs(data, MIN_RUN_LENGTH, span_start, span_end):
+            if run.isascii():
+                continue
+            for pattern in TEXT_PATTERNS:
+                for match in pattern.finditer(run):
+                    add(match.group(0).strip())
+    
+    for start, end in spans:
+        add(data[start:end].decode('latin-1').strip())
     
     # 바이너리에서 직접 검색
     sql_keywords = [b'SELECT', b'INSERT', b'UPDATE', b'DELETE', b'CREATE TABLE']
@@ -141,8 +163,7 @@ def find_sql_in_memory(data):
                 match = re.search(r'(?i)(SELECT|INSERT|UPDATE|DELETE|CREATE).*?[;\x00]', text)
                 if match:
                     query = match.group(0).rstrip('\x00').strip()
-                    if len(query) > 10 and query not in queries:
-                        queries.append(query)
+                    add(query)
             except:
                 pass
             
@@ -5,145 +5,234 @@ DeskPro.exe에서 SQL 쿼리 문자열 추출 스크립트
 
 import re
 import sys
+from bisect import bisect_right
 from pathlib import Path
 
+from binary_scan import KeywordScanner, MappedFile, cp949_length, cp949_runs, merge_spans, merge_windows, wide_runs
+from findings_store import FindingsStore
+
+# SQL 키워드 패턴 (ASCII 기준)
+SQL_PATTERNS = [
+    r'(?i)(SELECT\s+.*?(?:FROM|WHERE|ORDER|GROUP|LIMIT|UNION))',
+    r'(?i)(INSERT\s+INTO\s+.*?(?:VALUES|SELECT))',
+    r'(?i)(UPDATE\s+.*?SET\s+.*?(?:WHERE|$))',
+    r'(?i)(DELETE\s+FROM\s+.*?(?:WHERE|$))',
+    r'(?i)(CREATE\s+TABLE\s+.*?(?:\(|$))',
+    r'(?i)(ALTER\s+TABLE\s+.*?)',
+    r'(?i)(DROP\s+TABLE\s+.*?)',
+    r'(?i)(CREATE\s+INDEX\s+.*?)',
+    r'(?i)(PRAGMA\s+.*?)',
+]
+
+# UTF-8과 CP949는 ASCII 호환이므로 같은 바이트 패턴 하나로 찾습니다.
+BYTE_PATTERNS = [re.compile(p.encode('ascii'), re.DOTALL | re.MULTILINE) for p in SQL_PATTERNS]
+# UTF-16LE와 CP949 2바이트 문자가 섞인 구간은 디코딩한 문자열에서 찾습니다.
+TEXT_PATTERNS = [re.compile(p, re.DOTALL | re.MULTILINE) for p in SQL_PATTERNS]
+
+# 와이드 문자열 최소 길이(문자)와, 한 문자열로 이어 볼 구간 사이 최대 간격(바이트)
+# (여러 Delphi 문자열 상수로 나뉜 쿼리: 상수 헤더 12바이트 + 널 종료 + 4바이트 정렬)
+WIDE_MIN_LENGTH = 4
+WIDE_JOIN_GAP = 16
+
+# CP949 문자열 최소 길이 (문자)
+CP949_MIN_LENGTH = 4
+
 def extract_sql_strings(file_path):
     """
     실행 파일에서 SQL 쿼리 패턴을 찾아 추출합니다.
+    (쿼리, 인코딩, 바이트 오프셋) 목록을 반환하며, 오프셋을 알 수 없는 경우는 None입니다.
+    
+    파일은 mmap으로 열어 바이트 정규식으로 훑고, 찾은 구간만 디코딩합니다.
     """
     print(f"파일 읽는 중: {file_path}")
     
     try:
-        with open(file_path, 'rb') as f:
-            content = f.read()
+        buffer = MappedFile(file_path)
     except Exception as e:
         print(f"파일 읽기 오류: {e}")
         return []
     
-    # 인코딩 시도 (UTF-8, UTF-16, CP949)
+    with buffer:
+        sql_queries = find_sql_in_buffer(buffer.data)
+    
+    return unique_queries(sql_queries)
+
+def find_sql_in_buffer(data):
+    """바이트 버퍼 (bytes 또는 mmap)에서 인코딩별로 찾은 (쿼리, 인코딩, 오프셋) 목록 (중복 포함)"""
+    # 인코딩별 검색 (UTF-8, UTF-16, CP949)
     sql_queries = []
     
-    # UTF-8로 디코딩 시도
-    try:
-        text = content.decode('utf-8', errors='ignore')
-        sql_queries.extend(find_sql_patterns(text, 'UTF-8'))
-    except:
-        pass
+    # UTF-8: ASCII 호환 바이트 패턴으로 찾은 후보 구간만 디코딩
+    spans = find_sql_patterns(data, BYTE_PATTERNS)
+    sql_queries.extend(decode_spans(data, spans, 'utf-8', 'UTF-8'))
     
-    # UTF-16으로 디코딩 시도
-    try:
-        text = content.decode('utf-16', errors='ignore')
-        sql_queries.extend(find_sql_patterns(text, 'UTF-16'))
-    except:
-        pass
+    # UTF-16LE: 짝수/홀수 정렬의 와이드 문자열 구간만 디코딩해 검색
+    sql_queries.extend(find_sql_in_wide_strings(data))
     
-    # CP949로 디코딩 시도 (한국어)
-    try:
-        text = content.decode('cp949', errors='ignore')
-        sql_queries.extend(find_sql_patterns(text, 'CP949'))
-    except:
-        pass
+    # CP949: 같은 후보 구간 안의 한글이 섞인 CP949 문자열만 디코딩해 검색
+    sql_queries.extend(find_sql_in_cp949_strings(data, spans))
     
     # 바이너리에서 직접 패턴 검색 (인코딩 무관)
-    sql_queries.extend(find_sql_in_binary(content))
+    sql_queries.extend(find_sql_in_binary(data))
+    
+    return sql_queries
+
+def unique_queries(sql_queries):
+    """중복 제거 (같은 쿼리/인코딩은 처음 발견한 오프셋만 유지)"""
+    unique = {}
+    for query, encoding, offset in sql_queries:
+        unique.setdefault((query, encoding), offset)
+    
+    return [(query, encoding, offset) for (query, encoding), offset in unique.items()]
+
+def find_sql_patterns(data, patterns=BYTE_PATTERNS):
+    """버퍼에서 SQL 패턴과 일치하는 (시작, 끝) 바이트 구간을 패턴 순서대로 찾습니다."""
+    spans = []
     
-    # 중복 제거
-    unique_queries = list(set(sql_queries))
+    for pattern in patterns:
+        for match in pattern.finditer(data):
+            spans.append(match.span(1))
     
-    return unique_queries
+    return spans
 
-def find_sql_patterns(text, encoding):
-    """텍스트에서 SQL 패턴을 찾습니다."""
+def find_sql_in_wide_strings(data):
+    """UTF-16LE 와이드 문자열에서 SQL 패턴을 찾아 (쿼리, 'UTF-16', 바이트 오프셋) 목록을 반환합니다.
+    
+    같은 정렬에서 간격이 WIDE_JOIN_GAP 이하인 구간들은 이어 붙여 한 문자열로 검사하며,
+    오프셋은 일치가 시작한 구간의 위치로 되돌려 계산합니다.
+    """
     queries = []
     
-    # SQL 키워드 패턴
-    sql_patterns = [
-        r'(?i)(SELECT\s+.*?(?:FROM|WHERE|ORDER|GROUP|LIMIT|UNION))',
-        r'(?i)(INSERT\s+INTO\s+.*?(?:VALUES|SELECT))',
-        r'(?i)(UPDATE\s+.*?SET\s+.*?(?:WHERE|$))',
-        r'(?i)(DELETE\s+FROM\s+.*?(?:WHERE|$))',
-        r'(?i)(CREATE\s+TABLE\s+.*?(?:\(|$))',
-        r'(?i)(ALTER\s+TABLE\s+.*?)',
-        r'(?i)(DROP\s+TABLE\s+.*?)',
-        r'(?i)(CREATE\s+INDEX\s+.*?)',
-        r'(?i)(PRAGMA\s+.*?)',
-    ]
-    
-    for pattern in sql_patterns:
-        matches = re.finditer(pattern, text, re.DOTALL | re.MULTILINE)
-        for match in matches:
-            query = match.group(1).strip()
-            # 최소 길이 필터 (너무 짧은 것은 제외)
-            if len(query) > 10:
-                queries.append((query, encoding))
+    for parity in (0, 1):
+        for segments in group_wide_runs(wide_runs(data, WIDE_MIN_LENGTH, parities=(parity,))):
+            # 구간을 이어 붙이고 (경계에 공백이 없으면 하나 넣음) 각 구간이 시작하는 문자 위치를 기록
+            parts = []
+            starts = []
+            length = 0
+            for offset, run in segments:
+                if parts and not (parts[-1][-1].isspace() or run[0].isspace()):
+                    parts.append(' ')
+                    length += 1
+                starts.append(length)
+                parts.append(run)
+                length += len(run)
+            text = ''.join(parts)
+            
+            for pattern in TEXT_PATTERNS:
+                for match in pattern.finditer(text):
+                    query = match.group(1).strip()
+                    # 최소 길이 필터 (너무 짧은 것은 제외)
+                    if len(query) > 10:
+                        index = bisect_right(starts, match.start(1)) - 1
+                        offset = segments[index][0] + 2 * (match.start(1) - starts[index])
+                        queries.append((query, 'UTF-16', offset))
     
     return queries
 
-def find_sql_in_binary(content):
-    """바이너리에서 SQL 키워드를 포함한 문자열을 찾습니다."""
+def group_wide_runs(runs):
+    """오프셋 순서의 (오프셋, 문자열) 구간을 간격이 WIDE_JOIN_GAP 이하인 것끼리 묶습니다."""
+    group = []
+    group_end = None
+    
+    for offset, run in runs:
+        if group and offset - group_end > WIDE_JOIN_GAP:
+            yield group
+            group = []
+        group.append((offset, run))
+        group_end = offset + 2 * len(run)
+    
+    if group:
+        yield group
+
+def find_sql_in_cp949_strings(data, spans):
+    """후보 구간 안의 CP949 문자열에서 SQL 패턴을 찾아 (쿼리, 'CP949', 바이트 오프셋) 목록을 반환합니다.
+    
+    ASCII만으로 된 문자열은 UTF-8 결과와 같으므로 건너뛰고, 2바이트 문자가 있는 문자열만 검사합니다.
+    잘못된 바이트에서 문자열이 끊기므로 바이너리 잡음이 한글로 잘못 디코딩되지 않습니다.
+    """
     queries = []
     
-    # SQL 키워드 (바이트로)
-    keywords = [
-        b'SELECT',
-        b'INSERT',
-        b'UPDATE',
-        b'DELETE',
-        b'CREATE TABLE',
-        b'ALTER TABLE',
-        b'DROP TABLE',
-        b'FROM',
-        b'WHERE',
-        b'PRAGMA',
-    ]
-    
-    for keyword in keywords:
-        idx = 0
-        while True:
-            idx = content.find(keyword, idx)
-            if idx == -1:
-                break
-            
-            # 키워드 주변 문자열 추출 (최대 500바이트)
-            start = max(0, idx - 50)
-            end = min(len(content), idx + 500)
-            snippet = content[start:end]
+    for span_start, span_end in merge_spans(spans):
+        for offset, run in cp949_runs(data, CP949_MIN_LENGTH, span_start, span_end):
+            if run.isascii():
+                continue
             
-            # 인쇄 가능한 문자만 추출
-            try:
-                text = ''.join(chr(b) if 32 <= b < 127 or b in [9, 10, 13] else ' ' for b in snippet)
-                # SQL 패턴 확인
-                if re.search(r'(?i)(SELECT|INSERT|UPDATE|DELETE|CREATE|ALTER|DROP|PRAGMA)', text):
-                    # 문장 끝까지 추출
-                    match = re.search(r'(?i)(SELECT|INSERT|UPDATE|DELETE|CREATE|ALTER|DROP|PRAGMA).*?[;]', text)
-                    if match:
-                        queries.append((match.group(0).strip(), 'BINARY'))
-            except:
-                pass
-            
-            idx += 1
+            for pattern in TEXT_PATTERNS:
+                for match in pattern.finditer(run):
+                    query = match.group(1).strip()
+                    # 최소 길이 필터 (너무 짧은 것은 제외)
+                    if len(query) > 10:
+                        queries.append((query, 'CP949', offset + cp949_length(run[:match.start(1)])))
     
     return queries
 
-def save_results(queries, output_file='extracted_sql_queries.txt'):
-    """추출된 쿼리를 파일로 저장합니다."""
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("=" * 80 + "\n")
-        f.write("추출된 SQL 쿼리 목록\n")
-        f.write("=" * 80 + "\n\n")
-        
-        if not queries:
-            f.write("SQL 쿼리를 찾을 수 없습니다.\n")
-            return
+def decode_spans(data, spans, codec, encoding):
+    """후보 구간만 디코딩해 (쿼리, 인코딩, 오프셋) 목록으로 변환"""
+    queries = []
+    
+    for start, end in spans:
+        query = data[start:end].decode(codec, errors='ignore').strip()
+        # 최소 길이 필터 (너무 짧은 것은 제외)
+        if len(query) > 10:
+            queries.append((query, encoding, start))
+    
+    return queries
+
+# 바이너리 직접 검색 키워드와 주변 구간 크기 (키워드 앞 50바이트 ~ 뒤 500바이트)
+BINARY_KEYWORDS = KeywordScanner([
+    b'SELECT',
+    b'INSERT',
+    b'UPDATE',
+    b'DELETE',
+    b'CREATE TABLE',
+    b'ALTER TABLE',
+    b'DROP TABLE',
+    b'FROM',
+    b'WHERE',
+    b'PRAGMA',
+])
+WINDOW_BEFORE = 50
+WINDOW_AFTER = 500
+
+# 인쇄 가능한 문자(탭/줄바꿈 포함)는 그대로, 나머지 바이트는 공백으로 바꾸는 변환 테이블
+PRINTABLE_TABLE = bytes(b if 32 <= b < 127 or b in (9, 10, 13) else 32 for b in range(256))
+
+# 문장 시작 키워드부터 같은 줄의 첫 세미콜론까지 (대문자로 바꾼 텍스트에 적용)
+STATEMENT_RE = re.compile(r'(SELECT|INSERT|UPDATE|DELETE|CREATE|ALTER|DROP|PRAGMA)[^\n;]*;')
+
+def find_sql_in_binary(content):
+    """바이너리에서 SQL 키워드를 포함한 문자열을 찾습니다.
+    
+    키워드는 한 번에 훑어 찾고, 키워드 주변 구간이 겹치면 합쳐서 한 번만 문자열로 변환합니다.
+    """
+    queries = []
+    size = len(content)
+    
+    for region_start, region_end, hits in merge_windows(BINARY_KEYWORDS.scan(content),
+                                                        WINDOW_BEFORE, WINDOW_AFTER, size):
+        # 인쇄 가능한 문자만 추출
+        text = bytes(content[region_start:region_end]).translate(PRINTABLE_TABLE).decode('ascii')
+        # ASCII뿐이므로 대문자 사본에서 대소문자 구분 없이 찾고 원문에서 잘라냄
+        upper = text.upper()
         
-        for i, (query, encoding) in enumerate(queries, 1):
-            f.write(f"\n[쿼리 #{i}] (인코딩: {encoding})\n")
-            f.write("-" * 80 + "\n")
-            f.write(query + "\n")
-            f.write("-" * 80 + "\n")
+        for offset, keyword in hits:
+            # 키워드 주변 문자열 (최대 500바이트) 안에서 문장 끝까지 추출
+            start = max(0, offset - WINDOW_BEFORE) - region_start
+            end = min(size, offset + WINDOW_AFTER) - region_start
+            match = STATEMENT_RE.search(upper, start, end)
+            if match:
+                queries.append((text[match.start():match.end()].strip(), 'BINARY', region_start + match.start()))
     
-    print(f"\n결과가 {output_file}에 저장되었습니다.")
-    print(f"총 {len(queries)}개의 SQL 쿼리가 추출되었습니다.")
+    return queries
+
+def save_results(queries, source, output_file='extracted_sql_queries.txt', store_path='findings.db'):
+    """추출된 쿼리를 결과 저장소에 기록하고, 저장소에서 텍스트 보고서를 생성합니다."""
+    with FindingsStore(store_path) as store:
+        store.add_extracted(source, queries)
+        count = store.render_extracted(output_file, source)
+    
+    print(f"\n결과가 {store_path}에 저장되었고 {output_file}로 출력되었습니다.")
+    print(f"총 {count}개의 SQL 쿼리가 추출되었습니다.")
 
 if __name__ == '__main__':
     exe_path = Path('DeskPro.exe')
@@ -158,9 +247,9 @@ if __name__ == '__main__':
     if queries:
         print(f"\n추출된 쿼리 수: {len(queries)}")
         print("\n처음 5개 미리보기:")
-        for i, (query, encoding) in enumerate(queries[:5], 1):
+        for i, (query, encoding, offset) in enumerate(queries[:5], 1):
             print(f"\n[{i}] ({encoding})")
             print(query[:200] + ("..." if len(query) > 200 else ""))
     
-    save_results(queries)
+    save_results(queries, exe_path)
 
@@ -0,0 +1,274 @@
+"""
+분석 스크립트 공용 SQLite 결과 저장소
+extract_sql_strings.py, review_sql_queries.py, ui_sql_mapping.py가
+서로의 텍스트 보고서를 다시 파싱하지 않고 이 저장소로 결과를 주고받습니다.
+"""
+
+import json
+import re
+import sqlite3
+from pathlib import Path
+
+DEFAULT_STORE = 'findings.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS queries (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    offset INTEGER,
+    encoding TEXT NOT NULL,
+    text TEXT NOT NULL,
+    fingerprint TEXT,
+    label TEXT,
+    category TEXT,
+    cleaned TEXT,
+    occurrences INTEGER NOT NULL DEFAULT 1,
+    encodings TEXT
+);
+CREATE TABLE IF NOT EXISTS query_tables (
+    query_id INTEGER NOT NULL REFERENCES queries(id) ON DELETE CASCADE,
+    table_name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS query_fields (
+    query_id INTEGER NOT NULL REFERENCES queries(id) ON DELETE CASCADE,
+    field_name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_queries_source ON queries(source);
+CREATE INDEX IF NOT EXISTS idx_queries_category ON queries(category);
+CREATE INDEX IF NOT EXISTS idx_queries_label ON queries(label);
+CREATE INDEX IF NOT EXISTS idx_query_tables_table ON query_tables(table_name, query_id);
+CREATE INDEX IF NOT EXISTS idx_query_tables_query ON query_tables(query_id);
+CREATE INDEX IF NOT EXISTS idx_query_fields_field ON query_fields(field_name, query_id);
+CREATE INDEX IF NOT EXISTS idx_query_fields_query ON query_fields(query_id);
+"""
+
+
+def query_type(query):
+    """쿼리 타입 추출"""
+    query_upper = query.upper()
+    if 'SELECT' in query_upper:
+        return 'SELECT'
+    elif 'INSERT' in query_upper:
+        return 'INSERT'
+    elif 'UPDATE' in query_upper:
+        return 'UPDATE'
+    elif 'DELETE' in query_upper:
+        return 'DELETE'
+    elif 'CREATE TABLE' in query_upper:
+        return 'CREATE'
+    else:
+        return 'UNKNOWN'
+
+
+def extract_tables(query):
+    """테이블명 추출"""
+    tables = []
+
+    # FROM / UPDATE / INSERT INTO / CREATE TABLE 절
+    for pattern in (r'(?i)FROM\s+(\w+)', r'(?i)UPDATE\s+(\w+)',
+                    r'(?i)INSERT\s+INTO\s+(\w+)', r'(?i)CREATE\s+TABLE\s+(\w+)'):
+        match = re.search(pattern, query)
+        if match:
+            tables.append(match.group(1))
+
+    return list(set(tables))
+
+
+def extract_fields(query):
+    """필드명 추출"""
+    fields = []
+
+    # SET 절의 필드들
+    set_matches = re.finditer(r'(?i)SET\s+([^WHERE]+)', query)
+    for match in set_matches:
+        set_clause = match.group(1)
+        # 필드명 = 값 패턴
+        field_matches = re.finditer(r'(\w+)\s*=', set_clause)
+        for fm in field_matches:
+            field = fm.group(1).strip()
+            if field and field not in fields:
+                fields.append(field)
+
+    # INSERT INTO (필드1, 필드2, ...) 패턴
+    insert_fields_match = re.search(r'(?i)INSERT\s+INTO\s+\w+\s*\(([^)]+)\)', query)
+    if insert_fields_match:
+        fields_str = insert_fields_match.group(1)
+        field_list = [f.strip() for f in fields_str.split(',')]
+        fields.extend([f for f in field_list if f and f not in fields])
+
+    return fields
+
+
+class FindingsStore:
+    """추출/검토/매핑 결과 저장소"""
+
+    def __init__(self, path=DEFAULT_STORE):
+        self.path = Path(path)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---- 추출 단계 ----
+
+    def add_extracted(self, source, findings):
+        """추출 결과 (쿼리, 인코딩, 오프셋) 목록 저장. 같은 source의 기존 결과는 교체합니다."""
+        with self.conn:
+            self.conn.execute("DELETE FROM queries WHERE source = ?", (str(source),))
+            self.conn.executemany(
+                "INSERT INTO queries (source, offset, encoding, text) VALUES (?, ?, ?, ?)",
+                ((str(source), offset, encoding, text) for text, encoding, offset in findings)
+            )
+        return self.count(source)
+
+    def count(self, source=None):
+        if source is None:
+            return self.conn.execute("SELECT COUNT(*) FROM queries").fetchone()[0]
+        return self.conn.execute("SELECT COUNT(*) FROM queries WHERE source = ?", (str(source),)).fetchone()[0]
+
+    def iter_queries(self, source=None):
+        """추출된 쿼리를 id 순으로 하나씩 반환 (검토기 입력 레코드 형식)"""
+        sql = "SELECT id, source, offset, encoding, text FROM queries"
+        params = ()
+        if source is not None:
+            sql += " WHERE source = ?"
+            params = (str(source),)
+
+        for row in self.conn.execute(sql + " ORDER BY id", params):
+            yield {
+                'number': row['id'],
+                'encoding': row['encoding'],
+                'text': row['text'],
+                'offset': row['offset'],
+                'source': row['source'],
+            }
+
+    def render_extracted(self, output_file, source=None):
+        """extracted_sql_queries.txt 형식 텍스트 보고서 생성"""
+        count = 0
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write("=" * 80 + "\n")
+            f.write("추출된 SQL 쿼리 목록\n")
+            f.write("=" * 80 + "\n\n")
+
+            for query in self.iter_queries(source):
+                count += 1
+                f.write(f"\n[쿼리 #{query['number']}] (인코딩: {query['encoding']})\n")
+                f.write("-" * 80 + "\n")
+                f.write(query['text'] + "\n")
+                f.write("-" * 80 + "\n")
+
+            if not count:
+                f.write("SQL 쿼리를 찾을 수 없습니다.\n")
+        return count
+
+    # ---- 검토 단계 ----
+
+    def save_reviews(self, records):
+        """검토 결과 (분류, 종류, 정리된 텍스트, 중복 정보)와 테이블/필드 색인 저장
+
+        records는 iter_queries()로 읽어 검토한 레코드이며 'number'가 queries.id 입니다.
+        """
+        with self.conn:
+            for record in records:
+                query_id = record['number']
+                text = record.get('cleaned') or record['text']
+                self.conn.execute(
+                    "UPDATE queries SET label = ?, category = ?, cleaned = ?, fingerprint = ?,"
+                    " occurrences = ?, encodings = ? WHERE id = ?",
+                    (record.get('label'), record.get('category'), record.get('cleaned'),
+                     record.get('fingerprint'), record.get('occurrences', 1),
+                     json.dumps(record.get('encodings') or [record['encoding']]), query_id)
+                )
+                self.conn.execute("DELETE FROM query_tables WHERE query_id = ?", (query_id,))
+                self.conn.execute("DELETE FROM query_fields WHERE query_id = ?", (query_id,))
+                if record.get('label') != 'valid':
+                    continue
+                self.conn.executemany("INSERT INTO query_tables VALUES (?, ?)",
+                                      ((query_id, table) for table in extract_tables(text)))
+                self.conn.executemany("INSERT INTO query_fields VALUES (?, ?)",
+                                      ((query_id, field) for field in extract_fields(text)))
+
+    def iter_reviews(self, source=None):
+        """검토된 쿼리(중복 제외)를 id 순으로 하나씩 반환 (검토기 레코드 형식, 보고서 생성용)"""
+        sql = ("SELECT id, encoding, text, label, category, cleaned, fingerprint, occurrences, encodings"
+               " FROM queries WHERE label IN ('valid', 'broken', 'invalid')")
+        params = ()
+        if source is not None:
+            sql += " AND source = ?"
+            params = (str(source),)
+
+        for row in self.conn.execute(sql + " ORDER BY id", params):
+            record = {
+                'number': row['id'],
+                'encoding': row['encoding'],
+                'text': row['text'],
+                'label': row['label'],
+                'occurrences': row['occurrences'],
+                'encodings': json.loads(row['encodings']) if row['encodings'] else [row['encoding']],
+            }
+            for key in ('category', 'cleaned', 'fingerprint'):
+                if row[key] is not None:
+                    record[key] = row[key]
+            yield record
+
+    def label_count(self, label):
+        return self.conn.execute("SELECT COUNT(*) FROM queries WHERE label = ?", (label,)).fetchone()[0]
+
+    def mark_duplicates(self, pairs):
+        """(중복 쿼리 id, 대표 쿼리 id) 쌍을 받아 중복 쿼리에 대표 쿼리의 판정을 복사하고 label을 'duplicate'로 표시"""
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE queries SET label = 'duplicate',"
+                " category = (SELECT category FROM queries WHERE id = ?),"
+                " fingerprint = (SELECT fingerprint FROM queries WHERE id = ?) WHERE id = ?",
+                ((first, first, query_id) for query_id, first in pairs)
+            )
+
+    # ---- 매핑 단계 ----
+
+    def valid_queries(self):
+        """유효 판정 쿼리를 테이블/필드 목록과 함께 반환 (UISQLMapper 입력 형식)"""
+        tables = self._collect("SELECT query_id, table_name FROM query_tables")
+        fields = self._collect("SELECT query_id, field_name FROM query_fields")
+        queries = []
+
+        for row in self.conn.execute(
+                "SELECT id, category, text, cleaned FROM queries WHERE label = 'valid' ORDER BY category, id"):
+            text = row['cleaned'] or row['text']
+            queries.append({
+                'category': row['category'],
+                'number': str(row['id']),
+                'text': text,
+                'type': query_type(text),
+                'tables': tables.get(row['id'], []),
+                'fields': fields.get(row['id'], []),
+            })
+        return queries
+
+    def _collect(self, sql):
+        result = {}
+        for query_id, value in self.conn.execute(sql):
+            result.setdefault(query_id, []).append(value)
+        return result
+
+    def query_ids_by_table(self, table):
+        return [row[0] for row in self.conn.execute(
+            "SELECT query_id FROM query_tables WHERE table_name = ?", (table,))]
+
+    def query_ids_by_field(self, field):
+        return [row[0] for row in self.conn.execute(
+            "SELECT query_id FROM query_fields WHERE field_name = ?", (field,))]
+
+    def category_counts(self):
+        return dict(self.conn.execute(
+            "SELECT category, COUNT(*) FROM queries WHERE label = 'valid' GROUP BY category"))
@@ -0,0 +1,152 @@
+"""
+섹션 단위 병렬 스캔 드라이버
+PEAnalyzer가 읽은 섹션 표로 실행 파일을 구간(shard)으로 나누고, 큰 섹션은 다시 일정 크기로 잘라
+프로세스 풀에서 동시에 스캔한 뒤 파일 전체 오프셋 기준으로 결과를 합칩니다.
+
+작업 프로세스는 파일 경로만 받아 각자 읽기 전용 mmap으로 열고(페이지 캐시 공유),
+자기 구간 앞뒤로 여유(margin)를 붙인 범위만 잘라 스캔합니다.
+여유 구간에서 시작한 일치는 이웃 구간의 몫이므로 버리고, 자기 구간에서 시작한 일치만 돌려주므로
+구간 경계에 걸친 문자열도 빠지거나 두 번 보고되지 않습니다. (여유보다 긴 일치는 예외)
+
+사용 예:
+    python parallel_scan.py DeskPro.exe --task sql --jobs 4
+    python parallel_scan.py DeskPro.exe --task sqlite_functions --jobs 0 --chunk-mb 4
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from advanced_code_analysis import extract_sql_queries_advanced
+from analyze_pe_structure import PEAnalyzer, scan_sqlite_functions
+from binary_scan import MappedFile
+from extract_sql_strings import find_sql_in_buffer, unique_queries
+
+# 구간 최대 크기와 앞뒤 여유 (바이트)
+CHUNK_SIZE = 8 * 1024 * 1024
+MARGIN = 64 * 1024
+
+
+def _sql_task(data, base):
+    """extract_sql_strings 검색 (쿼리, 인코딩, 오프셋)"""
+    return [(offset + base, (query, encoding, offset + base)) for query, encoding, offset in find_sql_in_buffer(data)]
+
+
+def _advanced_sql_task(data, base):
+    """advanced_code_analysis SQL 쿼리 검색 (오프셋은 16진수 문자열)"""
+    results = []
+    for query in extract_sql_queries_advanced(data):
+        offset = int(query['offset'], 16) + base
+        results.append((offset, dict(query, offset=hex(offset))))
+    return results
+
+
+def _sqlite_functions_task(data, base):
+    """PEAnalyzer SQLite 함수명 검색 (오프셋, 이름)"""
+    return [(offset + base, (offset + base, name)) for offset, name in scan_sqlite_functions(data)]
+
+
+# 작업 이름: (구간 스캔 함수, 합친 결과 정리 함수)
+TASKS = {
+    'sql': (_sql_task, unique_queries),
+    'advanced_sql': (_advanced_sql_task, list),
+    'sqlite_functions': (_sqlite_functions_task, list),
+}
+
+
+def plan_shards(file_path, chunk_size=CHUNK_SIZE, margin=MARGIN):
+    """섹션 표로 파일을 나눈 구간 목록
+
+    섹션의 원시 데이터 범위와 그 사이(헤더, 섹션 사이 간격, 끝의 덧붙은 데이터)로 파일 전체를 빈틈없이 나누고,
+    chunk_size보다 큰 범위는 다시 자릅니다. 구간마다 자기 범위(start, end)와
+    앞뒤 여유를 붙인 스캔 범위(scan_start, scan_end)를 가집니다.
+    PE 파일이 아니면 파일 전체를 chunk_size 단위로 나눕니다.
+    """
+    size = os.path.getsize(file_path)
+    analyzer = PEAnalyzer(file_path)
+    try:
+        sections = analyzer.sections if analyzer.analyze() else []
+    finally:
+        analyzer.close()
+
+    # (시작, 끝, 섹션 이름) 원시 데이터 범위
+    ranges = []
+    for section in sections:
+        start = min(section['PointerToRawData'], size)
+        end = min(start + section['SizeOfRawData'], size)
+        if start < end:
+            ranges.append((start, end, section['Name']))
+
+    boundaries = sorted({0, size} | {start for start, _, _ in ranges} | {end for _, end, _ in ranges})
+    shards = []
+
+    for start, end in zip(boundaries, boundaries[1:]):
+        name = next((name for s, e, name in ranges if s <= start < e), '(섹션 밖)')
+        for chunk_start in range(start, end, chunk_size):
+            chunk_end = min(end, chunk_start + chunk_size)
+            shards.append({
+                'section': name,
+                'start': chunk_start,
+                'end': chunk_end,
+                'scan_start': max(0, chunk_start - margin),
+                'scan_end': min(size, chunk_end + margin),
+            })
+
+    return shards
+
+
+def _scan_shard(file_path, task, shard):
+    """프로세스 풀 작업 함수: 구간 하나를 스캔해 자기 범위에서 시작한 (오프셋, 결과) 목록 반환"""
+    scan, _ = TASKS[task]
+    with MappedFile(file_path) as buffer:
+        data = buffer.data[shard['scan_start']:shard['scan_end']]
+    return [(offset, item) for offset, item in scan(data, shard['scan_start'])
+            if shard['start'] <= offset < shard['end']]
+
+
+def scan_file(file_path, task='sql', jobs=1, chunk_size=CHUNK_SIZE, margin=MARGIN):
+    """파일을 구간으로 나눠 병렬 스캔하고 오프셋 순서로 합친 결과 반환
+
+    jobs가 1이면 같은 구간 나누기를 현재 프로세스에서 차례로 실행합니다.
+    """
+    shards = plan_shards(file_path, chunk_size, margin)
+    _, finish = TASKS[task]
+    found = []
+
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(_scan_shard, str(file_path), task, shard) for shard in shards]
+            for future in futures:
+                found.extend(future.result())
+    else:
+        for shard in shards:
+            found.extend(_scan_shard(file_path, task, shard))
+
+    found.sort(key=lambda item: item[0])
+    return finish(item for _, item in found)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="섹션 단위 병렬 바이너리 스캔")
+    parser.add_argument('input', nargs='?', default='DeskPro.exe', help="분석할 실행 파일")
+    parser.add_argument('--task', choices=sorted(TASKS), default='sql', help="실행할 스캔 작업")
+    parser.add_argument('--jobs', type=int, default=0, help="작업 프로세스 수 (0: CPU 수)")
+    parser.add_argument('--chunk-mb', type=int, default=CHUNK_SIZE // (1024 * 1024), help="구간 최대 크기 (MB)")
+    args = parser.parse_args()
+
+    exe_path = Path(args.input)
+    if not exe_path.exists():
+        print(f"오류: {exe_path} 파일을 찾을 수 없습니다.")
+        sys.exit(1)
+
+    jobs = args.jobs or os.cpu_count() or 1
+    chunk_size = args.chunk_mb * 1024 * 1024
+    shards = plan_shards(exe_path, chunk_size)
+    print(f"구간 {len(shards)}개 ({', '.join(sorted({shard['section'] for shard in shards}))}), 프로세스 {jobs}개")
+
+    start = time.perf_counter()
+    results = scan_file(exe_path, args.task, jobs, chunk_size)
+    print(f"{args.task}: 결과 {len(results):,}건, {time.perf_counter() - start:.2f}s")
@@ -7,6 +7,8 @@ import re
 from pathlib import Path
 from collections import defaultdict
 
+from findings_store import DEFAULT_STORE, FindingsStore, extract_fields, extract_tables, query_type
+
 class UISQLMapper:
     """UI와 SQL 매핑 분석기"""
     
@@ -161,71 +163,30 @@ class UISQLMapper:
             print(f"SQL 파일 읽기 오류: {e}")
             return False
     
+    def load_sql_queries_from_store(self, store_path=DEFAULT_STORE):
+        """결과 저장소에서 유효 판정 쿼리를 테이블/필드 색인과 함께 로드 (텍스트 재파싱 없음)"""
+        if not Path(store_path).exists():
+            return False
+        
+        try:
+            with FindingsStore(store_path) as store:
+                self.sql_queries = store.valid_queries()
+            return bool(self.sql_queries)
+        except Exception as e:
+            print(f"결과 저장소 읽기 오류: {e}")
+            return False
+    
     def _extract_query_type(self, query):
         """쿼리 타입 추출"""
-        query_upper = query.upper()
-        if 'SELECT' in query_upper:
-            return 'SELECT'
-        elif 'INSERT' in query_upper:
-            return 'INSERT'
-        elif 'UPDATE' in query_upper:
-            return 'UPDATE'
-        elif 'DELETE' in query_upper:
-            return 'DELETE'
-        elif 'CREATE TABLE' in query_upper:
-            return 'CREATE'
-        else:
-            return 'UNKNOWN'
+        return query_type(query)
     
     def _extract_tables(self, query):
         """테이블명 추출"""
-        tables = []
-        
-        # FROM 절
-        from_match = re.search(r'(?i)FROM\s+(\w+)', query)
-        if from_match:
-            tables.append(from_match.group(1))
-        
-        # UPDATE 절
-        update_match = re.search(r'(?i)UPDATE\s+(\w+)', query)
-        if update_match:
-            tables.append(update_match.group(1))
-        
-        # INSERT INTO 절
-        insert_match = re.search(r'(?i)INSERT\s+INTO\s+(\w+)', query)
-        if insert_match:
-            tables.append(insert_match.group(1))
-        
-        # CREATE TABLE 절
-        create_match = re.search(r'(?i)CREATE\s+TABLE\s+(\w+)', query)
-        if create_match:
-            tables.append(create_match.group(1))
-        
-        return list(set(tables))
+        return extract_tables(query)
     
     def _extract_fields(self, query):
         """필드명 추출"""
-        fields = []
-        
-        # SET 절의 필드들
-        set_matches = re.finditer(r'(?i)SET\s+([^WHERE]+)', query)
-        for match in set_matches:
-            set_clause = match.group(1)
-            # 필드명 = 값 패턴
-            field_matches = re.finditer(r'(\w+)\s*=', set_clause)
-            for fm in field_matches:
-                field = fm.group(1).strip()
-                if field and field not in fields:
-                    fields.append(field)
-        
-        # INSERT INTO (필드1, 필드2, ...) 패턴
-        insert_fields_match = re.search(r'(?i)INSERT\s+INTO\s+\w+\s*\(([^)]+)\)', query)
-        if insert_fields_match:
-            fields_str = insert_fields_match.group(1)
-            field_list = [f.strip() for f in fields_str.split(',')]
-            fields.extend([f for f in field_list if f and f not in fields])
-        
-        return fields
+        return extract_fields(query)
     
     def map_ui_to_sql(self):
         """UI 요소와 SQL 쿼리 매핑"""
@@ -401,8 +362,15 @@ if __name__ == '__main__':
     mapper.load_ui_structure()
     print(f"UI 구조 로드 완료: {sum(len(v) for v in mapper.ui_elements.values())}개 요소")
     
-    if mapper.load_sql_queries():
-        print(f"SQL 쿼리 로드 완료: {len(mapper.sql_queries)}개")
+    if mapper.load_sql_queries_from_store():
+        print(f"결과 저장소에서 SQL 쿼리 로드 완료: {len(mapper.sql_queries)}개")
+        loaded = True
+    else:
+        loaded = mapper.load_sql_queries()
+        if loaded:
+            print(f"SQL 쿼리 로드 완료: {len(mapper.sql_queries)}개")
+    
+    if loaded:
         
         mapper.map_ui_to_sql()
         print(f"매핑 완료: {len(mapper.mappings)}개 매핑")
@@ -3,123 +3,516 @@
 깨진 쿼리를 식별하고 유효한 쿼리를 정리합니다.
 """
 
+import argparse
+import codecs
+import hashlib
+import inspect
+import os
+import random
 import re
+import sqlite3
 import sys
+import zlib
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import sql_lexer
+
+# 분석 스크립트 공용 결과 저장소 (map-analysis/findings_store.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'map-analysis'))
+from findings_store import DEFAULT_STORE, FindingsStore
+
+
+def _classify_chunk(texts):
+    """프로세스 풀 작업 함수: 쿼리 텍스트 묶음을 분류해 (라벨, 종류) 목록 반환"""
+    return [SQLQueryReviewer.classify(text) for text in texts]
+
+
+class FragmentClusterer:
+    """MinHash + LSH로 겹치는 SQL 조각을 묶어 하나의 문장 후보로 재조립
+    
+    모든 조각 쌍을 비교하지 않고, 밴드별 서명이 같은 버킷에 들어온 후보 쌍만
+    실제 토큰 shingle 포함도로 확인하므로 조각 수에 대해 거의 선형으로 동작합니다.
+    """
+    
+    NUM_PERM = 64            # MinHash 서명 길이
+    BANDS = 16               # LSH 밴드 수 (밴드당 NUM_PERM // BANDS 행)
+    SHINGLE_SIZE = 3         # 토큰 shingle 크기
+    MIN_CONTAINMENT = 0.5    # 작은 쪽 shingle 중 겹치는 비율 하한
+    MIN_OVERLAP = 2          # 앞뒤 이어 붙일 때 필요한 최소 겹침 토큰 수
+    
+    # Delphi 문자열 테이블 구분자: 0x00 패딩, 'Ұ' 0x02, 0xFFFF 0xFFFF, 길이 1문자, 0x00
+    SEPARATOR_RE = re.compile('\x00*\u04b0\x02\uffff\uffff.\x00?', re.DOTALL)
+    
+    # MinHash 해시 함수 h(x) = (a*x + b) mod P 에 쓰는 메르센 소수
+    _PRIME = (1 << 61) - 1
+    
+    def __init__(self, seed=1):
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, self._PRIME), rng.randrange(self._PRIME))]
+        self._rows = self.NUM_PERM // self.BANDS
+    
+    def tokens(self, text):
+        """구분자와 깨진 문자를 걷어낸 SQL 토큰 목록"""
+        text = self.SEPARATOR_RE.sub(' ', text)
+        tokens = [value for kind, value in sql_lexer.tokenize(text)
+                  if kind not in (sql_lexer.WS, sql_lexer.GARBAGE)]
+        
+        # "OPEN" 같은 따옴표 식별자는 한 토큰으로 합침
+        merged = []
+        i = 0
+        while i < len(tokens):
+            if tokens[i] == '"' and i + 2 < len(tokens) and tokens[i + 2] == '"':
+                merged.append(f'"{tokens[i + 1]}"')
+                i += 3
+            else:
+                merged.append(tokens[i])
+                i += 1
+        return merged
+    
+    def shingles(self, tokens):
+        """대문자 토큰 k-gram 해시 집합"""
+        upper = [token.upper() for token in tokens]
+        size = min(self.SHINGLE_SIZE, len(upper))
+        return {zlib.crc32(' '.join(upper[i:i + size]).encode('utf-8'))
+                for i in range(len(upper) - size + 1)}
+    
+    def signature(self, shingles):
+        """MinHash 서명 (one permutation hashing)
+        
+        shingle마다 해시를 한 번만 계산해 NUM_PERM개 구간 중 하나에 넣고 구간별 최솟값을 취합니다.
+        빈 구간은 다음 구간 값을 빌려 채워(rotation densification) 작은 조각도 비교할 수 있게 합니다.
+        """
+        a, b = self._perms[0]
+        prime = self._PRIME
+        num_bins = self.NUM_PERM
+        bins = [None] * num_bins
+        
+        for x in shingles:
+            h = (a * x + b) % prime
+            i = h % num_bins
+            v = h // num_bins
+            if bins[i] is None or v < bins[i]:
+                bins[i] = v
+        
+        filled = bins[:]
+        for i in range(num_bins):
+            if bins[i] is None:
+                for step in range(1, num_bins):
+                    value = filled[(i + step) % num_bins]
+                    if value is not None:
+                        # 빌려온 거리도 값에 섞어 서로 다른 빈 구간이 같은 값이 되지 않게 함
+                        bins[i] = (value, step)
+                        break
+        return bins
+    
+    def cluster(self, fragments):
+        """(키, 텍스트) 목록을 받아 2개 이상 묶인 클러스터의 키 목록들을 반환"""
+        entries = {}
+        buckets = defaultdict(list)
+        
+        for key, text in fragments:
+            tokens = self.tokens(text)
+            if len(tokens) < self.MIN_OVERLAP:
+                continue
+            shingles = self.shingles(tokens)
+            entries[key] = (tokens, shingles)
+            
+            sig = self.signature(shingles)
+            for band in range(self.BANDS):
+                band_key = (band, tuple(sig[band * self._rows:(band + 1) * self._rows]))
+                buckets[band_key].append(key)
+        
+        # 같은 버킷의 후보 쌍만 포함도 확인 후 union-find로 병합
+        parent = {key: key for key in entries}
+        
+        def find(key):
+            while parent[key] != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+        
+        checked = set()
+        for members in buckets.values():
+            for i in range(1, len(members)):
+                # 버킷 첫 조각과 바로 앞 조각만 비교해 버킷 크기에 선형으로 유지
+                for a in {members[0], members[i - 1]}:
+                    b = members[i]
+                    if (a, b) in checked or find(a) == find(b):
+                        continue
+                    checked.add((a, b))
+                    sa, sb = entries[a][1], entries[b][1]
+                    if len(sa & sb) >= self.MIN_CONTAINMENT * min(len(sa), len(sb)):
+                        parent[find(b)] = find(a)
+        
+        groups = defaultdict(list)
+        for key in entries:
+            groups[find(key)].append(key)
+        
+        self._entries = entries
+        return [keys for keys in groups.values() if len(keys) > 1]
+    
+    def reassemble(self, keys):
+        """클러스터 조각들을 겹치는 토큰 기준으로 이어 붙인 문장 후보 반환"""
+        pieces = sorted((self._entries[key][0] for key in keys), key=len, reverse=True)
+        merged = list(pieces[0])
+        
+        for piece in pieces[1:]:
+            merged = self._merge(merged, piece)
+        
+        text = ' '.join(merged)
+        text = re.sub(r' ([,.)])', r'\1', text)
+        return re.sub(r'([(.]) ', r'\1', text)
+    
+    def _merge(self, merged, piece):
+        """piece를 merged 앞이나 뒤에 겹침만큼 이어 붙임 (포함되거나 겹침이 없으면 그대로)"""
+        upper_merged = [token.upper() for token in merged]
+        upper_piece = [token.upper() for token in piece]
+        n = len(upper_piece)
+        
+        if f" {' '.join(upper_piece)} " in f" {' '.join(upper_merged)} ":
+            return merged
+        
+        for overlap in range(min(len(merged), n) - 1, self.MIN_OVERLAP - 1, -1):
+            if upper_merged[-overlap:] == upper_piece[:overlap]:
+                return merged + piece[overlap:]
+            if upper_piece[-overlap:] == upper_merged[:overlap]:
+                return piece[:-overlap] + merged
+        return merged
+
+
+class ReviewCache:
+    """입력 파일 옆 SQLite 파일에 쿼리 내용 해시별 분류 결과를 저장하는 캐시
+    
+    항목마다 분류 규칙 버전(rules)을 함께 저장하고, 열 때 현재 버전과 다른 항목은 지웁니다.
+    """
+    
+    SUFFIX = '.review_cache.db'
+    
+    def __init__(self, path, rules):
+        self.path = Path(path)
+        self.rules = rules
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS reviews ("
+            " hash TEXT PRIMARY KEY, rules TEXT NOT NULL,"
+            " label TEXT NOT NULL, category TEXT, cleaned TEXT)"
+        )
+        stale = self.conn.execute("DELETE FROM reviews WHERE rules != ?", (rules,)).rowcount
+        self.conn.commit()
+        if stale:
+            print(f"분류 규칙이 바뀌어 캐시 항목 {stale}개를 무효화했습니다.")
+        self._pending = []
+    
+    @staticmethod
+    def content_hash(text):
+        """쿼리 원문 해시 (지문과 달리 정규화하지 않음)"""
+        return hashlib.sha1(text.encode('utf-8', 'surrogatepass')).hexdigest()
+    
+    def get(self, key):
+        """(라벨, 종류, 정리된 텍스트) 또는 None"""
+        return self.conn.execute(
+            "SELECT label, category, cleaned FROM reviews WHERE hash = ? AND rules = ?", (key, self.rules)
+        ).fetchone()
+    
+    def put(self, key, label, category, cleaned):
+        self._pending.append((key, self.rules, label, category, cleaned))
+        if len(self._pending) >= 500:
+            self.flush()
+    
+    def flush(self):
+        if self._pending:
+            self.conn.executemany("INSERT OR REPLACE INTO reviews VALUES (?, ?, ?, ?, ?)", self._pending)
+            self.conn.commit()
+            self._pending = []
+    
+    def close(self):
+        self.flush()
+        self.conn.close()
+
 
 class SQLQueryReviewer:
     """SQL 쿼리 검토기"""
     
-    def __init__(self, input_file):
+    # 인코딩 판별에 사용할 파일 앞부분 크기
+    SNIFF_SIZE = 64 * 1024
+    
+    # 쿼리 블록 헤더: [쿼리 #N] (인코딩: ...) - 한글 깨짐을 고려해 괄호 안 라벨은 느슨하게 매칭
+    HEADER_RE = re.compile(r'\[[^\]]*#(\d+)\](?:.*\([^)]*:\s*([^)]+)\))?')
+    RULE_RE = re.compile(r'-+$')
+    
+    # 블록 파서 상태
+    SEEK_HEADER, EXPECT_RULE, IN_BODY = range(3)
+    
+    # 병렬 분석 시 작업 하나에 묶어 보낼 쿼리 수
+    CHUNK_SIZE = 500
+    
+    def __init__(self, input_file, use_cache=False):
         self.input_file = Path(input_file)
+        self.use_cache = use_cache
+        self.cache = None
         self.queries = []
         self.valid_queries = []
         self.broken_queries = []
         self.invalid_queries = []
+        self.reconstructed = []
+        self.duplicates = []
         self.statistics = defaultdict(int)
         
     def parse_file(self):
-        """파일 파싱"""
-        print(f"파일 읽는 중: {self.input_file}")
-        
+        """파일 파싱 (전체 쿼리를 self.queries에 적재)"""
         try:
-            # 여러 인코딩 시도
-            encodings = ['utf-8', 'utf-16', 'cp949', 'latin-1']
-            content = None
-            
-            for encoding in encodings:
-                try:
-                    with open(self.input_file, 'r', encoding=encoding, errors='ignore') as f:
-                        content = f.read()
-                    print(f"성공적으로 읽음 (인코딩: {encoding})")
-                    break
-                except:
-                    continue
-            
-            if not content:
-                print("파일을 읽을 수 없습니다.")
-                return False
-            
-            # 쿼리 블록 파싱
-            self._parse_queries(content)
+            self.queries = list(self.iter_queries())
             return True
-            
         except Exception as e:
             print(f"파일 읽기 오류: {e}")
             return False
     
-    def _parse_queries(self, content):
-        """쿼리 파싱"""
-        # 쿼리 블록 패턴: [쿼리 #N] (인코딩: ...) ... --- ... 쿼리 내용 ... ---
-        # 한글 깨짐을 고려하여 더 유연한 패턴 사용
-        pattern = r'\[[^\]]*#(\d+)\][^\n]*\([^)]*:\s*([^)]+)\)[^\n]*\n-+\n(.*?)\n-+\n'
-        matches = re.finditer(pattern, content, re.DOTALL | re.IGNORECASE)
-        
-        for match in matches:
-            query_num = match.group(1)
-            encoding = match.group(2).strip()
-            query_text = match.group(3).strip()
-            
-            self.queries.append({
-                'number': int(query_num),
-                'encoding': encoding,
-                'text': query_text,
-                'original': match.group(0)
-            })
+    def _sniff_encoding(self):
+        """파일 앞부분만 읽어 인코딩 판별 (BOM → UTF-8 → CP949 순)"""
+        with open(self.input_file, 'rb') as f:
+            head = f.read(self.SNIFF_SIZE)
+        
+        if head.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+        if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            return 'utf-16'
+        
+        for encoding in ('utf-8', 'cp949'):
+            try:
+                # 잘린 멀티바이트 문자가 끝에 걸려도 실패하지 않도록 final=False
+                codecs.getincrementaldecoder(encoding)().decode(head, final=False)
+                return encoding
+            except UnicodeDecodeError:
+                continue
         
-        # 대체 패턴: 더 단순한 형식
-        if len(self.queries) == 0:
-            # [쿼리 #N] 형식만 찾기
-            pattern2 = r'\[[^\]]*#(\d+)\][^\n]*\n-+\n(.*?)\n-+\n'
-            matches2 = re.finditer(pattern2, content, re.DOTALL | re.IGNORECASE)
+        # 기존 동작과 동일하게 UTF-8로 읽고 디코딩 불가 바이트는 무시
+        return 'utf-8'
+    
+    def iter_queries(self):
+        """쿼리 블록을 한 줄씩 읽으며 하나씩 반환하는 제너레이터
+        
+        블록 형식: [쿼리 #N] (인코딩: ...) 헤더 줄, 구분선, 쿼리 내용, 구분선
+        파일 전체를 메모리에 올리지 않으므로 입력 크기와 관계없이 메모리 사용량이 일정합니다.
+        """
+        print(f"파일 읽는 중: {self.input_file}")
+        encoding = self._sniff_encoding()
+        print(f"성공적으로 읽음 (인코딩: {encoding})")
+        
+        with open(self.input_file, 'r', encoding=encoding, errors='ignore') as f:
+            yield from self._iter_blocks(f)
+    
+    def _iter_blocks(self, lines):
+        """줄 단위 상태 기계로 쿼리 블록 인식
+        
+        상태: 헤더 탐색 → 여는 구분선 대기 → 본문 수집(닫는 구분선까지)
+        """
+        state = self.SEEK_HEADER
+        header = None
+        body = []
+        
+        for line in lines:
+            line = line.rstrip('\n')
             
-            for match in matches2:
-                query_num = match.group(1)
-                query_text = match.group(2).strip()
-                
-                # 인코딩 추정
-                encoding = 'UNKNOWN'
-                if 'UTF-16' in match.group(0) or 'utf-16' in match.group(0).lower():
-                    encoding = 'UTF-16'
-                elif 'UTF-8' in match.group(0) or 'utf-8' in match.group(0).lower():
-                    encoding = 'UTF-8'
-                elif 'BINARY' in match.group(0) or 'binary' in match.group(0).lower():
-                    encoding = 'BINARY'
-                
-                self.queries.append({
-                    'number': int(query_num),
-                    'encoding': encoding,
-                    'text': query_text,
-                    'original': match.group(0)
-                })
-    
-    def analyze_queries(self):
-        """쿼리 분석"""
-        print(f"\n총 {len(self.queries)}개의 쿼리 분석 중...")
-        
-        for query_info in self.queries:
-            query_text = query_info['text']
+            if state == self.IN_BODY:
+                if self.RULE_RE.match(line):
+                    yield self._make_query(header, body)
+                    state = self.SEEK_HEADER
+                    body = []
+                else:
+                    body.append(line)
+                continue
             
-            # 기본 검증
-            is_valid = self._is_valid_sql(query_text)
-            is_broken = self._is_broken(query_text)
-            is_invalid = self._is_invalid_content(query_text)
+            if state == self.EXPECT_RULE:
+                if self.RULE_RE.match(line):
+                    state = self.IN_BODY
+                    continue
+                # 헤더 다음 줄이 구분선이 아니면 이 줄부터 다시 헤더 탐색
+                state = self.SEEK_HEADER
             
-            if is_invalid:
-                self.invalid_queries.append(query_info)
-                self.statistics['invalid'] += 1
-            elif is_broken:
-                self.broken_queries.append(query_info)
-                self.statistics['broken'] += 1
-            elif is_valid:
-                self.valid_queries.append(query_info)
-                self.statistics['valid'] += 1
+            header = self.HEADER_RE.search(line)
+            if header:
+                state = self.EXPECT_RULE
+    
+    def _make_query(self, header, body):
+        """헤더 매치와 본문 줄로 쿼리 레코드 생성"""
+        text = '\n'.join(body).strip()
+        encoding = header.group(2)
+        
+        if encoding:
+            encoding = encoding.strip()
+        else:
+            # 인코딩 표기가 없는 블록: 헤더와 본문으로 인코딩 추정
+            block = (header.string + text).lower()
+            encoding = 'UNKNOWN'
+            if 'utf-16' in block:
+                encoding = 'UTF-16'
+            elif 'utf-8' in block:
+                encoding = 'UTF-8'
+            elif 'binary' in block:
+                encoding = 'BINARY'
+        
+        return {
+            'number': int(header.group(1)),
+            'encoding': encoding,
+            'text': text,
+        }
+    
+    def analyze_queries(self, queries=None, jobs=1, dedupe=True):
+        """쿼리 분석
+        
+        queries를 주면 (예: iter_queries() 제너레이터) 목록을 만들지 않고 하나씩 분석합니다.
+        jobs가 2 이상이면 쿼리를 CHUNK_SIZE개씩 묶어 프로세스 풀에서 분류하고,
+        결과는 입력 순서대로 병합합니다.
+        dedupe가 참이면 지문이 같은 쿼리는 한 번만 분류합니다 (collapse_duplicates 참고).
+        """
+        if queries is None:
+            queries = self.queries
+            print(f"\n총 {len(queries)}개의 쿼리 분석 중...")
+        else:
+            print("\n쿼리 분석 중...")
+        
+        if dedupe:
+            queries = self.collapse_duplicates(queries)
+        
+        if self.use_cache:
+            self.cache = ReviewCache(self.input_file.with_name(self.input_file.name + ReviewCache.SUFFIX),
+                                     self.rules_version())
+        
+        try:
+            if jobs > 1:
+                self._analyze_parallel(queries, jobs)
             else:
-                self.broken_queries.append(query_info)
-                self.statistics['broken'] += 1
+                for query_info in queries:
+                    result = self._cached_result(query_info)
+                    if result is None:
+                        result = self._store_result(query_info, self.classify(query_info['text']))
+                    self._record(query_info, result)
+        finally:
+            if self.cache:
+                self.cache.close()
+                self.cache = None
+    
+    @staticmethod
+    def rules_version():
+        """분류 규칙 버전: 분류기(sql_lexer)와 clean_query 소스 해시라 규칙을 고치면 자동으로 바뀜"""
+        source = inspect.getsource(sql_lexer) + inspect.getsource(SQLQueryReviewer.clean_query)
+        return hashlib.sha1(source.encode('utf-8')).hexdigest()[:16]
+    
+    def _cached_result(self, query_info):
+        """캐시에 있으면 정리된 텍스트를 붙이고 분류 결과 반환, 없으면 None"""
+        if not self.cache:
+            return None
+        
+        query_info['hash'] = ReviewCache.content_hash(query_info['text'])
+        row = self.cache.get(query_info['hash'])
+        if row is None:
+            self.statistics['cache_misses'] += 1
+            return None
+        
+        label, category, cleaned = row
+        if cleaned is not None:
+            query_info['cleaned'] = cleaned
+        self.statistics['cache_hits'] += 1
+        return label, category
+    
+    def _store_result(self, query_info, result):
+        """새로 분류한 결과를 캐시에 기록 (유효한 쿼리는 정리된 텍스트도 함께)"""
+        if self.cache:
+            label, category = result
+            cleaned = self.clean_query(query_info['text']) if label == 'valid' else None
+            if cleaned is not None:
+                query_info['cleaned'] = cleaned
+            self.cache.put(query_info['hash'], label, category, cleaned)
+        return result
+    
+    def collapse_duplicates(self, queries):
+        """지문이 같은 쿼리는 처음 나온 것만 반환하고 나머지는 메타데이터로 합침
+        
+        처음 레코드에 fingerprint, occurrences(출현 횟수), encodings(출처 인코딩 목록)를 붙이고,
+        이후 중복은 이미 분류된 레코드라도 그 값만 갱신합니다.
+        중복 쿼리 번호는 (중복 번호, 대표 번호) 쌍으로 self.duplicates에 남깁니다.
+        """
+        seen = {}
+        
+        for query_info in queries:
+            key = sql_lexer.fingerprint(query_info['text'])
+            first = seen.get(key)
+            
+            if first is not None:
+                first['occurrences'] += 1
+                if query_info['encoding'] not in first['encodings']:
+                    first['encodings'].append(query_info['encoding'])
+                self.duplicates.append((query_info['number'], first['number']))
+                self.statistics['duplicates'] += 1
+                continue
+            
+            query_info['fingerprint'] = key
+            query_info['occurrences'] = 1
+            query_info['encodings'] = [query_info['encoding']]
+            seen[key] = query_info
+            yield query_info
+    
+    def _analyze_parallel(self, queries, jobs):
+        """프로세스 풀 분류 (진행 중인 묶음 수를 제한해 메모리 사용량 유지)"""
+        queries = iter(queries)
+        pending = deque()
+        
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for chunk in iter(lambda: list(islice(queries, self.CHUNK_SIZE)), []):
+                # 캐시에 없는 쿼리만 작업 프로세스로 보냄
+                cached = [self._cached_result(query_info) for query_info in chunk]
+                texts = [query_info['text'] for query_info, result in zip(chunk, cached) if result is None]
+                future = executor.submit(_classify_chunk, texts) if texts else None
+                pending.append((chunk, cached, future))
+                
+                if len(pending) >= jobs * 2:
+                    self._merge_chunk(*pending.popleft())
+            
+            while pending:
+                self._merge_chunk(*pending.popleft())
+    
+    def _merge_chunk(self, chunk, cached, future):
+        """완료된 묶음의 분류 결과를 캐시 적중 결과와 함께 순서대로 반영"""
+        results = iter(future.result() if future else ())
+        for query_info, result in zip(chunk, cached):
+            if result is None:
+                result = self._store_result(query_info, next(results))
+            self._record(query_info, result)
+    
+    def _record(self, query_info, result):
+        """분류 결과를 해당 목록과 통계에 반영"""
+        label, category = result
+        query_info['label'] = label
+        if category:
+            query_info['category'] = category
+        getattr(self, f"{label}_queries").append(query_info)
+        self.statistics[label] += 1
+        self.statistics['total'] += 1
     
-    def _is_valid_sql(self, text):
+    @staticmethod
+    def classify(text):
+        """쿼리 텍스트를 토큰 한 번 훑기로 분류
+        
+        ('valid'|'broken'|'invalid', 종류) 반환. 종류는 유효한 쿼리에만 붙습니다.
+        """
+        return sql_lexer.classify(text)
+    
+    @classmethod
+    def classify_regex(cls, text):
+        """기존 정규식 검사 경로로 분류 (sql_lexer 결과 비교 및 벤치마크용)"""
+        if cls._is_invalid_content(text):
+            return 'invalid'
+        if cls._is_broken(text):
+            return 'broken'
+        if cls._is_valid_sql(text):
+            return 'valid'
+        return 'broken'
+    
+    @staticmethod
+    def _is_valid_sql(text):
         """유효한 SQL 쿼리인지 확인"""
         # SQL 키워드 확인
         sql_keywords = ['SELECT', 'INSERT', 'UPDATE', 'DELETE', 'CREATE', 'ALTER', 'DROP', 'PRAGMA']
@@ -148,7 +541,8 @@ class SQLQueryReviewer:
         
         return any(re.search(pattern, text) for pattern in patterns)
     
-    def _is_broken(self, text):
+    @staticmethod
+    def _is_broken(text):
         """깨진 쿼리인지 확인"""
         # 불완전한 쿼리 패턴
         broken_patterns = [
@@ -168,7 +562,8 @@ class SQLQueryReviewer:
         
         return False
     
-    def _is_invalid_content(self, text):
+    @staticmethod
+    def _is_invalid_content(text):
         """유효하지 않은 내용인지 확인 (SQL이 아닌 것)"""
         # SQL이 아닌 내용 패턴
         invalid_patterns = [
@@ -190,6 +585,49 @@ class SQLQueryReviewer:
         
         return False
     
+    def load_reviews(self, store):
+        """결과 저장소의 검토 결과로 쿼리 목록과 통계를 다시 채움 (보고서를 저장소 기준으로 생성)"""
+        self.valid_queries, self.broken_queries, self.invalid_queries = [], [], []
+        for key in ('total', 'valid', 'broken', 'invalid'):
+            self.statistics[key] = 0
+        
+        for query_info in store.iter_reviews():
+            self._record(query_info, (query_info['label'], query_info.get('category')))
+        self.statistics['duplicates'] = store.label_count('duplicate')
+    
+    def cluster_fragments(self, clusterer=None):
+        """유효/깨진 쿼리 중 겹치는 조각을 묶어 재조립한 문장 후보를 self.reconstructed에 저장"""
+        clusterer = clusterer or FragmentClusterer()
+        records = [query_info for query_info in self.valid_queries + self.broken_queries
+                   if len(query_info['text']) <= sql_lexer.MAX_LENGTH]
+        
+        print(f"\n조각 {len(records)}개 클러스터링 중...")
+        clusters = clusterer.cluster((i, query_info['text']) for i, query_info in enumerate(records))
+        
+        for keys in clusters:
+            keys.sort()
+            text = clusterer.reassemble(keys)
+            label, category = sql_lexer.classify(text)
+            self.reconstructed.append({
+                'text': text,
+                'numbers': [records[key]['number'] for key in keys],
+                'label': label,
+                'category': category,
+            })
+        
+        self.statistics['clusters'] = len(self.reconstructed)
+        self.statistics['reconstructed_valid'] = sum(1 for r in self.reconstructed if r['label'] == 'valid')
+        return self.reconstructed
+    
+    @staticmethod
+    def _describe_source(query_info):
+        """보고서용 출처 설명 (인코딩 목록과 중복 출현 횟수)"""
+        encodings = ', '.join(query_info.get('encodings') or [query_info['encoding']])
+        occurrences = query_info.get('occurrences', 1)
+        if occurrences > 1:
+            return f"인코딩: {encodings}, 출현: {occurrences}회"
+        return f"인코딩: {encodings}"
+    
     def clean_query(self, text):
         """쿼리 정리"""
         # 제어 문자 제거 (탭, 줄바꿈은 유지)
@@ -213,6 +651,10 @@ class SQLQueryReviewer:
         categories = defaultdict(list)
         
         for query_info in self.valid_queries:
+            if query_info.get('category'):
+                categories[query_info['category']].append(query_info)
+                continue
+            
             text = query_info['text'].upper()
             
             if 'SELECT' in text:
@@ -243,7 +685,9 @@ class SQLQueryReviewer:
             
             # 통계
             f.write("## 통계\n")
-            f.write(f"전체 쿼리 수: {len(self.queries)}\n")
+            f.write(f"전체 쿼리 수: {self.statistics['total']}\n")
+            if self.statistics['duplicates']:
+                f.write(f"중복 제거: {self.statistics['duplicates']}\n")
             f.write(f"유효한 쿼리: {self.statistics['valid']}\n")
             f.write(f"깨진 쿼리: {self.statistics['broken']}\n")
             f.write(f"유효하지 않은 내용: {self.statistics['invalid']}\n")
@@ -262,8 +706,8 @@ class SQLQueryReviewer:
             f.write("=" * 80 + "\n\n")
             
             for i, query_info in enumerate(self.valid_queries, 1):
-                cleaned = self.clean_query(query_info['text'])
-                f.write(f"\n[유효 쿼리 #{i}] (원본: 쿼리 #{query_info['number']}, 인코딩: {query_info['encoding']})\n")
+                cleaned = query_info.get('cleaned') or self.clean_query(query_info['text'])
+                f.write(f"\n[유효 쿼리 #{i}] (원본: 쿼리 #{query_info['number']}, {self._describe_source(query_info)})\n")
                 f.write("-" * 80 + "\n")
                 f.write(cleaned + "\n")
                 f.write("-" * 80 + "\n")
@@ -274,13 +718,30 @@ class SQLQueryReviewer:
             f.write("=" * 80 + "\n\n")
             
             for i, query_info in enumerate(self.broken_queries[:20], 1):
-                f.write(f"\n[깨진 쿼리 #{i}] (원본: 쿼리 #{query_info['number']})\n")
+                f.write(f"\n[깨진 쿼리 #{i}] (원본: 쿼리 #{query_info['number']}, {self._describe_source(query_info)})\n")
                 f.write("-" * 80 + "\n")
                 f.write(query_info['text'][:500] + ("..." if len(query_info['text']) > 500 else "") + "\n")
                 f.write("-" * 80 + "\n")
         
+            if self.reconstructed:
+                self._write_reconstructed(f)
+        
         print(f"\n검토 보고서가 {output_file}에 저장되었습니다.")
     
+    def _write_reconstructed(self, f):
+        """보고서에 조각 재조립 후보 섹션 기록"""
+        f.write("\n\n" + "=" * 80 + "\n")
+        f.write(f"## 조각 재조립 후보 ({len(self.reconstructed)}개)\n")
+        f.write("=" * 80 + "\n\n")
+        
+        for i, candidate in enumerate(self.reconstructed, 1):
+            numbers = ', '.join(f"#{n}" for n in candidate['numbers'])
+            verdict = candidate['category'] or candidate['label']
+            f.write(f"\n[재조립 #{i}] (조각: 쿼리 {numbers}, 판정: {verdict})\n")
+            f.write("-" * 80 + "\n")
+            f.write(candidate['text'] + "\n")
+            f.write("-" * 80 + "\n")
+    
     def export_valid_queries(self, output_file='valid_sql_queries.txt'):
         """유효한 쿼리만 별도 파일로 저장"""
         with open(output_file, 'w', encoding='utf-8') as f:
@@ -299,7 +760,7 @@ class SQLQueryReviewer:
                 f.write(f"{'=' * 80}\n\n")
                 
                 for i, query_info in enumerate(categories[cat], 1):
-                    cleaned = self.clean_query(query_info['text'])
+                    cleaned = query_info.get('cleaned') or self.clean_query(query_info['text'])
                     f.write(f"\n[{cat} #{i}]\n")
                     f.write("-" * 80 + "\n")
                     f.write(cleaned + "\n")
@@ -312,17 +773,26 @@ class SQLQueryReviewer:
         print("\n" + "=" * 80)
         print("검토 요약")
         print("=" * 80)
-        print(f"전체 쿼리 수: {len(self.queries)}")
+        total = self.statistics['total']
+        print(f"전체 쿼리 수: {total}")
+        if self.statistics['duplicates']:
+            print(f"  중복 제거: {self.statistics['duplicates']}개 (분류는 지문별 1회)")
+        if self.statistics['cache_hits'] or self.statistics['cache_misses']:
+            print(f"  캐시: 적중 {self.statistics['cache_hits']}개 / 새로 분석 {self.statistics['cache_misses']}개")
         
-        if len(self.queries) > 0:
-            valid_pct = (self.statistics['valid']/len(self.queries)*100) if len(self.queries) > 0 else 0
-            broken_pct = (self.statistics['broken']/len(self.queries)*100) if len(self.queries) > 0 else 0
-            invalid_pct = (self.statistics['invalid']/len(self.queries)*100) if len(self.queries) > 0 else 0
+        if total > 0:
+            valid_pct = (self.statistics['valid']/total*100)
+            broken_pct = (self.statistics['broken']/total*100)
+            invalid_pct = (self.statistics['invalid']/total*100)
             
             print(f"  [OK] 유효한 쿼리: {self.statistics['valid']} ({valid_pct:.1f}%)")
             print(f"  [X] 깨진 쿼리: {self.statistics['broken']} ({broken_pct:.1f}%)")
             print(f"  [X] 유효하지 않은 내용: {self.statistics['invalid']} ({invalid_pct:.1f}%)")
             
+            if self.reconstructed:
+                print(f"  [+] 조각 재조립 후보: {len(self.reconstructed)}개 "
+                      f"(유효 판정 {self.statistics['reconstructed_valid']}개)")
+            
             categories = self.categorize_queries()
             if categories:
                 print("\n카테고리별 분포:")
@@ -332,20 +802,52 @@ class SQLQueryReviewer:
             print("파싱된 쿼리가 없습니다.")
 
 if __name__ == '__main__':
-    input_file = Path('extracted_sql_queries.txt')
+    parser = argparse.ArgumentParser(description="추출된 SQL 쿼리 검토")
+    parser.add_argument('input', nargs='?', default='extracted_sql_queries.txt', help="검토할 추출 결과 파일")
+    parser.add_argument('--jobs', type=int, default=1, help="분류에 사용할 프로세스 수 (0: CPU 수)")
+    parser.add_argument('--keep-duplicates', action='store_true', help="지문이 같은 쿼리도 모두 따로 분류")
+    parser.add_argument('--no-cluster', action='store_true', help="겹치는 조각 재조립 단계 생략")
+    parser.add_argument('--no-cache', action='store_true', help="입력 파일 옆 검토 캐시를 쓰지 않고 모두 새로 분석")
+    parser.add_argument('--store', help=f"결과 저장소 경로 (기본: 입력 파일 옆 {DEFAULT_STORE}가 있으면 사용)")
+    args = parser.parse_args()
     
-    if not input_file.exists():
+    input_file = Path(args.input)
+    jobs = args.jobs or os.cpu_count() or 1
+    store_path = Path(args.store) if args.store else input_file.with_name(DEFAULT_STORE)
+    store = FindingsStore(store_path) if store_path.exists() or args.store else None
+    
+    if store is None and not input_file.exists():
         print(f"오류: {input_file} 파일을 찾을 수 없습니다.")
         sys.exit(1)
     
-    reviewer = SQLQueryReviewer(input_file)
+    reviewer = SQLQueryReviewer(input_file, use_cache=not args.no_cache)
     
-    if reviewer.parse_file():
-        reviewer.analyze_queries()
-        reviewer.print_summary()
-        reviewer.generate_report()
-        reviewer.export_valid_queries()
-    else:
+    try:
+        if store:
+            # 추출 단계가 저장소에 기록한 쿼리를 텍스트 재파싱 없이 바로 분석
+            print(f"결과 저장소에서 쿼리 읽는 중: {store_path}")
+            queries = store.iter_queries()
+        else:
+            # 파일 전체를 읽지 않고 블록 단위로 스트리밍 분석
+            queries = reviewer.iter_queries()
+        reviewer.analyze_queries(queries, jobs=jobs, dedupe=not args.keep_duplicates)
+    except Exception as e:
+        print(f"파일 읽기 오류: {e}")
         print("파일 파싱 실패!")
         sys.exit(1)
+    
+    if store:
+        store.save_reviews(reviewer.valid_queries + reviewer.broken_queries + reviewer.invalid_queries)
+        store.mark_duplicates(reviewer.duplicates)
+        print(f"검토 결과를 {store_path}에 저장했습니다.")
+        # 보고서는 메모리 목록이 아니라 저장소에 기록된 결과로 생성
+        reviewer.load_reviews(store)
+        store.close()
+    
+    if not args.no_cluster:
+        reviewer.cluster_fragments()
+    
+    reviewer.print_summary()
+    reviewer.generate_report()
+    reviewer.export_valid_queries()
 
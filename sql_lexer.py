@@ -0,0 +1,216 @@
+"""
+추출된 SQL 조각용 단순 토크나이저
+정규식 하나로 텍스트를 한 번만 훑어 토큰을 만들고,
+그 토큰 흐름만으로 쿼리의 유효/깨짐/무효 여부와 종류를 판정합니다.
+"""
+
+import hashlib
+import re
+
+# 토큰 종류
+KEYWORD = 'keyword'
+IDENT = 'ident'
+PARAM = 'param'
+NUMBER = 'number'
+PUNCT = 'punct'
+GARBAGE = 'garbage'
+WS = 'ws'
+
+TOKEN_RE = re.compile(r'''
+    (?P<ws>[ \t\r\n]+)
+  | (?P<word>[A-Za-z_][A-Za-z0-9_$]*)
+  | (?P<param>:[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<number>[0-9]+)
+  | (?P<punct>[\x21-\x7E])
+  | (?P<garbage>[^\x20-\x7E\t\r\n]+)
+''', re.VERBOSE)
+
+# 문장 종류를 결정하는 키워드
+STATEMENT_KEYWORDS = frozenset(['SELECT', 'INSERT', 'UPDATE', 'DELETE', 'CREATE', 'ALTER', 'DROP', 'PRAGMA'])
+
+KEYWORDS = STATEMENT_KEYWORDS | frozenset([
+    'FROM', 'INTO', 'SET', 'TABLE', 'VALUES', 'WHERE', 'AND', 'OR', 'NOT', 'NULL', 'IS', 'IN',
+    'LIKE', 'ORDER', 'GROUP', 'BY', 'HAVING', 'JOIN', 'LEFT', 'RIGHT', 'INNER', 'OUTER', 'ON',
+    'AS', 'DISTINCT', 'FIRST', 'SKIP', 'LIMIT', 'ASC', 'DESC', 'INDEX', 'PRIMARY', 'KEY',
+])
+
+# 짧은 텍스트 무효 규칙에 쓰는 키워드 (기존 검사처럼 부분 문자열로 찾으므로 SELECTED, UPDATED_AT도 해당)
+SHORT_TEXT_KEYWORDS = tuple(sorted(STATEMENT_KEYWORDS - {'PRAGMA'}))
+
+# Delphi 컴포넌트 코드 등 SQL이 아닌 내용의 표식 (식별자 안 부분 문자열로 검사)
+INVALID_MARKERS = ('TSTRINGGRID', 'TCOMPONENT', 'DELPHI', 'OBJECT')
+INVALID_EXTENSIONS = ('EXE', 'DLL', 'OBJ')
+
+# 유효할 수 없다고 판정된 뒤 남은 부분에서 무효 표식만 찾는 정규식
+# (영문자 연속은 항상 식별자 토큰 안에 있으므로 토큰 단위 검사와 결과가 같음)
+_MARKER_RE = re.compile('|'.join(INVALID_MARKERS) + r'|\.(?:' + '|'.join(INVALID_EXTENSIONS) + ')', re.IGNORECASE)
+
+# 판정 우선순위대로 나열한 쿼리 종류
+CATEGORY_ORDER = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'CREATE_TABLE', 'ALTER', 'DROP')
+
+# 탭/줄바꿈을 제외한 제어 문자 삭제 테이블 (str.translate로 개수 계산)
+_CONTROL_DELETE = dict.fromkeys(c for c in range(32) if chr(c) not in '\t\n\r')
+
+# 지문용 정규화 패턴 (문자열 → 숫자 → 파라미터 → 공백 → 구두점 주변 공백 순으로 적용)
+_STRING_LITERAL_RE = re.compile(r"'[^']*'")
+_NUMBER_LITERAL_RE = re.compile(r'(?<![A-Za-z0-9_$])[0-9]+(?:\.[0-9]+)?')
+_PARAM_NAME_RE = re.compile(r':[A-Za-z_][A-Za-z0-9_]*')
+_SPACE_RE = re.compile(r'[ \t\r\n]+')
+_PUNCT_SPACE_RE = re.compile(r' ?([(),=<>*+\-/;]) ?')
+
+MIN_LENGTH = 10
+MAX_LENGTH = 10000
+MAX_CONTROL_RATIO = 0.1
+MAX_GARBAGE_RUN = 10
+MIN_NON_SQL_LENGTH = 20
+
+
+def tokenize(text):
+    """(종류, 값) 토큰을 차례로 반환. 공백 토큰도 포함합니다."""
+    for match in TOKEN_RE.finditer(text):
+        kind = match.lastgroup
+        value = match.group()
+        if kind == 'word':
+            kind = KEYWORD if value.upper() in KEYWORDS else IDENT
+        yield kind, value
+
+
+def classify(text):
+    """토큰 흐름을 한 번 훑어 ('valid'|'broken'|'invalid', 종류 또는 None) 반환
+
+    종류는 유효한 쿼리에만 붙으며 CATEGORY_ORDER 중 하나 또는 'OTHER'입니다.
+    유효 판정의 문장 형태(SELECT ... FROM 등)는 토큰 단위로 확인하므로
+    'SELECT A FROMAGE'처럼 키워드가 다른 단어의 일부인 경우는 기존 정규식 검사와 달리 깨짐입니다.
+    """
+    has_alpha = False
+    marker = False
+    control = 0
+    garbage_run = 0
+    statements = set()
+    shape = False
+    select_seen = False
+    create_table = False
+    # 공백을 제외한 직전 세 토큰 (종류, 대문자 값)
+    prev2 = prev1 = last = (None, None)
+    # MAX_LENGTH를 넘는 텍스트는 유효할 수 없음
+    hopeless = len(text) > MAX_LENGTH
+    # 짧은 텍스트는 키워드 유무에 따라 무효가 될 수 있어 조기 종료하지 않음
+    can_stop = len(text) >= MIN_NON_SQL_LENGTH
+
+    for match in TOKEN_RE.finditer(text):
+        kind = match.lastgroup
+        if kind == 'ws':
+            continue
+        value = match.group()
+
+        if kind == 'word':
+            upper = value.upper()
+            if not has_alpha and upper.strip('_0123456789$'):
+                has_alpha = True
+            if upper in KEYWORDS:
+                kind = KEYWORD
+                if upper in STATEMENT_KEYWORDS:
+                    statements.add(upper)
+                if upper == 'SELECT':
+                    select_seen = True
+                elif upper == 'FROM' and select_seen:
+                    shape = True
+            else:
+                kind = IDENT
+                if not marker and any(m in upper for m in INVALID_MARKERS):
+                    marker = True
+            if not marker and last[1] == '.' and upper.startswith(INVALID_EXTENSIONS):
+                marker = True
+            if marker:
+                return 'invalid', None
+        elif kind == 'garbage':
+            control += len(value) - len(value.translate(_CONTROL_DELETE))
+            if len(value) > garbage_run:
+                garbage_run = len(value)
+                hopeless = hopeless or garbage_run >= MAX_GARBAGE_RUN
+            upper = None
+        elif kind == 'param':
+            has_alpha = True
+            upper = value.upper()
+            # 파라미터 이름 안의 표식도 정규식 검사처럼 무효 처리 (예: :pDelphi)
+            if any(m in upper for m in INVALID_MARKERS):
+                return 'invalid', None
+        else:
+            upper = value
+
+        if upper == 'TABLE' and last[1] == 'CREATE':
+            create_table = True
+
+        # INSERT INTO t / UPDATE t SET / DELETE FROM t / CREATE TABLE t
+        if not shape and kind in (IDENT, KEYWORD, NUMBER):
+            pair = (prev1[1], last[1])
+            if (pair == ('INSERT', 'INTO') or pair == ('DELETE', 'FROM')
+                    or pair == ('CREATE', 'TABLE')):
+                shape = True
+            elif upper == 'SET' and prev1[1] == 'UPDATE' and last[0] in (IDENT, KEYWORD, NUMBER):
+                shape = True
+
+        prev2, prev1, last = prev1, last, (kind, upper)
+
+        # 영문자가 나왔고 유효할 수 없으면 결과는 깨짐/무효 둘 중 하나이고,
+        # 무효 조건은 남은 표식뿐이므로 나머지 토큰은 훑지 않음
+        if hopeless and has_alpha and can_stop:
+            return ('invalid' if _MARKER_RE.search(text) else 'broken'), None
+
+    if not has_alpha:
+        return 'invalid', None
+    if len(text) < MIN_NON_SQL_LENGTH:
+        upper = text.upper()
+        if not any(keyword in upper for keyword in SHORT_TEXT_KEYWORDS):
+            return 'invalid', None
+
+    if _ends_incomplete(prev2, prev1, last) or garbage_run >= MAX_GARBAGE_RUN:
+        return 'broken', None
+
+    if (not statements or not shape
+            or not MIN_LENGTH <= len(text) <= MAX_LENGTH
+            or control > len(text) * MAX_CONTROL_RATIO):
+        return 'broken', None
+
+    return 'valid', _category(statements, create_table)
+
+
+def _ends_incomplete(prev2, prev1, last):
+    """SELECT / VALUES / FROM, INSERT INTO t, UPDATE t 로 끝나는 미완성 쿼리인지 확인"""
+    if last[1] in ('SELECT', 'VALUES', 'FROM'):
+        return True
+    if last[0] in (IDENT, KEYWORD, NUMBER):
+        if prev1[1] == 'UPDATE':
+            return True
+        if prev2[1] == 'INSERT' and prev1[1] == 'INTO':
+            return True
+    return False
+
+
+def _category(statements, create_table):
+    """등장한 문장 키워드로 쿼리 종류 결정"""
+    for category in CATEGORY_ORDER:
+        if category in statements or (category == 'CREATE_TABLE' and create_table):
+            return category
+    return 'OTHER'
+
+
+def normalize(text):
+    """지문 계산용 정규화: 리터럴과 파라미터 이름을 ?로 바꾸고 공백과 대소문자를 통일"""
+    text = _STRING_LITERAL_RE.sub('?', text)
+    text = _NUMBER_LITERAL_RE.sub('?', text)
+    text = _PARAM_NAME_RE.sub(':?', text)
+    text = _SPACE_RE.sub(' ', text)
+    text = _PUNCT_SPACE_RE.sub(r'\1', text)
+    return text.strip().upper()
+
+
+def fingerprint(text):
+    """정규화한 쿼리의 SHA-1 해시 (같은 문장의 인코딩별/구간별 중복 판별용)
+
+    MAX_LENGTH를 넘는 텍스트는 유효할 수 없는 바이너리 덩어리이므로
+    정규화 비용을 들이지 않고 원문 그대로 해시해 완전히 같은 것만 묶습니다.
+    """
+    if len(text) <= MAX_LENGTH:
+        text = normalize(text)
+    return hashlib.sha1(text.encode('utf-8', 'surrogatepass')).hexdigest()
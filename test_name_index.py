@@ -0,0 +1,68 @@
+"""
+DatabaseManager 이름 색인이 다른 워크스테이션의 이름 변경/삭제를 반영하는지 확인하는 테스트
+"""
+
+import sqlite3
+import time
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from deskpro_ui import DatabaseManager
+
+
+def open_db(tmp_path):
+    return DatabaseManager(str(tmp_path / "test.db"), name_index_path=str(tmp_path / "index.json"))
+
+
+def outside(tmp_path, sql, params=()):
+    """다른 워크스테이션에서의 수정 (색인을 거치지 않는 별도 연결)"""
+    conn = sqlite3.connect(str(tmp_path / "test.db"))
+    conn.execute(sql, params)
+    conn.commit()
+    conn.close()
+
+
+def pnames(rows):
+    return sorted(row['PNAME'] for row in rows)
+
+
+def test_outside_rename_reflected_after_restart(tmp_path):
+    db = open_db(tmp_path)
+    assert pnames(db.search_patients('홍')) == ['홍길동']
+    db.close()
+
+    outside(tmp_path, "UPDATE PERSON SET PNAME = '박영희' WHERE PNAME = '홍길동'")
+    outside(tmp_path, "DELETE FROM PERSON WHERE PNAME = '김철수'")
+    db = open_db(tmp_path)
+    try:
+        assert pnames(db.search_patients('박')) == ['박영희']
+        assert [row[1] for row in db.search_patients_page('박')[0]] == ['박영희']
+        assert db.search_patients('홍') == []
+        assert len(db.name_index) == 1
+    finally:
+        db.close()
+
+
+def test_outside_rename_reflected_during_session(tmp_path):
+    db = open_db(tmp_path)
+    try:
+        outside(tmp_path, "UPDATE PERSON SET PNAME = '박영희' WHERE PNAME = '홍길동'")
+        db.name_index.synced_at = time.time() - db.NAME_INDEX_RESYNC_SECONDS - 1
+        assert pnames(db.search_patients('박')) == ['박영희']
+        assert [row[1] for row in db.search_patients_page('박')[0]] == ['박영희']
+    finally:
+        db.close()
+
+
+def test_resave_keeps_build_time(tmp_path):
+    db = open_db(tmp_path)
+    built_at = db.name_index.built_at
+    db.close()
+
+    db = open_db(tmp_path)
+    try:
+        assert db.name_index.built_at == built_at
+    finally:
+        db.close()
@@ -0,0 +1,63 @@
+"""
+sql_lexer 분류 결과를 기존 정규식 검사 경로(SQLQueryReviewer.classify_regex)와 비교하는 테스트
+"""
+
+import random
+
+import sql_lexer
+from review_sql_queries import SQLQueryReviewer
+
+TEMPLATES = [
+    "SELECT * FROM PERSON WHERE PCODE = {param}",
+    "UPDATE WAIT SET STATUS = {param} WHERE PCODE = :Pcode",
+    "INSERT INTO PERSON (PNAME, PBIRTH) VALUES ({param}, :Pbirth)",
+    "DELETE FROM WAIT WHERE ROOMNM = {param};",
+    "{param}",
+    "x {param} y",
+]
+
+
+def marker_params(count, seed=1):
+    """무효 표식을 대소문자를 섞어 이름 안에 넣은 파라미터 (예: :pDelphi, :objectName)"""
+    rng = random.Random(seed)
+    for _ in range(count):
+        marker = ''.join(c.lower() if rng.random() < 0.5 else c for c in rng.choice(sql_lexer.INVALID_MARKERS))
+        yield ':' + rng.choice(['', 'p', 'a_', 'X1']) + marker + rng.choice(['', '_2', 'Name'])
+
+
+def test_marker_in_param_is_invalid():
+    assert sql_lexer.classify("SELECT * FROM PERSON WHERE PCODE = :pDelphi") == ('invalid', None)
+    assert SQLQueryReviewer.classify_regex("SELECT * FROM PERSON WHERE PCODE = :pDelphi") == 'invalid'
+
+
+def test_lexer_matches_regex_on_marker_params():
+    rng = random.Random(2)
+    for param in marker_params(2000):
+        text = rng.choice(TEMPLATES).format(param=param)
+        assert sql_lexer.classify(text)[0] == SQLQueryReviewer.classify_regex(text), text
+
+
+def test_short_text_keyword_substring_matches_regex():
+    # 짧은 텍스트 무효 규칙은 기존 검사처럼 키워드를 부분 문자열로 찾음
+    for text in ['SELECTED item here', 'UPDATED_AT x', 'SELECTA FROM B x']:
+        assert sql_lexer.classify(text) == ('broken', None)
+        assert SQLQueryReviewer.classify_regex(text) == 'broken'
+
+
+def test_invalid_label_matches_regex_on_keyword_fragments():
+    rng = random.Random(3)
+    words = ['SELECT', 'SELECTED', 'UPDATED_AT', 'xDELETE', 'DROPS', 'ALTERNATE', 'CREATED', 'INSERTS',
+             'PRAGMA', 'FROM', 'INTO', 'SET', 'a', 'b1', ':p', '(', ',', '=', '1', 'Delphi', '.exe']
+    for _ in range(5000):
+        text = ' '.join(rng.choice(words) for _ in range(rng.randint(1, 6)))
+        lexer_invalid = sql_lexer.classify(text)[0] == 'invalid'
+        assert lexer_invalid == (SQLQueryReviewer.classify_regex(text) == 'invalid'), text
+
+
+def test_statement_shape_is_token_based():
+    # 의도한 차이: 문장 형태는 토큰 단위로 확인 (정규식 검사는 부분 문자열/공백 두 번을 요구)
+    assert sql_lexer.classify('SELECT A FROMAGE') == ('broken', None)
+    assert SQLQueryReviewer.classify_regex('SELECT A FROMAGE') == 'valid'
+    assert sql_lexer.classify('xDELETE FROM a') == ('broken', None)
+    assert sql_lexer.classify('SELECT FROM PERSON') == ('valid', 'SELECT')
+    assert SQLQueryReviewer.classify_regex('SELECT FROM PERSON') == 'broken'